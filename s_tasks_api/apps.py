@@ -1,5 +1,52 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 
 
 class STasksApiConfig(AppConfig):
     name = 's_tasks_api'
+
+    def ready(self):
+        from .models import Task, TaskStatus, TaskTag, GroupTask
+        from .search import update_search_index, remove_search_index
+        from .services.changes import record_task_change, record_task_deletion, record_membership_changes
+        from .services.reference_data import invalidate_reference_data
+        from .services.result_cache import bump_task_generations, bump_group_task_generations, \
+            bump_membership_generations
+        from .services.snapshots import Membership, remember_previous_group_task, forget_previous_group_task, \
+            remember_cleared_membership, forget_cleared_membership
+        from .services.visibility import add_created_task_visibility, update_group_task_visibility, \
+            remove_group_task_visibility, update_membership_visibility
+        post_save.connect(update_search_index, sender=Task, dispatch_uid='s_tasks_api_update_search_index')
+        post_delete.connect(remove_search_index, sender=Task, dispatch_uid='s_tasks_api_remove_search_index')
+        for model in [TaskStatus, TaskTag]:
+            for signal in [post_save, post_delete]:
+                signal.connect(invalidate_reference_data, sender=model,
+                               dispatch_uid='s_tasks_api_invalidate_reference_data')
+        # The previous group task row and cleared memberships are read once for all of the receivers below.
+        pre_save.connect(remember_previous_group_task, sender=GroupTask,
+                         dispatch_uid='s_tasks_api_remember_previous_group_task')
+        m2m_changed.connect(remember_cleared_membership, sender=Membership,
+                            dispatch_uid='s_tasks_api_remember_cleared_membership')
+        for model in [Task, GroupTask]:
+            post_save.connect(record_task_change, sender=model, dispatch_uid='s_tasks_api_record_task_change')
+            post_delete.connect(record_task_deletion, sender=model, dispatch_uid='s_tasks_api_record_task_deletion')
+        m2m_changed.connect(record_membership_changes, sender=Membership,
+                            dispatch_uid='s_tasks_api_record_membership_changes')
+        post_save.connect(add_created_task_visibility, sender=Task, dispatch_uid='s_tasks_api_add_task_visibility')
+        post_save.connect(update_group_task_visibility, sender=GroupTask,
+                          dispatch_uid='s_tasks_api_update_group_task_visibility')
+        post_delete.connect(remove_group_task_visibility, sender=GroupTask,
+                            dispatch_uid='s_tasks_api_remove_group_task_visibility')
+        m2m_changed.connect(update_membership_visibility, sender=Membership,
+                            dispatch_uid='s_tasks_api_update_membership_visibility')
+        for signal in [post_save, post_delete]:
+            signal.connect(bump_task_generations, sender=Task, dispatch_uid='s_tasks_api_bump_task_generations')
+            signal.connect(bump_group_task_generations, sender=GroupTask,
+                           dispatch_uid='s_tasks_api_bump_group_task_generations')
+        m2m_changed.connect(bump_membership_generations, sender=Membership,
+                            dispatch_uid='s_tasks_api_bump_membership_generations')
+        # Connected last, after every receiver which reads them.
+        post_save.connect(forget_previous_group_task, sender=GroupTask,
+                          dispatch_uid='s_tasks_api_forget_previous_group_task')
+        m2m_changed.connect(forget_cleared_membership, sender=Membership,
+                            dispatch_uid='s_tasks_api_forget_cleared_membership')
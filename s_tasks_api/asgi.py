@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+
+from .settings import api_settings
+
+READ_METHODS = ['GET', 'HEAD']
+READ_URL_NAMES = ['tasks-list', 'tasks-detail', 'group-tasks-list', 'group-tasks-detail']
+
+
+def is_read_request(request):
+    """
+    Whether request is a GET / HEAD of task or group task list / retrieve.
+    """
+    if request.method not in READ_METHODS:
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return match.app_names[-1:] == ['s-tasks'] and match.url_name in READ_URL_NAMES
+
+
+class ReadPoolASGIHandler(ASGIHandler):
+    """
+    ASGI handler which serves task and group task list / retrieve in a bounded pool of threads.
+    Django 3.0 has neither async views nor an async ORM, and ASGIHandler runs every synchronous view
+    in the single thread of thread sensitive sync_to_async, so concurrent requests wait for each other.
+    Read requests run in api_settings.ASYNC_READ_THREADS threads instead, each closing its database
+    connections like a WSGI worker; other requests are handled as ASGIHandler does.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=api_settings.ASYNC_READ_THREADS,
+                                           thread_name_prefix='s_tasks_read')
+
+    async def get_response(self, request):
+        if is_read_request(request):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._get_read_response, request)
+        return await sync_to_async(super().get_response)(request)
+
+    def _get_read_response(self, request):
+        close_old_connections()
+        try:
+            return super().get_response(request)
+        finally:
+            close_old_connections()
+
+
+def get_asgi_application():
+    """
+    Same as django.core.asgi.get_asgi_application, with ReadPoolASGIHandler.
+    """
+    django.setup(set_prefix=False)
+    return ReadPoolASGIHandler()
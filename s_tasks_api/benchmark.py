@@ -0,0 +1,339 @@
+import asyncio
+import io
+import math
+import random
+import time
+import tracemalloc
+from collections import namedtuple, Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .asgi import ReadPoolASGIHandler
+from .models import Task, GroupTask, TaskChange
+
+Measurement = namedtuple('Measurement', ['name', 'method', 'samples', 'p50_ms', 'p99_ms', 'mean_ms', 'queries_p50',
+                                         'queries_max', 'peak_memory_kb', 'statuses'])
+ConcurrencyMeasurement = namedtuple('ConcurrencyMeasurement', ['server', 'concurrency', 'requests', 'seconds',
+                                                               'requests_per_second', 'p50_ms', 'p99_ms', 'statuses'])
+
+CONCURRENCY_SERVERS = ['wsgi', 'asgi', 'asgi-read-pool']
+
+
+def percentile(values, p):
+    """
+    Nearest rank percentile of values, p in 0..100.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(int(math.ceil(p / 100 * len(ordered))) - 1, 0)]
+
+
+class BenchmarkRunner:
+    """
+    Call every TaskViewSet / GroupTaskViewSet action samples times as random users of user_ids and measure
+    latency, query count and peak memory.
+    Requests go through URL resolving, authentication, permissions, serialization and rendering,
+    but not through middlewares.
+    Peak memory is measured by one extra call under tracemalloc, so that tracing does not skew the latency.
+    """
+
+    def __init__(self, user_ids, samples=50, seed=0, using=DEFAULT_DB_ALIAS):
+        self.samples = samples
+        self.using = using
+        self.rng = random.Random(seed)
+        self.factory = APIRequestFactory()
+        sampled_user_ids = self.rng.sample(list(user_ids), min(len(user_ids), samples))
+        self.users = list(get_user_model().objects.using(using).filter(pk__in=sampled_user_ids).order_by('pk'))
+        self._targets = {}
+
+    def run(self):
+        return [self.measure(name, method, url_name, get_request) for name, method, url_name, get_request in [
+            ('tasks-list', 'GET', 'tasks-list', lambda user: ([], None)),
+            ('tasks-retrieve', 'GET', 'tasks-detail', lambda user: self._pick(user, 'tasks')),
+            ('tasks-create', 'POST', 'tasks-list', self._create_task),
+            ('tasks-partial-update', 'PATCH', 'tasks-detail',
+             lambda user: self._pick(user, 'changeable_tasks', {'title': 'benchmark changed'})),
+            ('tasks-complete', 'PATCH', 'tasks-complete', lambda user: self._pick(user, 'changeable_tasks')),
+            ('tasks-un-complete', 'PATCH', 'tasks-un-complete', lambda user: self._pick(user, 'changeable_tasks')),
+            ('tasks-bulk-create', 'POST', 'tasks-bulk-create',
+             lambda user: ([], [{'title': 'benchmark bulk {}'.format(i)} for i in range(10)])),
+            ('tasks-bulk-update', 'PATCH', 'tasks-bulk-update',
+             lambda user: ([], [{'pk': pk, 'title': 'benchmark bulk changed'}
+                                for pk in self._get_targets(user)['changeable_tasks'][:10]])),
+            ('tasks-bulk-complete', 'PATCH', 'tasks-bulk-complete',
+             lambda user: ([], self._get_targets(user)['changeable_tasks'][:10])),
+            ('tasks-changes', 'GET', 'tasks-changes', self._get_changes),
+            ('tasks-create-group-task', 'POST', 'tasks-create-group-task', self._create_group_task),
+            ('tasks-destroy', 'DELETE', 'tasks-detail', lambda user: self._pop(user, 'created_tasks')),
+            ('group-tasks-list', 'GET', 'group-tasks-list', lambda user: ([], None)),
+            ('group-tasks-retrieve', 'GET', 'group-tasks-detail', lambda user: self._pick(user, 'group_tasks')),
+            ('group-tasks-partial-update', 'PATCH', 'group-tasks-detail',
+             lambda user: self._pick(user, 'changeable_group_tasks', {'title': 'benchmark changed'})),
+            ('group-tasks-complete', 'PATCH', 'group-tasks-complete',
+             lambda user: self._pick(user, 'changeable_group_tasks')),
+            ('group-tasks-un-complete', 'PATCH', 'group-tasks-un-complete',
+             lambda user: self._pick(user, 'changeable_group_tasks')),
+            ('group-tasks-remove-to-my-task', 'DELETE', 'group-tasks-remove-to-my-task',
+             lambda user: self._pop(user, 'created_group_tasks')),
+            ('group-tasks-destroy', 'DELETE', 'group-tasks-detail',
+             lambda user: self._pop(user, 'created_group_tasks')),
+        ]]
+
+    def measure(self, name, method, url_name, get_request):
+        """
+        get_request(user) returns (url args, request data), or None when user has nothing to call the action on.
+        """
+        latencies = []
+        query_counts = []
+        statuses = Counter()
+        for _ in range(self.samples):
+            user = self.rng.choice(self.users)
+            request = get_request(user)
+            if request is None:
+                continue
+            with CaptureQueriesContext(connections[self.using]) as queries:
+                started = time.perf_counter()
+                response = self.call(method, reverse('s-tasks:' + url_name, args=request[0]), user, request[1])
+                latencies.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(queries))
+            statuses[response.status_code] += 1
+            self._remember(name, user, response)
+
+        peak_memory_kb = None
+        user = self.rng.choice(self.users)
+        request = get_request(user)
+        if request is not None:
+            tracemalloc.start()
+            try:
+                response = self.call(method, reverse('s-tasks:' + url_name, args=request[0]), user, request[1])
+                peak_memory_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            finally:
+                tracemalloc.stop()
+            self._remember(name, user, response)
+
+        return Measurement(
+            name=name,
+            method=method,
+            samples=len(latencies),
+            p50_ms=_round(percentile(latencies, 50)),
+            p99_ms=_round(percentile(latencies, 99)),
+            mean_ms=_round(sum(latencies) / len(latencies) if latencies else None),
+            queries_p50=percentile(query_counts, 50),
+            queries_max=max(query_counts, default=None),
+            peak_memory_kb=peak_memory_kb,
+            statuses={str(code): count for code, count in sorted(statuses.items())},
+        )
+
+    def call(self, method, path, user, data=None):
+        if method == 'GET':
+            request = self.factory.get(path, data)
+        else:
+            request = getattr(self.factory, method.lower())(
+                path, data, format='json' if isinstance(data, list) else 'multipart')
+        force_authenticate(request, user)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        response.render()
+        return response
+
+    def _get_targets(self, user):
+        if user.pk not in self._targets:
+            tasks = Task.objects.using(self.using).filter(created_by=user)
+            group_tasks = GroupTask.objects.using(self.using).filter(group__in=user.groups.all())
+            changeable_group_tasks = group_tasks.filter(task__created_by=user, lock_level=GroupTask.NON_LOCK)
+            self._targets[user.pk] = {
+                'tasks': list(tasks.values_list('pk', flat=True)[:100]),
+                'changeable_tasks': list(changeable_group_tasks.values_list('task', flat=True)[:100]),
+                'group_tasks': list(group_tasks.values_list('pk', flat=True)[:100]),
+                'changeable_group_tasks': list(changeable_group_tasks.values_list('pk', flat=True)[:100]),
+                'group_ids': list(user.groups.values_list('pk', flat=True)),
+                'created_tasks': [],
+                'created_group_tasks': [],
+            }
+        return self._targets[user.pk]
+
+    def _pick(self, user, kind, data=None):
+        pks = self._get_targets(user)[kind]
+        return ([self.rng.choice(pks)], data) if pks else None
+
+    def _pop(self, user, kind):
+        pks = self._get_targets(user)[kind]
+        return ([pks.pop()], None) if pks else None
+
+    # noinspection PyUnusedLocal
+    def _create_task(self, user):
+        return [], {'title': 'benchmark created'}
+
+    def _create_group_task(self, user):
+        group_ids = self._get_targets(user)['group_ids']
+        return ([], {'title': 'benchmark group task', 'group': group_ids[0]}) if group_ids else None
+
+    def _get_changes(self, user):
+        latest = TaskChange.objects.using(self.using).aggregate(latest=Max('pk'))['latest'] or 0
+        return [], {'since': max(latest - 1000, 0)}
+
+    def _remember(self, name, user, response):
+        if response.status_code != 201:
+            return
+        if name == 'tasks-create':
+            self._get_targets(user)['created_tasks'].append(response.data['pk'])
+        elif name == 'tasks-create-group-task':
+            self._get_targets(user)['created_group_tasks'].append(response.data['pk'])
+
+
+class ConcurrencyBenchmarkRunner:
+    """
+    Send the same mix of task / group task list and retrieve requests, concurrency at a time, through
+    the WSGI handler (in concurrency threads, as a threaded WSGI server), Django's ASGI handler and
+    ReadPoolASGIHandler (concurrency coroutines on one event loop), and measure throughput and latency.
+    Requests go through middlewares and session authentication, as users sampled from user_ids.
+    Handlers use database connections of their own threads, so the rows must be committed.
+    """
+
+    def __init__(self, user_ids, requests=200, seed=0, host='localhost', users=20):
+        self.host = host
+        self.rng = random.Random(seed)
+        sampled_user_ids = self.rng.sample(list(user_ids), min(len(user_ids), users))
+        self.users = list(get_user_model().objects.filter(pk__in=sampled_user_ids).order_by('pk'))
+        self.request_count = requests
+
+    def run(self, concurrency_levels):
+        session_keys = {user.pk: self._login(user) for user in self.users}
+        try:
+            requests = self._get_requests(session_keys)
+            return [self.measure(server, concurrency, requests)
+                    for concurrency in concurrency_levels for server in CONCURRENCY_SERVERS]
+        finally:
+            for session_key in session_keys.values():
+                SessionStore(session_key=session_key).delete()
+
+    def measure(self, server, concurrency, requests):
+        """
+        requests is a list of (path, session key).
+        """
+        started = time.perf_counter()
+        if server == 'wsgi':
+            handler = WSGIHandler()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(lambda request: self._call_wsgi(handler, *request), requests))
+        else:
+            application = ASGIHandler() if server == 'asgi' else ReadPoolASGIHandler()
+            try:
+                results = asyncio.run(self._run_asgi(application, concurrency, requests))
+            finally:
+                if server != 'asgi':
+                    application.executor.shutdown()
+        seconds = time.perf_counter() - started
+        latencies = [latency for latency, status in results]
+        statuses = Counter(status for latency, status in results)
+        return ConcurrencyMeasurement(
+            server=server,
+            concurrency=concurrency,
+            requests=len(results),
+            seconds=_round(seconds),
+            requests_per_second=_round(len(results) / seconds),
+            p50_ms=_round(percentile(latencies, 50)),
+            p99_ms=_round(percentile(latencies, 99)),
+            statuses={str(code): count for code, count in sorted(statuses.items())},
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def _login(self, user):
+        client = Client()
+        client.force_login(user)
+        return client.session.session_key
+
+    def _get_requests(self, session_keys):
+        paths = {}
+        for user in self.users:
+            group_tasks = GroupTask.objects.filter(group__in=user.groups.all())
+            paths[user.pk] = [reverse('s-tasks:tasks-list'), reverse('s-tasks:group-tasks-list')] + [
+                reverse('s-tasks:tasks-detail', args=[pk])
+                for pk in group_tasks.filter(assignee=user).values_list('task', flat=True)[:10]
+            ] + [
+                reverse('s-tasks:group-tasks-detail', args=[pk])
+                for pk in group_tasks.values_list('pk', flat=True)[:10]
+            ]
+        requests = []
+        for _ in range(self.request_count):
+            user = self.rng.choice(self.users)
+            requests.append((self.rng.choice(paths[user.pk]), session_keys[user.pk]))
+        return requests
+
+    def _call_wsgi(self, handler, path, session_key):
+        started = time.perf_counter()
+        statuses = []
+        response = handler({
+            'REQUEST_METHOD': 'GET',
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_COOKIE': '{}={}'.format(settings.SESSION_COOKIE_NAME, session_key),
+            'wsgi.input': io.BytesIO(),
+            'wsgi.url_scheme': 'http',
+        }, lambda status, headers, exc_info=None: statuses.append(int(status.split()[0])))
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return (time.perf_counter() - started) * 1000, statuses[0]
+
+    async def _run_asgi(self, application, concurrency, requests):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(path, session_key):
+            async with semaphore:
+                return await self._call_asgi(application, path, session_key)
+
+        return await asyncio.gather(*[call(*request) for request in requests])
+
+    async def _call_asgi(self, application, path, session_key):
+        started = time.perf_counter()
+        statuses = []
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', self.host.encode()),
+                (b'cookie', '{}={}'.format(settings.SESSION_COOKIE_NAME, session_key).encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        await application(scope, receive, send)
+        return (time.perf_counter() - started) * 1000, statuses[0]
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
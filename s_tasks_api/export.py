@@ -0,0 +1,71 @@
+import csv
+import datetime
+
+from rest_framework.utils import encoders
+
+EXPORT_FORMATS = ['ndjson', 'csv']
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Lines joined into one chunk of the streamed response.
+LINES_PER_CHUNK = 100
+
+
+class _Echo:
+    """
+    File-like object which returns what is written, so that csv.writer builds lines without a buffer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_rows(rows, fields, export_format):
+    """
+    Yield rows of values() as NDJSON or CSV, LINES_PER_CHUNK lines at a time.
+    Fields through a relation (e.g. 'task__title') become nested objects in NDJSON and 'task.title' columns in CSV.
+    """
+    lines = _stream_csv(rows, fields) if export_format == 'csv' else _stream_ndjson(rows)
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == LINES_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _stream_ndjson(rows):
+    encoder = encoders.JSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(_nest(row)) + '\n'
+
+
+def _stream_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    encoder = encoders.JSONEncoder()
+    yield writer.writerow([field.replace('__', '.') for field in fields])
+    for row in rows:
+        yield writer.writerow([_to_csv_value(encoder, row[field]) for field in fields])
+
+
+def _nest(row):
+    nested = {}
+    for key, value in row.items():
+        target = nested
+        *path, name = key.split('__')
+        for part in path:
+            target = target.setdefault(part, {})
+        target[name] = value
+    return nested
+
+
+def _to_csv_value(encoder, value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.time)):
+        return encoder.default(value)
+    return value
@@ -1,9 +1,23 @@
 from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+from .search import get_search_backend
+
+
+class SearchFilter(filters.CharFilter):
+    """
+    Filters title/detail through the search backend of api_settings.TASK_SEARCH_BACKEND.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return get_search_backend().filter(qs, self.field_name, value)
 
 
 class TaskFilterSet(filters.FilterSet):
-    title = filters.CharFilter(field_name='title', lookup_expr='contains')
-    detail = filters.CharFilter(field_name='detail', lookup_expr='contains')
+    title = SearchFilter(field_name='title')
+    detail = SearchFilter(field_name='detail')
     due_date = filters.DateFilter(field_name='due_date', lookup_expr='lte')
     completed = filters.BooleanFilter(field_name='completed')
     status = filters.NumberFilter(field_name='status')
@@ -11,8 +25,8 @@ class TaskFilterSet(filters.FilterSet):
 
 
 class GroupTaskFilterSet(filters.FilterSet):
-    title = filters.CharFilter(field_name='task__title', lookup_expr='contains')
-    detail = filters.CharFilter(field_name='task__detail', lookup_expr='contains')
+    title = SearchFilter(field_name='task__title')
+    detail = SearchFilter(field_name='task__detail')
     due_date = filters.DateFilter(field_name='task__due_date', lookup_expr='lte')
     completed = filters.BooleanFilter(field_name='task__completed')
     status = filters.NumberFilter(field_name='task__status')
@@ -0,0 +1,88 @@
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, ExitStack
+
+from django.db import connections
+from django.dispatch import Signal
+
+METRICS_ATTRIBUTE = '_s_tasks_metrics'
+
+logger = logging.getLogger('s_tasks_api.instrumentation')
+
+# Sent with request, response and metrics after each instrumented request, e.g. to feed counters.
+request_measured = Signal()
+
+
+class RequestMetrics:
+    """
+    SQL queries and named timings of one request, collected while api_settings.INSTRUMENTATION is on.
+    Timings of the same name add up, e.g. a permission class checked for a list and for an object.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_duration = 0.0
+        self.timings = OrderedDict()
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def capture_queries(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self._execute))
+            yield
+
+    def _execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.query_duration += time.perf_counter() - started
+
+    def as_dict(self):
+        return {
+            'query_count': self.query_count,
+            'query_ms': _to_ms(self.query_duration),
+            'timings_ms': OrderedDict((name, _to_ms(duration)) for name, duration in self.timings.items()),
+        }
+
+    def get_server_timing(self):
+        entries = ['db;desc="{} queries";dur={}'.format(self.query_count, _to_ms(self.query_duration))]
+        entries += ['{};dur={}'.format(name, _to_ms(duration)) for name, duration in self.timings.items()]
+        return ', '.join(entries)
+
+
+def get_request_metrics(request):
+    return getattr(request, METRICS_ATTRIBUTE, None) if request is not None else None
+
+
+def call_timed(metrics, name, func, *args):
+    if metrics is None:
+        return func(*args)
+    with metrics.timer(name):
+        return func(*args)
+
+
+def get_permission_timing_name(permission):
+    return 'perm-' + type(permission).__name__
+
+
+def report_request_metrics(request, response, metrics):
+    response['Server-Timing'] = metrics.get_server_timing()
+    logger.info('%s %s %s queries=%s', request.method, request.get_full_path(), response.status_code,
+                metrics.query_count, extra={'s_tasks_metrics': dict(
+                    metrics.as_dict(), method=request.method, path=request.path, status=response.status_code)})
+    request_measured.send(sender=RequestMetrics, request=request, response=response, metrics=metrics)
+
+
+def _to_ms(seconds):
+    return round(seconds * 1000, 3)
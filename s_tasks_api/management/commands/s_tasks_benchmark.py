@@ -0,0 +1,73 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from s_tasks_api.benchmark import BenchmarkRunner
+from s_tasks_api.services.synthetic_data import generate_synthetic_data
+from s_tasks_api.services.visibility import is_visibility_table_enabled, rebuild_task_visibility
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, groups and tasks, and measure latency, query count and peak memory ' \
+           'of each task and group task API action. Generated rows are rolled back unless --keep-data is given.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--tasks-per-user', type=int, default=100)
+        parser.add_argument('--group-task-share', type=float, default=0.5)
+        parser.add_argument('--samples', type=int, default=50, help='Calls of each action.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--prefix', default='s_tasks_benchmark_', help='Prefix of generated user/group names.')
+        parser.add_argument('--output', help='Write results as JSON to this file.')
+        parser.add_argument('--keep-data', action='store_true', help='Commit generated rows.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        with transaction.atomic(using=using):
+            data = generate_synthetic_data(
+                users=options['users'], groups=options['groups'], tasks_per_user=options['tasks_per_user'],
+                group_task_share=options['group_task_share'], seed=options['seed'],
+                batch_size=options['batch_size'], prefix=options['prefix'], using=using)
+            if is_visibility_table_enabled():
+                rebuild_task_visibility(using)
+            self.stdout.write('Generated {} users, {} groups, {} tasks and {} group tasks.'.format(
+                len(data.user_ids), len(data.group_ids), data.task_count, data.group_task_count))
+            measurements = BenchmarkRunner(data.user_ids, samples=options['samples'], seed=options['seed'],
+                                           using=using).run()
+            if not options['keep_data']:
+                transaction.set_rollback(True, using=using)
+
+        self._write_table(measurements)
+        if options['output']:
+            result = {
+                'environment': {
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'database': connections[using].vendor,
+                },
+                'parameters': {key: options[key] for key in ['users', 'groups', 'tasks_per_user', 'group_task_share',
+                                                             'samples', 'seed']},
+                'results': [measurement._asdict() for measurement in measurements],
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(result, f, indent=2)
+            self.stdout.write('Wrote results to {}.'.format(options['output']))
+
+    def _write_table(self, measurements):
+        row = '{:<32} {:>6} {:>7} {:>10} {:>10} {:>8} {:>8} {:>12}  {}'
+        self.stdout.write(row.format('action', 'method', 'samples', 'p50 ms', 'p99 ms', 'queries', 'max q',
+                                     'peak KiB', 'statuses'))
+        for m in measurements:
+            self.stdout.write(row.format(m.name, m.method, m.samples, _format(m.p50_ms), _format(m.p99_ms),
+                                         _format(m.queries_p50), _format(m.queries_max),
+                                         _format(m.peak_memory_kb), json.dumps(m.statuses)))
+
+
+def _format(value):
+    return '-' if value is None else value
@@ -0,0 +1,58 @@
+import json
+import platform
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from s_tasks_api.benchmark import ConcurrencyBenchmarkRunner
+from s_tasks_api.settings import api_settings
+
+
+class Command(BaseCommand):
+    help = 'Measure throughput and latency of task and group task list / retrieve under concurrent requests ' \
+           'through the WSGI handler, the ASGI handler of Django and ReadPoolASGIHandler. ' \
+           'Runs on committed data, e.g. generated by s_tasks_seed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='s_tasks_seed_', help='Prefix of the names of users to sample.')
+        parser.add_argument('--users', type=int, default=20, help='Users to send requests as.')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+        parser.add_argument('--requests', type=int, default=200, help='Requests of each server and concurrency.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--host', default='localhost', help='Host header, which must be in ALLOWED_HOSTS.')
+        parser.add_argument('--output', help='Write results as JSON to this file.')
+
+    def handle(self, *args, **options):
+        user_ids = list(get_user_model().objects.filter(username__startswith=options['prefix'])
+                        .values_list('pk', flat=True))
+        if not user_ids:
+            raise CommandError("No users named '{}*'; generate them with s_tasks_seed first.".format(options['prefix']))
+        measurements = ConcurrencyBenchmarkRunner(user_ids, requests=options['requests'], seed=options['seed'],
+                                                  host=options['host'], users=options['users']) \
+            .run(options['concurrency'])
+
+        self._write_table(measurements)
+        if options['output']:
+            result = {
+                'environment': {
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'database': connection.vendor,
+                    'async_read_threads': api_settings.ASYNC_READ_THREADS,
+                },
+                'parameters': {key: options[key] for key in ['prefix', 'users', 'concurrency', 'requests', 'seed']},
+                'results': [measurement._asdict() for measurement in measurements],
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(result, f, indent=2)
+            self.stdout.write('Wrote results to {}.'.format(options['output']))
+
+    def _write_table(self, measurements):
+        row = '{:<16} {:>11} {:>8} {:>9} {:>10} {:>10} {:>10}  {}'
+        self.stdout.write(row.format('server', 'concurrency', 'requests', 'seconds', 'req/s', 'p50 ms', 'p99 ms',
+                                     'statuses'))
+        for m in measurements:
+            self.stdout.write(row.format(m.server, m.concurrency, m.requests, m.seconds, m.requests_per_second,
+                                         m.p50_ms, m.p99_ms, json.dumps(m.statuses)))
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from s_tasks_api.services.changes import prune_task_changes
+from s_tasks_api.settings import api_settings
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries of the task changes API older than S_TASKS_API CHANGES_RETENTION_DAYS. ' \
+           'Clients with tokens before the kept entries are told to read their lists again.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Overrides CHANGES_RETENTION_DAYS.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else api_settings.CHANGES_RETENTION_DAYS
+        if days is None:
+            raise CommandError('Set S_TASKS_API CHANGES_RETENTION_DAYS or pass --days.')
+        if days < 0:
+            raise CommandError('--days must not be negative.')
+        deleted = prune_task_changes(timezone.now() - timedelta(days=days), options['database'])
+        self.stdout.write('Deleted {} change log entries.'.format(deleted))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from s_tasks_api.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the task search index of S_TASKS_API TASK_SEARCH_BACKEND from the task table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild(options['database'])
+        self.stdout.write('Rebuilt task search index.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from s_tasks_api.services.visibility import rebuild_task_visibility
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the task visibility table used by S_TASKS_API TASK_VISIBILITY_TABLE from tasks, group tasks ' \
+           'and group membership.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        rebuild_task_visibility(options['database'])
+        self.stdout.write('Rebuilt task visibility table.')
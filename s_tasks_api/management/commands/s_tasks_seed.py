@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from s_tasks_api.search import get_search_backend
+from s_tasks_api.services.synthetic_data import generate_synthetic_data, DUE_DATE_DISTRIBUTIONS
+from s_tasks_api.services.visibility import is_visibility_table_enabled, rebuild_task_visibility
+
+
+class Command(BaseCommand):
+    help = 'Insert synthetic users, groups, tags, statuses, tasks and group tasks with batched bulk inserts. ' \
+           'The same --seed gives the same data; use a new --prefix for each run on the same database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--groups-per-user', type=int, default=1)
+        parser.add_argument('--group-skew', type=float, default=0.0,
+                            help='Zipf exponent of group sizes, 0 gives even groups.')
+        parser.add_argument('--tasks-per-user', type=int, default=100, help='Average tasks per user.')
+        parser.add_argument('--task-skew', type=float, default=0.0,
+                            help='Zipf exponent of tasks per user, 0 gives every user the same count.')
+        parser.add_argument('--group-task-share', type=float, default=0.5)
+        parser.add_argument('--lock-share', type=float, default=0.0, help='Share of group tasks with locks.')
+        parser.add_argument('--completed-share', type=float, default=0.3)
+        parser.add_argument('--due-date-share', type=float, default=0.7)
+        parser.add_argument('--due-date-min-days', type=int, default=-30, help='Earliest due date from today.')
+        parser.add_argument('--due-date-max-days', type=int, default=90, help='Latest due date from today.')
+        parser.add_argument('--due-date-distribution', choices=DUE_DATE_DISTRIBUTIONS, default='uniform')
+        parser.add_argument('--tags', type=int, default=10)
+        parser.add_argument('--statuses', type=int, default=0, help='Statuses added to the existing ones.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--prefix', default='s_tasks_seed_', help='Prefix of generated names.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        for key in ['group_task_share', 'lock_share', 'completed_share', 'due_date_share']:
+            if not 0 <= options[key] <= 1:
+                raise CommandError('--{} must be between 0 and 1.'.format(key.replace('_', '-')))
+        if options['due_date_min_days'] > options['due_date_max_days']:
+            raise CommandError('--due-date-min-days must not be greater than --due-date-max-days.')
+        using = options['database']
+        with transaction.atomic(using=using):
+            data = generate_synthetic_data(using=using, **{key: options[key] for key in [
+                'users', 'groups', 'groups_per_user', 'group_skew', 'tasks_per_user', 'task_skew',
+                'group_task_share', 'lock_share', 'completed_share', 'due_date_share', 'due_date_min_days',
+                'due_date_max_days', 'due_date_distribution', 'tags', 'statuses', 'seed', 'batch_size', 'prefix']})
+            get_search_backend().rebuild(using)
+            if is_visibility_table_enabled():
+                rebuild_task_visibility(using)
+        self.stdout.write('Seeded {} users, {} groups, {} tags, {} tasks and {} group tasks.'.format(
+            len(data.user_ids), len(data.group_ids), len(data.tag_ids), data.task_count, data.group_task_count))
@@ -0,0 +1,48 @@
+# Generated by Django 3.0 on 2026-10-18 12:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('s_tasks_api', '0002_grouptask'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='grouptask',
+            options={'ordering': ['pk']},
+        ),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['pk']},
+        ),
+        migrations.AlterField(
+            model_name='grouptask',
+            name='assign_lock_level',
+            field=models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(7)]),
+        ),
+        migrations.AlterField(
+            model_name='grouptask',
+            name='lock_level',
+            field=models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(127)]),
+        ),
+        migrations.AddIndex(
+            model_name='grouptask',
+            index=models.Index(fields=['group', 'assignee'], name='s_tasks_group_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grouptask',
+            index=models.Index(fields=['assignee', 'task'], name='s_tasks_assignee_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_by', 'completed', 'due_date'], name='s_tasks_task_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_date', 'id'], name='s_tasks_task_created_idx'),
+        ),
+    ]
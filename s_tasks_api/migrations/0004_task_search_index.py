@@ -0,0 +1,50 @@
+from django.db import migrations
+
+SQLITE_FTS_TABLE = 's_tasks_api_task_fts'
+POSTGRES_SEARCH_INDEXES = {
+    's_tasks_task_title_search_idx': 'title',
+    's_tasks_task_detail_search_idx': 'detail',
+}
+
+
+def _sqlite_supports_trigram_fts5(connection):
+    if connection.Database.sqlite_version_info < (3, 34, 0):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite' and _sqlite_supports_trigram_fts5(connection):
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE {table} USING fts5(title, detail, tokenize='trigram')".format(table=SQLITE_FTS_TABLE))
+        schema_editor.execute(
+            'INSERT INTO {table} (rowid, title, detail) SELECT id, title, detail FROM s_tasks_api_task'.format(
+                table=SQLITE_FTS_TABLE))
+    if connection.vendor == 'postgresql':
+        for name, column in POSTGRES_SEARCH_INDEXES.items():
+            schema_editor.execute(
+                "CREATE INDEX {name} ON s_tasks_api_task USING GIN (to_tsvector('simple', {column}))".format(
+                    name=name, column=column))
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS {table}'.format(table=SQLITE_FTS_TABLE))
+    if connection.vendor == 'postgresql':
+        for name in POSTGRES_SEARCH_INDEXES.keys():
+            schema_editor.execute('DROP INDEX IF EXISTS {name}'.format(name=name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('s_tasks_api', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
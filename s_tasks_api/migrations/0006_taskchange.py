@@ -0,0 +1,47 @@
+# Generated by Django 3.0 on 2026-10-18 13:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('s_tasks_api', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.IntegerField()),
+                ('group_task_id', models.IntegerField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_by_id', models.IntegerField(blank=True, null=True)),
+                ('group_id', models.IntegerField(blank=True, null=True)),
+                ('assignee_id', models.IntegerField(blank=True, null=True)),
+                ('previous_assignee_id', models.IntegerField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['pk'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['created_by_id', 'id'], name='s_tasks_change_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['assignee_id', 'id'], name='s_tasks_change_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['previous_assignee_id', 'id'], name='s_tasks_change_prev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['group_id', 'id'], name='s_tasks_change_group_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.0 on 2026-10-18 13:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('s_tasks_api', '0006_taskchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskVisibility',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.PositiveSmallIntegerField(choices=[(1, 'created'), (2, 'assigned'), (3, 'group member')])),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='s_tasks_api.Task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='taskvisibility',
+            index=models.Index(fields=['task', 'role'], name='s_tasks_visibility_task_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskvisibility',
+            constraint=models.UniqueConstraint(fields=('user', 'role', 'task'), name='s_tasks_visibility_unique'),
+        ),
+    ]
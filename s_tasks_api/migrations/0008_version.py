@@ -0,0 +1,23 @@
+# Generated by Django 3.0 on 2026-10-18 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('s_tasks_api', '0007_task_visibility'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grouptask',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
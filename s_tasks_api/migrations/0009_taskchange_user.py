@@ -0,0 +1,22 @@
+# Generated by Django 3.0 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('s_tasks_api', '0008_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskchange',
+            name='user_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['user_id', 'id'], name='s_tasks_change_user_idx'),
+        ),
+    ]
@@ -1,11 +1,61 @@
 from django.contrib.auth.models import Group
 from django.core import validators
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 
 from .settings import api_settings
 
 
+class UpdatedAtMixin:
+    """
+    Refresh updated_at on every save.
+    This is not auto_now, so that raw fixture loads fall back to the default.
+    """
+
+    def save(self, *args, **kwargs):
+        self.updated_at = timezone.now()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'updated_at'}
+        super().save(*args, **kwargs)
+
+
+class VersionConflict(DatabaseError):
+    """
+    The row was changed by another writer after the instance was read.
+    """
+
+
+class VersionMixin:
+    """
+    Version column for optimistic concurrency control, incremented by every save() of an existing row.
+    save() itself does not compare versions, so that admin and scripts keep last-writer-wins saves;
+    API writes use save_if_unchanged.
+    """
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'version'}
+        super().save(*args, **kwargs)
+
+    def save_if_unchanged(self, update_fields=None):
+        """
+        save() only when the row still has the version the instance was read with, otherwise raise VersionConflict.
+        The version is compared and incremented by one conditional UPDATE, which holds the row until save()
+        finishes in the same transaction, so that of two writers of the same version only one gets through.
+        """
+        using = router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            claimed = type(self)._base_manager.using(using).filter(pk=self.pk, version=self.version) \
+                .update(version=F('version') + 1)
+            if not claimed:
+                raise VersionConflict('{} {} was changed by another request.'.format(self._meta.model_name, self.pk))
+            self.save(using=using, update_fields=update_fields)
+
+
 class TaskTag(models.Model):
     value = models.CharField(max_length=api_settings.TASK_TAG_MODEL['MAX_LENGTH'], unique=True)
 
@@ -20,7 +70,7 @@ class TaskStatus(models.Model):
         return self.value
 
 
-class Task(models.Model):
+class Task(VersionMixin, UpdatedAtMixin, models.Model):
     title = models.CharField(max_length=api_settings.TASK_MODEL['TITLE_MAX_LENGTH'],
                              default=api_settings.TASK_MODEL['TITLE_DEFAULT'])
     detail = models.TextField(default=api_settings.TASK_MODEL['DETAIL_DEFAULT'])
@@ -31,12 +81,21 @@ class Task(models.Model):
     completed = models.BooleanField(default=False)
     completed_date = models.DateField(blank=True, null=True)
     created_by = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(default=timezone.now)
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        ordering = ['pk']
+        indexes = [
+            models.Index(fields=['created_by', 'completed', 'due_date'], name='s_tasks_task_owner_idx'),
+            models.Index(fields=['created_date', 'id'], name='s_tasks_task_created_idx'),
+        ]
 
     def __str__(self):
         return "{tag}/{title}:{status}".format(title=self.title, status=self.status, tag=self.tag)
 
 
-class GroupTask(models.Model):
+class GroupTask(VersionMixin, UpdatedAtMixin, models.Model):
     # Task Lock Level
     NON_LOCK = 0b0
     TITLE_LOCK = 0b1
@@ -67,6 +126,8 @@ class GroupTask(models.Model):
         validators.MinValueValidator(ASSIGN_LOCK_NON),
         validators.MaxValueValidator(ASSIGN_FULL_LOCK)
     ])
+    updated_at = models.DateTimeField(default=timezone.now)
+    version = models.PositiveIntegerField(default=1)
 
     LOCK_LEVELS = {
         'NON_LOCK': NON_LOCK,
@@ -88,5 +149,75 @@ class GroupTask(models.Model):
         'ASSIGN_FULL_LOCK': ASSIGN_FULL_LOCK,
     }
 
+    class Meta:
+        ordering = ['pk']
+        indexes = [
+            models.Index(fields=['group', 'assignee'], name='s_tasks_group_assignee_idx'),
+            models.Index(fields=['assignee', 'task'], name='s_tasks_assignee_task_idx'),
+        ]
+
     def __str__(self):
         return self.group.name + ':' + self.task.title
+
+
+class TaskChange(models.Model):
+    """
+    Change log of Task and GroupTask rows, read by the delta sync API.
+    id is the monotonic change token.
+    Ids of related rows are plain integers, so that entries outlive deleted rows as tombstones.
+    Entries with user_id are read only by that user; they are written when the user joins or leaves a group.
+    """
+    task_id = models.IntegerField()
+    group_task_id = models.IntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    created_by_id = models.IntegerField(null=True, blank=True)
+    group_id = models.IntegerField(null=True, blank=True)
+    assignee_id = models.IntegerField(null=True, blank=True)
+    previous_assignee_id = models.IntegerField(null=True, blank=True)
+    user_id = models.IntegerField(null=True, blank=True)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['pk']
+        indexes = [
+            models.Index(fields=['created_by_id', 'id'], name='s_tasks_change_owner_idx'),
+            models.Index(fields=['assignee_id', 'id'], name='s_tasks_change_assignee_idx'),
+            models.Index(fields=['previous_assignee_id', 'id'], name='s_tasks_change_prev_idx'),
+            models.Index(fields=['group_id', 'id'], name='s_tasks_change_group_idx'),
+            models.Index(fields=['user_id', 'id'], name='s_tasks_change_user_idx'),
+        ]
+
+    def __str__(self):
+        return '{pk}:{task_id}{deleted}'.format(pk=self.pk, task_id=self.task_id,
+                                                deleted=' deleted' if self.deleted else '')
+
+
+class TaskVisibility(models.Model):
+    """
+    Who can see which task, denormalized from Task.created_by, GroupTask.assignee and group membership.
+    Used by get_tasks / get_group_tasks when api_settings.TASK_VISIBILITY_TABLE is on.
+    """
+    CREATED = 1
+    ASSIGNED = 2
+    GROUP_MEMBER = 3
+    ROLES = (
+        (CREATED, 'created'),
+        (ASSIGNED, 'assigned'),
+        (GROUP_MEMBER, 'group member'),
+    )
+
+    user = models.ForeignKey(to=settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE)
+    task = models.ForeignKey(to=Task, related_name='+', on_delete=models.CASCADE)
+    role = models.PositiveSmallIntegerField(choices=ROLES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'role', 'task'], name='s_tasks_visibility_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['task', 'role'], name='s_tasks_visibility_task_idx'),
+        ]
+
+    def __str__(self):
+        return '{user_id}:{task_id}:{role}'.format(user_id=self.user_id, task_id=self.task_id,
+                                                   role=self.get_role_display())
@@ -0,0 +1,127 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+
+from .settings import api_settings
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a composite (sort key, pk) keyset.
+    Unlike CursorPagination, the cursor never carries an offset, so any page costs
+    one indexed range scan regardless of how deep it is.
+    Page sizes are read from api_settings.PAGINATION; PAGE_SIZE None disables pagination.
+    """
+    ordering = ('created_date', 'pk')
+    position_separator = '|'
+
+    @property
+    def page_size(self):
+        return api_settings.PAGINATION['PAGE_SIZE']
+
+    @property
+    def max_page_size(self):
+        return api_settings.PAGINATION['MAX_PAGE_SIZE']
+
+    @property
+    def page_size_query_param(self):
+        return api_settings.PAGINATION['PAGE_SIZE_QUERY_PARAM']
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor is not None else None
+
+        if reverse:
+            queryset = queryset.order_by(*['-' + field for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = self._filter_by_position(queryset, current_position, reverse)
+
+        # Fetch an extra item in order to determine if there is a page following on from this one.
+        results = list(queryset[:page_size + 1])
+        self.page = results[:page_size]
+        has_following_position = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+        if self.page:
+            self.previous_position = self._get_position_from_instance(self.page[0], self.ordering)
+            self.next_position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            self.has_next = self.has_previous = False
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        if cursor.offset != 0 or cursor.position is None:
+            raise NotFound(self.invalid_cursor_message)
+        values = cursor.position.split(self.position_separator)
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=values)
+
+    def _filter_by_position(self, queryset, position, reverse):
+        lookup = '__lt' if reverse else '__gt'
+        (sort_field, pk_field) = self.ordering
+        (sort_value, pk_value) = position
+        try:
+            return queryset.filter(
+                Q(**{sort_field + lookup: sort_value}) |
+                Q(**{sort_field: sort_value, pk_field + lookup: pk_value})
+            )
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            if isinstance(instance, tuple):
+                # Rows of values_list(named=True) carry related columns as flat 'task__created_date' names.
+                values.append(str(getattr(instance, field)))
+                continue
+            value = instance
+            for attr in field.split('__'):
+                value = value[attr] if isinstance(value, dict) else getattr(value, attr)
+            values.append(str(value))
+        return self.position_separator.join(values)
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    ordering = ('created_date', 'pk')
+
+
+class GroupTaskCursorPagination(KeysetCursorPagination):
+    ordering = ('task__created_date', 'pk')
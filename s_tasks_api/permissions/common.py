@@ -1,37 +1,89 @@
 from typing import List
 from rest_framework import permissions
 
+from s_tasks_api.instrumentation import get_request_metrics, call_timed, get_permission_timing_name
+from s_tasks_api.permissions.context import get_permission_context
+
+# Costs of a permission check, which AndAll runs cheapest first.
+# Permission classes declare them as cost (has_permission) and object_cost (has_object_permission, defaults to cost).
+# Classes without cost are checked first, keeping their declared order.
+COST_REQUEST = 0  # reads the request only
+COST_CONTEXT = 1  # reads the per request permission context, which queries at most once per fact
+COST_QUERY = 2  # runs its own queries
+
 
 class IsUserInGroup(permissions.BasePermission):
+    cost = COST_CONTEXT
+    permission_methods = ['POST', 'PUT', 'PATCH']
+    object_permission_methods = []
+
     def has_permission(self, request, view):
         if 'group' not in request.data:
             return True
         if not request.data['group']:
             return True
         try:
-            return int(request.data['group']) in [group.pk for group in request.user.groups.all()]
+            return int(request.data['group']) in get_permission_context(request).group_ids
         except ValueError:
             return True
 
 
 class AndAll(permissions.BasePermission):
+    """
+    Pass when all of my_permissions pass.
+    Permissions are checked cheapest first by their cost / object_cost, and skipped for HTTP methods which
+    are not in their permission_methods / object_permission_methods.
+    When one fails, message is taken from the first failing permission in declared order,
+    as if they had been checked in that order.
+    """
     message = None
 
     def __init__(self, my_permissions: List[permissions.BasePermission]):
         self._permissions = my_permissions
+        self._ordered_permissions = _order_by_cost(my_permissions, 'cost')
+        self._ordered_object_permissions = _order_by_cost(my_permissions, 'object_cost')
 
     def has_permission(self, request, view):
-        for permission in self._permissions:
-            if not permission.has_permission(request, view):
-                if hasattr(permission, 'message'):
-                    self.message = permission.message
-                return False
-        return True
+        return self._check_all(request, self._ordered_permissions, 'permission_methods',
+                               lambda permission: permission.has_permission(request, view))
 
     def has_object_permission(self, request, view, obj):
-        for permission in self._permissions:
-            if not permission.has_object_permission(request, view, obj):
-                if hasattr(permission, 'message'):
-                    self.message = permission.message
-                return False
+        return self._check_all(request, self._ordered_object_permissions, 'object_permission_methods',
+                               lambda permission: permission.has_object_permission(request, view, obj))
+
+    def _check_all(self, request, ordered_permissions, methods_attribute, check):
+        metrics = get_request_metrics(request)
+        unchecked_permissions = [(index, permission) for index, permission in ordered_permissions
+                                 if _is_relevant(permission, methods_attribute, request.method)]
+        while unchecked_permissions:
+            index, permission = unchecked_permissions.pop(0)
+            if call_timed(metrics, get_permission_timing_name(permission), check, permission):
+                continue
+            # Permissions declared before the failed one, but not checked yet, decide the message first.
+            for earlier_index, earlier_permission in sorted(unchecked_permissions, key=lambda item: item[0]):
+                if earlier_index > index:
+                    break
+                if not call_timed(metrics, get_permission_timing_name(earlier_permission), check,
+                                  earlier_permission):
+                    permission = earlier_permission
+                    break
+            if hasattr(permission, 'message'):
+                self.message = permission.message
+            return False
         return True
+
+
+def _get_cost(permission, attribute):
+    cost = getattr(permission, attribute, None)
+    if cost is None and attribute == 'object_cost':
+        cost = getattr(permission, 'cost', None)
+    return COST_REQUEST if cost is None else cost
+
+
+def _order_by_cost(my_permissions, attribute):
+    return sorted(enumerate(my_permissions), key=lambda item: _get_cost(item[1], attribute))
+
+
+def _is_relevant(permission, methods_attribute, method):
+    methods = getattr(permission, methods_attribute, None)
+    return methods is None or method in methods
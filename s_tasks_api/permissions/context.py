@@ -0,0 +1,94 @@
+from s_tasks_api.models import Task
+from s_tasks_api.services.allowed_actions import ACTIONS, get_annotated_allowed_actions, list_locked_columns
+from s_tasks_api.services.tasks import get_group_ids, get_task_facts, is_deletable, is_completable, is_assignable, \
+    list_unchangeable_columns
+from s_tasks_api.services.utils import is_in_any_group
+
+PERMISSION_CONTEXT_ATTRIBUTE = '_s_tasks_permission_context'
+
+
+class TaskPermissionContext:
+    """
+    Facts which task permission classes read about the requesting user and the target task.
+    The user's group ids and each task's owner, assignee and lock bits are computed once,
+    however many permission classes are chained.
+    Lock checks of rows fetched through annotate_allowed_actions read the bits evaluated in SQL.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._group_ids = None
+        self._task_facts = {}
+        self._members = {}
+
+    @property
+    def group_ids(self):
+        if self._group_ids is None:
+            self._group_ids = get_group_ids(self.user)
+        return self._group_ids
+
+    def is_member_of_my_groups(self, user_id):
+        """
+        Whether the user of user_id shares a group with me. Ids which are not integers are not members.
+        """
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return False
+        if user_id not in self._members:
+            self._members[user_id] = is_in_any_group(user_id, self.group_ids)
+        return self._members[user_id]
+
+    def get_task_facts(self, task):
+        key = (type(task), task.pk)
+        if key not in self._task_facts:
+            self._task_facts[key] = get_task_facts(task)
+        return self._task_facts[key]
+
+    def is_task_created_by_me(self, task):
+        return self.user.pk is not None and self.user.pk == self.get_task_facts(task).created_by_id
+
+    def am_i_assignee(self, task):
+        """
+        Same as services.tasks.am_i_assignee: only Task objects are assigned.
+        """
+        if type(task) is not Task:
+            return False
+        assignee_id = self.get_task_facts(task).assignee_id
+        return assignee_id is not None and self.user.pk == assignee_id
+
+    def is_my_group_task(self, task):
+        group_id = self.get_task_facts(task).group_id
+        return group_id is not None and group_id in self.group_ids
+
+    def is_deletable_task(self, task):
+        allowed_actions = get_annotated_allowed_actions(task)
+        if allowed_actions is not None:
+            return bool(allowed_actions & ACTIONS['delete'])
+        return is_deletable(self.user, self.get_task_facts(task))
+
+    def is_completable_task(self, task):
+        allowed_actions = get_annotated_allowed_actions(task)
+        if allowed_actions is not None:
+            return bool(allowed_actions & ACTIONS['complete'])
+        return is_completable(self.user, self.get_task_facts(task))
+
+    def is_assignable_task(self, task):
+        allowed_actions = get_annotated_allowed_actions(task)
+        if allowed_actions is not None:
+            return bool(allowed_actions & ACTIONS['assign'])
+        return is_assignable(self.user, self.get_task_facts(task))
+
+    def list_unchangeable_columns(self, task):
+        allowed_actions = get_annotated_allowed_actions(task)
+        if allowed_actions is not None:
+            return list_locked_columns(allowed_actions)
+        return list_unchangeable_columns(self.get_task_facts(task))
+
+
+def get_permission_context(request):
+    context = getattr(request, PERMISSION_CONTEXT_ATTRIBUTE, None)
+    if context is None or context.user is not request.user:
+        context = TaskPermissionContext(request.user)
+        setattr(request, PERMISSION_CONTEXT_ATTRIBUTE, context)
+    return context
@@ -1,15 +1,17 @@
 from rest_framework import permissions
 
 from s_tasks_api.models import Task, GroupTask
-from s_tasks_api.permissions.common import AndAll, IsUserInGroup
-from s_tasks_api.services.tasks import is_task_created_by, is_my_group_task, is_deletable_task, convert_group_task, \
-    list_unchangeable_group_task_columns_by_member, is_completable_task, is_assignable_task, am_i_assignee
-from s_tasks_api.services.utils import is_in_same_group, User
+from s_tasks_api.permissions.common import AndAll, IsUserInGroup, COST_REQUEST, COST_CONTEXT, COST_QUERY
+from s_tasks_api.permissions.context import get_permission_context
 
 
 class IsMyTask(permissions.BasePermission):
+    cost = COST_QUERY
+    object_cost = COST_CONTEXT
+    permission_methods = ['POST', 'PUT', 'PATCH']
+
     def has_permission(self, request, view):
-        if 'task_id' not in request.data.keys():
+        if 'task_id' not in request.data:
             return True
         if not request.data['task_id']:
             return True
@@ -20,71 +22,88 @@ class IsMyTask(permissions.BasePermission):
         return self.has_object_permission(request, view, task)
 
     def has_object_permission(self, request, view, obj):
-        return is_task_created_by(request.user, obj) | am_i_assignee(request.user, obj)
+        context = get_permission_context(request)
+        return context.is_task_created_by_me(obj) or context.am_i_assignee(obj)
 
 
 class IsMyGroupTask(permissions.BasePermission):
+    cost = COST_REQUEST
+    object_cost = COST_CONTEXT
+    permission_methods = ['POST']
+
     def has_permission(self, request, view):
         return request.method not in ['POST']
 
     def has_object_permission(self, request, view, obj):
         if request.method in ['POST']:
             return False
-        return is_my_group_task(request.user, obj)
+        return get_permission_context(request).is_my_group_task(obj)
 
 
 class IsDeletableGroupTask(permissions.BasePermission):
     message = 'Denied to delete task.'
+    object_cost = COST_CONTEXT
+    permission_methods = []
 
     def has_object_permission(self, request, view, obj: GroupTask):
-        if not is_my_group_task(request.user, obj):
+        context = get_permission_context(request)
+        if not context.is_my_group_task(obj):
             self.message = ''
             return False
         if request.method not in ['DELETE']:
             return True
-        return is_deletable_task(request.user, obj)
+        return context.is_deletable_task(obj)
 
 
 class IsChangeableTaskComplete(permissions.BasePermission):
     message = 'Denied to change complete task.'
+    object_cost = COST_CONTEXT
+    permission_methods = []
 
     def has_permission(self, request, view):
         return True
 
     def has_object_permission(self, request, view, obj):
-        if not is_my_group_task(request.user, obj):
+        context = get_permission_context(request)
+        if not context.is_my_group_task(obj):
             self.message = ''
             return False
         if request.method not in ['PUT', 'PATCH']:
             return True
-        return is_completable_task(request.user, obj)
+        return context.is_completable_task(obj)
 
 
 class IsChangeableTaskAssignee(permissions.BasePermission):
     message = 'Denied to change assignee of task.'
+    object_cost = COST_CONTEXT
+    permission_methods = []
 
     def has_permission(self, request, view):
         return True
 
     def has_object_permission(self, request, view, obj):
-        if not is_my_group_task(request.user, obj):
+        context = get_permission_context(request)
+        if not context.is_my_group_task(obj):
             self.message = ''
             return False
         if request.method not in ['PUT', 'PATCH']:
             return True
-        return is_assignable_task(request.user, obj)
+        return context.is_assignable_task(obj)
 
 
 class AreParametersChangeableGroupTask(permissions.BasePermission):
     message = "Only task's owner can change these columns: {parameters}."
+    object_cost = COST_CONTEXT
+    permission_methods = []
 
     def has_object_permission(self, request, view, obj):
-        if not is_my_group_task(request.user, obj):
+        context = get_permission_context(request)
+        if not context.is_my_group_task(obj):
             self.message = ''
             return False
         if request.method not in ['PUT', 'PATCH']:
             return True
-        unchangeable_columns = list_unchangeable_group_task_columns_by_member(convert_group_task(obj))
+        unchangeable_columns = context.list_unchangeable_columns(obj)
         for key, value in request.data.items():
             if key in unchangeable_columns:
                 self.message = self.message.format(parameters=unchangeable_columns)
@@ -93,20 +112,28 @@ class AreParametersChangeableGroupTask(permissions.BasePermission):
 
 
 class IsAssigneeInTaskGroup(permissions.BasePermission):
+    cost = COST_CONTEXT
+    permission_methods = ['POST', 'PUT', 'PATCH']
+    object_permission_methods = []
+
     def has_permission(self, request, view):
         if request.method not in ['POST', 'PUT', 'PATCH']:
             return True
         if request.method in ['PUT', 'PATCH'] and 'assignee' in request.data:
-            return is_in_same_group(request.user, User.objects.get(pk=request.data['assignee']))
+            return get_permission_context(request).is_member_of_my_groups(request.data['assignee'])
         if 'assignee' not in request.data or \
                 not request.data['assignee'] or \
                 'group' not in request.data or \
                 not request.data['group']:
             return True
-        return is_in_same_group(request.user, User.objects.get(pk=request.data['assignee']))
+        return get_permission_context(request).is_member_of_my_groups(request.data['assignee'])
 
 
 class IsMyOrMyGroupTask(permissions.OR):
+    cost = COST_QUERY
+    object_cost = COST_CONTEXT
+    permission_methods = ['POST']
+
     def __init__(self):
         super(IsMyOrMyGroupTask, self).__init__(IsMyTask(), IsMyGroupTask())
 
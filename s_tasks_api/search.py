@@ -0,0 +1,108 @@
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .settings import api_settings
+
+TASK_FTS_TABLE = 's_tasks_api_task_fts'
+
+
+class ContainsSearchBackend:
+    """
+    Default search backend, filters with LIKE '%value%'.
+    field_name is a Task column, optionally prefixed with the path to Task (e.g. 'task__title').
+    """
+
+    def filter(self, queryset, field_name, value):
+        return queryset.filter(**{field_name + '__contains': value})
+
+    def index(self, task, using):
+        pass
+
+    def remove(self, task, using):
+        pass
+
+    def rebuild(self, using):
+        pass
+
+
+class SQLiteFTS5SearchBackend(ContainsSearchBackend):
+    """
+    Searches the trigram FTS5 table created by migration 0004, which keeps substring semantics of contains.
+    Rows are indexed on Task post_save / post_delete.
+    Values shorter than a trigram can not be matched by the index, so they fall back to contains.
+    """
+    min_length = 3
+
+    def filter(self, queryset, field_name, value):
+        if len(value) < self.min_length:
+            return super().filter(queryset, field_name, value)
+        prefix, column = _split_field_name(field_name)
+        sql = 'SELECT rowid FROM {table} WHERE {column} MATCH %s'.format(table=TASK_FTS_TABLE, column=column)
+        return queryset.filter(**{prefix + 'pk__in': RawSQL(sql, ['"' + value.replace('"', '""') + '"'])})
+
+    def index(self, task, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute('DELETE FROM {table} WHERE rowid = %s'.format(table=TASK_FTS_TABLE), [task.pk])
+            cursor.execute('INSERT INTO {table} (rowid, title, detail) VALUES (%s, %s, %s)'.format(
+                table=TASK_FTS_TABLE), [task.pk, task.title, task.detail])
+
+    def remove(self, task, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute('DELETE FROM {table} WHERE rowid = %s'.format(table=TASK_FTS_TABLE), [task.pk])
+
+    def rebuild(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute('DELETE FROM {table}'.format(table=TASK_FTS_TABLE))
+            cursor.execute(
+                'INSERT INTO {table} (rowid, title, detail) SELECT id, title, detail FROM {task_table}'.format(
+                    table=TASK_FTS_TABLE, task_table='s_tasks_api_task'))
+
+
+class PostgresSearchBackend(ContainsSearchBackend):
+    """
+    Matches words with to_tsvector('simple', column), served by the GIN indexes created by migration 0004.
+    Unlike contains, this matches whole words, not substrings.
+    The indexes are on expressions, so nothing has to be kept in sync.
+    """
+
+    def filter(self, queryset, field_name, value):
+        prefix, column = _split_field_name(field_name)
+        sql = "SELECT id FROM s_tasks_api_task WHERE to_tsvector('simple', {column}) @@ plainto_tsquery('simple', %s)" \
+            .format(column=column)
+        return queryset.filter(**{prefix + 'pk__in': RawSQL(sql, [value])})
+
+
+def _split_field_name(field_name):
+    prefix, _, column = field_name.rpartition('__')
+    if column not in ['title', 'detail']:
+        raise ValueError("Only title and detail are searchable, but {} given.".format(field_name))
+    return prefix + '__' if prefix else '', column
+
+
+@lru_cache(maxsize=None)
+def _load_search_backend(path):
+    return import_string(path)()
+
+
+def get_search_backend():
+    return _load_search_backend(api_settings.TASK_SEARCH_BACKEND)
+
+
+def update_search_index(sender, instance, using=None, **kwargs):
+    get_search_backend().index(instance, using)
+
+
+def remove_search_index(sender, instance, using=None, **kwargs):
+    get_search_backend().remove(instance, using)
+
+
+def index_tasks(tasks, using):
+    """
+    Index tasks written without post_save, e.g. by bulk_create or bulk_update.
+    """
+    search_backend = get_search_backend()
+    for task in tasks:
+        search_backend.index(task, using)
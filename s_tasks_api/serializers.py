@@ -1,52 +1,219 @@
+from collections import OrderedDict
+
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from rest_framework import serializers
 
+from .instrumentation import get_request_metrics
 from .models import Task, TaskStatus, TaskTag, GroupTask
+from .services.allowed_actions import get_action_names
+from .services.reference_data import get_reference_data
+
+
+class TimedDataMixin:
+    """
+    Add the time of building data to the request metrics, when instrumentation is on.
+    """
+
+    @property
+    def data(self):
+        metrics = get_request_metrics(self.context.get('request'))
+        if metrics is None:
+            return super().data
+        with metrics.timer('serializer'):
+            return super().data
+
 
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
 
-class TaskStatusSerializer(serializers.ModelSerializer):
+
+class TimedModelSerializer(TimedDataMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
+
+
+class AllowedActionsField(serializers.Field):
+    """
+    Names of the actions in the allowed_actions bits annotated by annotate_allowed_actions.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return get_action_names(value)
+
+
+class AllowedActionsMixin:
+    """
+    allowed_actions is a field of top level serializers whose context asks for it (the view annotates the rows then),
+    and is dropped everywhere else.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        is_top_level = self.parent is None or isinstance(self.parent, serializers.ListSerializer)
+        if not (is_top_level and self.context.get('allowed_actions')):
+            fields.pop('allowed_actions', None)
+        return fields
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets: context 'fields' keeps only and context 'omit' drops the named fields.
+    Names are paths from the top level serializer, e.g. 'task.detail' for the task of a group task;
+    a kept field keeps all of its nested fields.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        omitted = self.context.get('omit') or []
+        prefix = ''.join(name + '.' for name in self._get_path())
+        for field_name in list(fields):
+            path = prefix + field_name
+            if selected is not None and not any(name == path or name.startswith(path + '.') or
+                                                path.startswith(name + '.') for name in selected):
+                fields.pop(field_name)
+            elif path in omitted:
+                fields.pop(field_name)
+        return fields
+
+    def _get_path(self):
+        path = []
+        serializer = self
+        while serializer.parent is not None:
+            if not isinstance(serializer.parent, serializers.ListSerializer):
+                path.insert(0, serializer.field_name)
+            serializer = serializer.parent
+        return path
+
+
+class ValuesListSerializer(serializers.BaseSerializer):
+    """
+    Read-only representation of serializer_class built from values_list() rows, without a serializer per row.
+    columns are the lookups of the readable fields (nested serializers become 'task__title' lookups) in
+    the order of the representation. Values of the fields which return what the database gives
+    (char, integer and primary key fields) are copied as they are, the others go through to_representation,
+    so the output is the same as serializer_class.
+    """
+    PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+    def __init__(self, *args, serializer_class=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.columns = []
+        self.layout = self._get_layout(serializer_class(context=self.context), '')
+
+    def to_representation(self, row):
+        return self._represent(self.layout, iter(row))
+
+    def _get_layout(self, serializer, prefix):
+        layout = []
+        for field in serializer._readable_fields:
+            if field.source == '*' or isinstance(field, serializers.ListSerializer):
+                raise ImproperlyConfigured(
+                    "Field '{}' can not be read from values_list().".format(field.field_name))
+            lookup = prefix + '__'.join(field.source_attrs)
+            if isinstance(field, serializers.BaseSerializer):
+                layout.append((field.field_name, self._get_layout(field, lookup + '__')))
+            else:
+                self.columns.append(lookup)
+                layout.append((field.field_name, self._get_converter(field)))
+        return layout
+
+    def _get_converter(self, field):
+        if type(field) in self.PASSTHROUGH_FIELDS:
+            return None
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            return None
+        return field.to_representation
+
+    def _represent(self, layout, values):
+        ret = OrderedDict()
+        for field_name, item in layout:
+            if isinstance(item, list):
+                ret[field_name] = self._represent(item, values)
+                continue
+            value = next(values)
+            ret[field_name] = value if item is None or value is None else item(value)
+        return ret
+
+
+class UpdateFieldsMixin:
+    """
+    Save only the columns of validated_data, so that an update does not write back columns which
+    other requests changed meanwhile, and only when the row still has the version the instance was read with.
+    """
+
+    def update(self, instance, validated_data):
+        serializers.raise_errors_on_nested_writes('update', self, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save_if_unchanged(update_fields=list(validated_data))
+        return instance
+
+
+class ReferenceDataRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField which looks its row up through the reference data cache.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            return get_reference_data(self.get_queryset().model, data)
+        except ObjectDoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class TaskStatusSerializer(TimedModelSerializer):
+    class Meta(TimedModelSerializer.Meta):
         model = TaskStatus
         fields = ('pk', 'value')
         read_only_fields = ('pk',)
 
 
-class TaskTagSerializer(serializers.ModelSerializer):
-    class Meta:
+class TaskTagSerializer(TimedModelSerializer):
+    class Meta(TimedModelSerializer.Meta):
         model = TaskTag
         fields = ('pk', 'value')
         read_only_fields = ('pk',)
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    class Meta:
+class TaskSerializer(AllowedActionsMixin, SparseFieldsMixin, UpdateFieldsMixin, TimedModelSerializer):
+    serializer_related_field = ReferenceDataRelatedField
+    allowed_actions = AllowedActionsField()
+
+    class Meta(TimedModelSerializer.Meta):
         model = Task
         fields = ('pk', 'title', 'detail', 'due_date', 'status', 'tag', 'created_date',
-                  'created_by')
-        read_only_fields = ('pk', 'completed', 'completed_date', 'created_date', 'created_by',)
+                  'created_by', 'updated_at', 'version', 'allowed_actions')
+        read_only_fields = ('pk', 'completed', 'completed_date', 'created_date', 'created_by', 'updated_at',
+                            'version')
         extra_kwargs = {
             'title': {'required': True},
             'status': {'required': False},
         }
 
 
-class GroupTaskSerializer(serializers.ModelSerializer):
+class GroupTaskSerializer(AllowedActionsMixin, SparseFieldsMixin, UpdateFieldsMixin, TimedModelSerializer):
     task = TaskSerializer(read_only=True)
     task_id = serializers.PrimaryKeyRelatedField(
         queryset=Task.objects.filter(), source='task', write_only=True
     )
+    allowed_actions = AllowedActionsField()
 
-    class Meta:
+    class Meta(TimedModelSerializer.Meta):
         model = GroupTask
-        fields = ('pk', 'task', 'task_id', 'group', 'assignee', 'lock_level', 'assign_lock_level')
-        read_only_fields = ('pk',)
+        fields = ('pk', 'task', 'task_id', 'group', 'assignee', 'lock_level', 'assign_lock_level', 'updated_at',
+                  'version', 'allowed_actions')
+        read_only_fields = ('pk', 'updated_at', 'version')
 
     def update(self, instance, validated_data):
         """
         task and group are not changeable.
         """
-        default_task = instance.task
-        default_group = instance.group
-        result = super().update(instance, validated_data)
-        result.task = default_task
-        result.group = default_group
-        return result
+        validated_data = {key: value for key, value in validated_data.items() if key not in ['task', 'group']}
+        return super().update(instance, validated_data)
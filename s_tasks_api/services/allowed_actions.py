@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+from django.db.models import Case, ExpressionWrapper, F, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from ..models import GroupTask
+
+ACTIONS = OrderedDict([
+    ('delete', 0b1),
+    ('complete', 0b1 << 1),
+    ('assign', 0b1 << 2),
+    ('change_title', 0b1 << 3),
+    ('change_detail', 0b1 << 4),
+    ('change_due_date', 0b1 << 5),
+    ('change_status', 0b1 << 6),
+    ('change_tag', 0b1 << 7),
+])
+# Column locks are the lowest bits of lock_level, in the order of the change_* actions.
+COLUMN_LOCKS = GroupTask.TITLE_LOCK | GroupTask.DETAIL_LOCK | GroupTask.DUE_DATE_LOCK | GroupTask.STATUS_LOCK | \
+               GroupTask.TAG_LOCK
+COLUMN_ACTIONS_SHIFT = 3
+COLUMN_ACTIONS = OrderedDict([
+    ('title', 'change_title'),
+    ('detail', 'change_detail'),
+    ('due_date', 'change_due_date'),
+    ('status', 'change_status'),
+    ('tag', 'change_tag'),
+])
+ALLOWED_ACTIONS_ATTRIBUTE = 'allowed_actions'
+
+
+def annotate_allowed_actions(queryset, user, group_task_prefix='', task_prefix='task__'):
+    """
+    Annotate allowed_actions, the bits of ACTIONS which user may do on each row, evaluated with bitwise
+    expressions in SQL as is_deletable, is_completable, is_assignable and list_unchangeable_columns do in Python.
+    group_task_prefix / task_prefix lead from the rows to the GroupTask / Task columns: '' / 'task__' for
+    group tasks, 'group_task__' / '' for tasks. Tasks which are not group tasks have no locks.
+    """
+    lock_level = Coalesce(group_task_prefix + 'lock_level', Value(GroupTask.NON_LOCK))
+    is_owner = Q(**{task_prefix + 'created_by': user.pk}) if user.pk is not None else Q(pk__in=[])
+    is_assignee = Q(**{group_task_prefix + 'assignee': user.pk}) if user.pk is not None else Q(pk__in=[])
+    is_personal = Q(**{group_task_prefix + 'group__isnull': True})
+    queryset = queryset.annotate(
+        allowed_delete_lock=_bitand(lock_level, Value(GroupTask.DELETE_LOCK)),
+        allowed_complete_lock=_bitand(lock_level, Value(GroupTask.COMPLETED_LOCK)),
+        allowed_assign_lock=_bitand(F(group_task_prefix + 'assign_lock_level'), Case(
+            When(is_owner, then=Value(GroupTask.ASSIGN_LOCK_CREATED_USER)),
+            When(is_assignee, then=Value(GroupTask.ASSIGN_LOCK_ASSIGNEE)),
+            default=Value(GroupTask.ASSIGN_LOCK_MEMBERS), output_field=IntegerField())),
+    )
+    return queryset.annotate(**{ALLOWED_ACTIONS_ATTRIBUTE: Case(
+        When(is_owner, then=Value(ACTIONS['delete'])),
+        When(is_personal, then=Value(0)),
+        When(allowed_delete_lock=0, then=Value(ACTIONS['delete'])),
+        default=Value(0), output_field=IntegerField(),
+    ) + Case(
+        When(is_owner, then=Value(ACTIONS['complete'])),
+        When(is_personal, then=Value(0)),
+        When(allowed_complete_lock=0, then=Value(ACTIONS['complete'])),
+        default=Value(0), output_field=IntegerField(),
+    ) + Case(
+        When(is_personal, then=Value(0)),
+        When(allowed_assign_lock=0, then=Value(ACTIONS['assign'])),
+        default=Value(0), output_field=IntegerField(),
+    ) + ExpressionWrapper(
+        (Value(COLUMN_LOCKS) - _bitand(lock_level, Value(COLUMN_LOCKS))) * Value(0b1 << COLUMN_ACTIONS_SHIFT),
+        output_field=IntegerField(),
+    )})
+
+
+def get_annotated_allowed_actions(task):
+    """
+    allowed_actions of a row fetched through annotate_allowed_actions, otherwise None.
+    """
+    return getattr(task, ALLOWED_ACTIONS_ATTRIBUTE, None)
+
+
+def get_action_names(allowed_actions):
+    return [name for name, bit in ACTIONS.items() if allowed_actions & bit]
+
+
+def list_locked_columns(allowed_actions):
+    return [column for column, name in COLUMN_ACTIONS.items() if not allowed_actions & ACTIONS[name]]
+
+
+def _bitand(lhs, rhs):
+    return ExpressionWrapper(lhs.bitand(rhs), output_field=IntegerField())
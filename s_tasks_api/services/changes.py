@@ -0,0 +1,144 @@
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q, Max, Min
+from django.utils import timezone
+
+from ..models import Task, GroupTask, TaskChange
+from ..settings import api_settings
+from .tasks import convert_group_task, get_tasks, get_group_tasks, get_group_ids, shape_tasks, shape_group_tasks
+from .snapshots import get_previous_group_task, get_changed_membership
+
+Changes = namedtuple('Changes', ['token', 'has_more', 'reset', 'tasks', 'deleted_task_ids', 'group_tasks',
+                                 'deleted_group_task_ids'])
+
+
+def build_task_change(task, deleted=False):
+    """
+    Build a change log entry of task or group task.
+    Entries carry every id which decides who can see the row, so that tombstones can be matched to users.
+    """
+    group_task = convert_group_task(task)
+    assignee_id = group_task.assignee_id if group_task is not None else None
+    _, previous_assignee_id = get_previous_group_task(group_task)
+    return TaskChange(
+        task_id=task.pk if type(task) is Task else task.task_id,
+        group_task_id=group_task.pk if group_task is not None else None,
+        deleted=deleted,
+        created_by_id=task.created_by_id if type(task) is Task else None,
+        group_id=group_task.group_id if group_task is not None else None,
+        assignee_id=assignee_id,
+        previous_assignee_id=previous_assignee_id if previous_assignee_id != assignee_id else None,
+    )
+
+
+def record_task_changes(tasks):
+    TaskChange.objects.bulk_create([build_task_change(task) for task in tasks])
+
+
+def record_task_change(sender, instance, **kwargs):
+    build_task_change(instance).save()
+
+
+def record_task_deletion(sender, instance, **kwargs):
+    build_task_change(instance, deleted=True).save()
+
+
+def record_membership_changes(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+    """
+    m2m_changed of User.groups, from both sides (user.groups / group.user_set).
+    Users who join or leave a group get an entry of their own for each group task of the group,
+    so that they receive the group tasks which already existed, or tombstones of them.
+    Users who leave also get entries for the group tasks in the change log of the group, so that tombstones of
+    group tasks deleted before they left still reach them.
+    """
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    pk_set = get_changed_membership(instance, action, pk_set)
+    if not pk_set:
+        return
+    user_ids, group_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    group_tasks = set(GroupTask.objects.using(using).filter(group__in=group_ids).values_list('pk', 'task_id'))
+    if action != 'post_add':
+        group_tasks.update(TaskChange.objects.using(using).filter(group_id__in=group_ids, user_id__isnull=True)
+                           .values_list('group_task_id', 'task_id').distinct())
+    TaskChange.objects.using(using).bulk_create([
+        TaskChange(task_id=task_id, group_task_id=group_task_id, user_id=user_id)
+        for user_id in user_ids for group_task_id, task_id in group_tasks
+    ], batch_size=1000)
+
+
+def prune_task_changes(before, using=DEFAULT_DB_ALIAS):
+    """
+    Delete change log entries older than before, and return how many were deleted.
+    The latest entry is kept, so that get_changes can still tell clients with older tokens to resync.
+    """
+    task_changes = TaskChange.objects.using(using)
+    latest = task_changes.aggregate(latest=Max('pk'))['latest']
+    if latest is None:
+        return 0
+    deleted, _ = task_changes.filter(pk__lt=latest, changed_at__lt=before).delete()
+    return deleted
+
+
+def get_changes(user, since, limit):
+    """
+    Return tasks and group tasks which user can see and were changed after the change token since,
+    and ids of the ones which were deleted or which user can not see anymore.
+    At most limit change log entries are read; has_more tells that the returned token is not the latest.
+    reset tells that entries after since were pruned, so that the client has to read its lists again.
+    """
+    bounds = TaskChange.objects.aggregate(latest=Max('pk'), oldest=Min('pk'))
+    latest_token = bounds['latest'] or since
+    if since and bounds['oldest'] is not None and since < bounds['oldest'] - 1:
+        return Changes(token=_hold_back_token(since, latest_token), has_more=False, reset=True, tasks=[],
+                       deleted_task_ids=[], group_tasks=[], deleted_group_task_ids=[])
+    group_ids = get_group_ids(user)
+    my_task_condition = Q(created_by_id=user.pk) | Q(assignee_id=user.pk) | Q(previous_assignee_id=user.pk) | \
+        Q(user_id=user.pk)
+    entries = list(TaskChange.objects.filter(pk__gt=since, pk__lte=latest_token)
+                   .filter(my_task_condition | Q(group_id__in=group_ids))
+                   .values_list('pk', 'task_id', 'group_task_id', 'created_by_id', 'group_id', 'assignee_id',
+                                'previous_assignee_id', 'user_id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    token = entries[-1][0] if has_more else max(latest_token, since)
+    settled_token = _hold_back_token(since, token)
+    has_more = has_more and settled_token == token
+    token = settled_token
+
+    task_ids = set()
+    group_task_ids = set()
+    for (pk, task_id, group_task_id, created_by_id, group_id, assignee_id, previous_assignee_id, user_id) in entries:
+        if user.pk in [created_by_id, assignee_id, previous_assignee_id]:
+            task_ids.add(task_id)
+        if group_task_id is not None and (group_id in group_ids or user_id == user.pk):
+            group_task_ids.add(group_task_id)
+
+    tasks = list(shape_tasks(get_tasks(user).filter(pk__in=task_ids), 'list'))
+    group_tasks = list(shape_group_tasks(get_group_tasks(user, group_ids=group_ids).filter(pk__in=group_task_ids),
+                                         'list'))
+    return Changes(
+        token=token,
+        has_more=has_more,
+        reset=False,
+        tasks=tasks,
+        deleted_task_ids=sorted(task_ids - {task.pk for task in tasks}),
+        group_tasks=group_tasks,
+        deleted_group_task_ids=sorted(group_task_ids - {group_task.pk for group_task in group_tasks}),
+    )
+
+
+def _hold_back_token(since, token):
+    """
+    Ids are taken when rows are inserted but become visible when transactions commit, so that entries
+    younger than S_TASKS_API CHANGES_TOKEN_MARGIN seconds may still get older ids committed before them.
+    The token stops before them; they are sent again with the next request.
+    """
+    margin = api_settings.CHANGES_TOKEN_MARGIN
+    if not margin or token <= since:
+        return token
+    settled = TaskChange.objects.filter(pk__gt=since, pk__lte=token,
+                                        changed_at__lte=timezone.now() - timedelta(seconds=margin))
+    return settled.aggregate(settled=Max('pk'))['settled'] or since
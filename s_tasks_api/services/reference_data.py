@@ -0,0 +1,85 @@
+import copy
+import threading
+
+from django.core.cache import caches
+from django.db import transaction
+
+from s_tasks_api.settings import api_settings
+
+SHARED_VERSION_KEY = 's_tasks_api:reference_data_version:{label}'
+
+
+class ReferenceDataCache:
+    """
+    Process local cache of reference rows (TaskStatus, TaskTag) by pk.
+    Entries are dropped when post_save / post_delete of the model commits.
+    When api_settings.REFERENCE_DATA_CACHE names a Django cache, a version kept in that cache is
+    bumped on invalidation and compared on each read, so that every worker drops its stale copies.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._versions = {}
+
+    def get(self, model, pk):
+        pk = int(pk)
+        label = model._meta.label_lower
+        shared_version = self._get_shared_version(label)
+        with self._lock:
+            if self._versions.get(label) != shared_version:
+                self._rows.pop(label, None)
+                self._versions[label] = shared_version
+            rows = self._rows.setdefault(label, {})
+            row = rows.get(pk)
+        if row is None:
+            row = model.objects.get(pk=pk)
+            with self._lock:
+                if self._versions.get(label) == shared_version:
+                    self._rows.setdefault(label, {})[pk] = row
+        return copy.copy(row)
+
+    def invalidate(self, model):
+        label = model._meta.label_lower
+        with self._lock:
+            self._rows.pop(label, None)
+        shared_cache = self._get_shared_cache()
+        if shared_cache is not None:
+            key = SHARED_VERSION_KEY.format(label=label)
+            if shared_cache.add(key, 1, timeout=None):
+                return
+            try:
+                shared_cache.incr(key)
+            except ValueError:
+                shared_cache.set(key, 1, timeout=None)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._versions.clear()
+
+    def _get_shared_version(self, label):
+        shared_cache = self._get_shared_cache()
+        if shared_cache is None:
+            return None
+        return shared_cache.get(SHARED_VERSION_KEY.format(label=label), 0)
+
+    # noinspection PyMethodMayBeStatic
+    def _get_shared_cache(self):
+        alias = api_settings.REFERENCE_DATA_CACHE
+        return caches[alias] if alias is not None else None
+
+
+reference_data_cache = ReferenceDataCache()
+
+
+def get_reference_data(model, pk):
+    return reference_data_cache.get(model, pk)
+
+
+def invalidate_reference_data(sender, using=None, **kwargs):
+    """
+    post_save / post_delete of TaskStatus and TaskTag. Invalidated before the commit, a concurrent reader could
+    still read the old row and cache it again, also under the new shared version.
+    """
+    transaction.on_commit(lambda: reference_data_cache.invalidate(sender), using=using)
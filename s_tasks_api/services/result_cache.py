@@ -0,0 +1,128 @@
+import hashlib
+import uuid
+
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from ..models import Task, GroupTask
+from ..settings import api_settings
+from .snapshots import Membership, get_previous_group_task, get_changed_membership
+
+GENERATION_KEY = 's_tasks_api:generation:{user}'
+RESULT_KEY = 's_tasks_api:result:{user}:{generation}:{query}'
+
+
+def get_result_cache_aliases():
+    return {alias for alias in [api_settings.LIST_CACHE, api_settings.STATS_CACHE] if alias is not None}
+
+
+def is_result_cache_enabled():
+    return bool(get_result_cache_aliases())
+
+
+def get_cached_result(alias, timeout, user, query, get_result):
+    """
+    Return get_result() through the Django cache of alias (None disables caching), keyed by user, query
+    (e.g. the absolute URI of the request) and the generation of user.
+    Writes bump generations of the users who see the written tasks, so stale entries are never read again
+    and expire after timeout seconds.
+    """
+    if alias is None:
+        return get_result()
+    cache = caches[alias]
+    key = RESULT_KEY.format(user=user.pk, generation=get_generation(alias, user),
+                            query=hashlib.md5(query.encode()).hexdigest())
+    result = cache.get(key)
+    if result is None:
+        result = get_result()
+        cache.set(key, result, timeout)
+    return result
+
+
+def get_generation(alias, user):
+    """
+    Generation of user in the Django cache of alias; it changes whenever a task the user sees is written.
+    """
+    return _get_generation(caches[alias], user.pk)
+
+
+def bump_generations(user_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Give users of user_ids a new generation, with one set_many per cache, when the transaction of using commits
+    (at once outside of transactions). Bumped before the commit, a concurrent reader could still read the old rows
+    and cache them under the new generation.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    transaction.on_commit(lambda: _set_generations(user_ids), using=using)
+
+
+def get_affected_user_ids(task_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Creators, assignees and group members of tasks of task_ids.
+    """
+    group_tasks = GroupTask.objects.using(using).filter(task__in=task_ids)
+    user_ids = set(Task.objects.using(using).filter(pk__in=task_ids).values_list('created_by_id', flat=True))
+    user_ids |= set(group_tasks.values_list('assignee_id', flat=True))
+    user_ids |= set(Membership.objects.using(using).filter(group__in=group_tasks.values('group'))
+                    .values_list('user_id', flat=True))
+    return user_ids
+
+
+def invalidate_task_results(tasks, using=DEFAULT_DB_ALIAS):
+    """
+    Bump generations of the users who see tasks written without signals, e.g. by bulk_update.
+    """
+    if not is_result_cache_enabled():
+        return
+    bump_generations(get_affected_user_ids([task.pk for task in tasks], using) |
+                     {task.created_by_id for task in tasks}, using)
+
+
+def bump_task_generations(sender, instance, using=None, **kwargs):
+    """
+    Task post_save / post_delete. Group tasks deleted with the task send their own post_delete.
+    """
+    invalidate_task_results([instance], using)
+
+
+def bump_group_task_generations(sender, instance, using=None, **kwargs):
+    """
+    GroupTask post_save / post_delete. Members of the previous group and the previous assignee lose the task.
+    """
+    if not is_result_cache_enabled():
+        return
+    previous_group_id, previous_assignee_id = get_previous_group_task(instance)
+    user_ids = {instance.assignee_id, previous_assignee_id}
+    user_ids |= set(Membership.objects.using(using).filter(group__in={instance.group_id, previous_group_id} - {None})
+                    .values_list('user_id', flat=True))
+    user_ids |= set(Task.objects.using(using).filter(pk=instance.task_id).values_list('created_by_id', flat=True))
+    bump_generations(user_ids, using)
+
+
+def bump_membership_generations(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+    """
+    m2m_changed of User.groups, from both sides (user.groups / group.user_set).
+    """
+    if not is_result_cache_enabled() or action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    bump_generations(get_changed_membership(instance, action, pk_set) if reverse else [instance.pk], using)
+
+
+def _get_generation(cache, user_id):
+    key = GENERATION_KEY.format(user=user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # A lost generation must not match entries stored before it was lost.
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, timeout=None):
+            generation = cache.get(key)
+    return generation
+
+
+def _set_generations(user_ids):
+    for alias in get_result_cache_aliases():
+        generation = uuid.uuid4().hex
+        caches[alias].set_many({GENERATION_KEY.format(user=user_id): generation for user_id in user_ids},
+                               timeout=None)
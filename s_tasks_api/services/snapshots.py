@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+
+from ..models import GroupTask
+
+PREVIOUS_GROUP_TASK_ATTRIBUTE = '_s_tasks_previous_group_task'
+CLEARED_MEMBERSHIP_ATTRIBUTE = '_s_tasks_cleared_membership'
+
+Membership = get_user_model().groups.through
+
+
+def remember_previous_group_task(sender, instance, raw=False, using=None, **kwargs):
+    """
+    GroupTask pre_save. (group_id, assignee_id) of the row before the save, read with one SELECT for the
+    post_save receivers of the change log, the visibility table and the result cache.
+    """
+    previous = None
+    if not raw and instance.pk is not None:
+        previous = GroupTask.objects.using(using).filter(pk=instance.pk).values_list('group_id', 'assignee_id').first()
+    setattr(instance, PREVIOUS_GROUP_TASK_ATTRIBUTE, previous)
+
+
+def get_previous_group_task(instance):
+    """
+    (group_id, assignee_id) which remember_previous_group_task read, (None, None) for new rows and outside of saves.
+    """
+    return getattr(instance, PREVIOUS_GROUP_TASK_ATTRIBUTE, None) or (None, None)
+
+
+def forget_previous_group_task(sender, instance, **kwargs):
+    """
+    GroupTask post_save, connected after the receivers which read the previous row.
+    """
+    if hasattr(instance, PREVIOUS_GROUP_TASK_ATTRIBUTE):
+        delattr(instance, PREVIOUS_GROUP_TASK_ATTRIBUTE)
+
+
+def remember_cleared_membership(sender, instance, action, reverse, using=None, **kwargs):
+    """
+    m2m_changed of User.groups, from both sides (user.groups / group.user_set).
+    pre_clear reads the pks of the other side once for the receivers of post_clear, which has no pk_set.
+    """
+    if action != 'pre_clear':
+        return
+    if reverse:
+        cleared_ids = Membership.objects.using(using).filter(group_id=instance.pk).values_list('user_id', flat=True)
+    else:
+        cleared_ids = Membership.objects.using(using).filter(user_id=instance.pk).values_list('group_id', flat=True)
+    setattr(instance, CLEARED_MEMBERSHIP_ATTRIBUTE, set(cleared_ids))
+
+
+def forget_cleared_membership(sender, instance, action, **kwargs):
+    """
+    m2m_changed of User.groups, connected after the receivers which read the cleared pks.
+    """
+    if action == 'post_clear' and hasattr(instance, CLEARED_MEMBERSHIP_ATTRIBUTE):
+        delattr(instance, CLEARED_MEMBERSHIP_ATTRIBUTE)
+
+
+def get_changed_membership(instance, action, pk_set):
+    """
+    pks of the other side which post_add / post_remove / post_clear of User.groups added or removed.
+    """
+    if action == 'post_clear':
+        return getattr(instance, CLEARED_MEMBERSHIP_ATTRIBUTE, set())
+    return pk_set or set()
@@ -0,0 +1,36 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+STATS_DIMENSIONS = ['status', 'tag', 'group', 'assignee']
+STATS_COUNTS = ['total', 'completed', 'overdue']
+
+
+def get_task_stats(queryset, lookups, task_prefix=''):
+    """
+    Count total, completed and overdue (not completed, due date passed) tasks of queryset, in all and
+    per status, tag, group and assignee, with one GROUP BY query over the four dimensions.
+    lookups maps each of STATS_DIMENSIONS to its lookup on queryset and task_prefix leads to the Task columns,
+    e.g. 'task__' for group tasks.
+    """
+    completed = task_prefix + 'completed'
+    # Annotations are prefixed not to clash with the completed column.
+    rows = queryset.order_by().values(*[lookups[dimension] for dimension in STATS_DIMENSIONS]).annotate(
+        stats_total=Count('pk'),
+        stats_completed=Count('pk', filter=Q(**{completed: True})),
+        stats_overdue=Count('pk', filter=Q(**{completed: False, task_prefix + 'due_date__lt': timezone.now().date()})),
+    )
+    stats = dict.fromkeys(STATS_COUNTS, 0)
+    groups = {dimension: {} for dimension in STATS_DIMENSIONS}
+    for row in rows:
+        for count in STATS_COUNTS:
+            stats[count] += row['stats_' + count]
+        for dimension in STATS_DIMENSIONS:
+            group = groups[dimension].setdefault(row[lookups[dimension]], dict.fromkeys(STATS_COUNTS, 0))
+            for count in STATS_COUNTS:
+                group[count] += row['stats_' + count]
+    for dimension in STATS_DIMENSIONS:
+        stats[dimension] = [
+            dict({dimension: key}, **counts)
+            for key, counts in sorted(groups[dimension].items(), key=lambda item: (item[0] is not None, item[0]))
+        ]
+    return stats
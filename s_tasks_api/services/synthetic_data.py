@@ -0,0 +1,173 @@
+import datetime
+import random
+import zlib
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS
+
+from ..models import Task, GroupTask, TaskStatus, TaskTag
+
+SyntheticData = namedtuple('SyntheticData', ['user_ids', 'group_ids', 'tag_ids', 'status_ids', 'task_count',
+                                             'group_task_count'])
+
+DUE_DATE_DISTRIBUTIONS = ['uniform', 'triangular']
+
+
+def generate_synthetic_data(users=100, groups=10, groups_per_user=1, group_skew=0.0, tasks_per_user=10,
+                            task_skew=0.0, group_task_share=0.5, lock_share=0.0, completed_share=0.3,
+                            due_date_share=0.7, due_date_min_days=-30, due_date_max_days=90,
+                            due_date_distribution='uniform', tags=10, statuses=0, seed=0, batch_size=1000,
+                            prefix='s_tasks_synthetic_', using=DEFAULT_DB_ALIAS):
+    """
+    Insert users, groups, tags, statuses, tasks and group tasks with bulk_create in batches of batch_size.
+
+    Skew:
+    - task_skew: tasks of user are Zipf distributed with this exponent, averaging tasks_per_user (0 is even).
+    - group_skew: each user joins groups_per_user groups, weighted Zipf with this exponent (0 is even).
+    - group_task_share of tasks are group tasks of one of the creator's groups, assigned to a random member or nobody.
+    - lock_share of group tasks get random lock_level and assign_lock_level.
+    - due_date_share of tasks have a due date between today + due_date_min_days and today + due_date_max_days,
+      'uniform' or 'triangular' (peaking today).
+
+    The same seed gives the same rows. Names start with prefix, so that generated rows can be found again.
+    bulk_create sends no signals: rebuild the search index afterwards when a full text backend is used.
+    """
+    if due_date_distribution not in DUE_DATE_DISTRIBUTIONS:
+        raise ValueError('due_date_distribution must be one of {}.'.format(DUE_DATE_DISTRIBUTIONS))
+    rng = random.Random(seed)
+    user_model = get_user_model()
+    # TaskTag / TaskStatus values are short, so they are named by a hash of prefix.
+    short_prefix = '{:08x}-'.format(zlib.crc32(prefix.encode()))
+
+    if not TaskStatus.objects.using(using).exists():
+        call_command('loaddata', 'default_task_status_data', database=using, verbosity=0)
+    _bulk_create(TaskStatus, (TaskStatus(value='s{}{}'.format(short_prefix, i)) for i in range(statuses)),
+                 batch_size, using)
+    status_ids = list(TaskStatus.objects.using(using).order_by('pk').values_list('pk', flat=True))
+    tag_ids = _bulk_create(TaskTag, (TaskTag(value='t{}{}'.format(short_prefix, i)) for i in range(tags)),
+                           batch_size, using)
+
+    user_ids = _bulk_create(user_model, (user_model(username='{}user{}'.format(prefix, i), password='!')
+                                         for i in range(users)), batch_size, using)
+    group_ids = _bulk_create(Group, (Group(name='{}group{}'.format(prefix, i)) for i in range(groups)),
+                             batch_size, using)
+
+    group_weights = _zipf_weights(len(group_ids), group_skew, rng)
+    groups_of_user = {user_id: _weighted_sample(group_ids, group_weights, groups_per_user, rng)
+                      for user_id in user_ids}
+    members_of_group = {group_id: [] for group_id in group_ids}
+    for user_id, user_group_ids in groups_of_user.items():
+        for group_id in user_group_ids:
+            members_of_group[group_id].append(user_id)
+    membership_model = user_model.groups.through
+    _bulk_create(membership_model, (membership_model(user_id=user_id, group_id=group_id)
+                                    for user_id, user_group_ids in groups_of_user.items()
+                                    for group_id in user_group_ids), batch_size, using)
+
+    task_counts = _skewed_counts(users * tasks_per_user, user_ids, task_skew, rng)
+    today = datetime.date.today()
+    task_count = 0
+    group_task_count = 0
+    for batch in _batches(((user_id, i) for user_id in user_ids for i in range(task_counts[user_id])), batch_size):
+        tasks = [Task(
+            title='{}task{}-{}'.format(prefix, user_id, i),
+            detail='synthetic task {} of user {}'.format(i, user_id),
+            due_date=_get_due_date(today, due_date_share, due_date_min_days, due_date_max_days,
+                                   due_date_distribution, rng),
+            status_id=rng.choice(status_ids),
+            tag_id=rng.choice(tag_ids + [None]),
+            completed=rng.random() < completed_share,
+            created_by_id=user_id,
+        ) for user_id, i in batch]
+        task_ids = _bulk_create(Task, tasks, batch_size, using)
+        group_tasks = []
+        for task_id, task in zip(task_ids, tasks):
+            user_group_ids = groups_of_user[task.created_by_id]
+            if not user_group_ids or rng.random() >= group_task_share:
+                continue
+            group_id = rng.choice(user_group_ids)
+            locked = rng.random() < lock_share
+            group_tasks.append(GroupTask(
+                task_id=task_id,
+                group_id=group_id,
+                assignee_id=rng.choice(members_of_group[group_id] + [None]),
+                lock_level=rng.randint(GroupTask.TITLE_LOCK, GroupTask.FULL_LOCK) if locked else GroupTask.NON_LOCK,
+                assign_lock_level=rng.randint(GroupTask.ASSIGN_LOCK_NON, GroupTask.ASSIGN_FULL_LOCK) if locked
+                else GroupTask.ASSIGN_LOCK_NON,
+            ))
+        _bulk_create(GroupTask, group_tasks, batch_size, using)
+        task_count += len(tasks)
+        group_task_count += len(group_tasks)
+
+    return SyntheticData(user_ids=user_ids, group_ids=group_ids, tag_ids=tag_ids, status_ids=status_ids,
+                         task_count=task_count, group_task_count=group_task_count)
+
+
+def _zipf_weights(size, skew, rng):
+    weights = [1 / rank ** skew for rank in range(1, size + 1)]
+    rng.shuffle(weights)
+    return weights
+
+
+def _skewed_counts(total, keys, skew, rng):
+    """
+    Split total into Zipf(skew) distributed counts of keys.
+    """
+    if not keys:
+        return {}
+    weights = _zipf_weights(len(keys), skew, rng)
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for i in range(total - sum(counts)):
+        counts[i % len(counts)] += 1
+    return dict(zip(keys, counts))
+
+
+def _weighted_sample(population, weights, k, rng):
+    """
+    k distinct items of population, drawn with weights (Efraimidis-Spirakis).
+    """
+    keys = [(rng.random() ** (1 / weight), item) for item, weight in zip(population, weights)]
+    return [item for key, item in sorted(keys, reverse=True)[:k]]
+
+
+def _get_due_date(today, share, min_days, max_days, distribution, rng):
+    if rng.random() >= share:
+        return None
+    if distribution == 'triangular':
+        days = rng.triangular(min_days, max_days, min(max(0, min_days), max_days))
+    else:
+        days = rng.uniform(min_days, max_days)
+    return today + datetime.timedelta(days=round(days))
+
+
+def _batches(iterable, batch_size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_create(model, objects, batch_size, using):
+    """
+    bulk_create objects and return their pks in insertion order.
+    Databases which do not return pks of inserted rows (e.g. SQLite) are asked for the rows above
+    the last pk, which assumes nobody else inserts into the table meanwhile.
+    """
+    pks = []
+    for batch in _batches(objects, batch_size):
+        last_pk = model._default_manager.using(using).order_by('-pk').values_list('pk', flat=True).first() or 0
+        model._default_manager.using(using).bulk_create(batch)
+        if all(obj.pk is not None for obj in batch):
+            pks.extend(obj.pk for obj in batch)
+        else:
+            pks.extend(model._default_manager.using(using).filter(pk__gt=last_pk).order_by('pk')
+                       .values_list('pk', flat=True))
+    return pks
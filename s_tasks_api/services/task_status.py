@@ -1,4 +1,5 @@
 from s_tasks_api.models import TaskStatus
+from s_tasks_api.services.reference_data import get_reference_data
 from s_tasks_api.settings import api_settings
 
 
@@ -9,4 +10,4 @@ def get_task_status_from_or_default(dictionary: dict):
 
 
 def get_default_task_status():
-    return TaskStatus.objects.get(pk=api_settings.TASK_MODEL['STATUS_DEFAULT_PK'])
+    return get_reference_data(TaskStatus, api_settings.TASK_MODEL['STATUS_DEFAULT_PK'])
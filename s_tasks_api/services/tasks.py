@@ -1,6 +1,17 @@
+from collections import namedtuple
+
+from django.db import connections, router, transaction
+from django.http import Http404
 from django.utils import timezone
-from django.db.models import Q
-from ..models import Task, GroupTask
+from django.db.models import Case, F, Q, Value, When
+from ..models import Task, GroupTask, TaskVisibility
+from ..search import index_tasks
+from .result_cache import invalidate_task_results
+from .visibility import is_visibility_table_enabled, get_visible_task_ids, add_created_task_visibilities
+
+COMPLETION_FIELDS = ['completed', 'completed_date', 'updated_at', 'version']
+
+TaskFacts = namedtuple('TaskFacts', ['created_by_id', 'group_id', 'assignee_id', 'lock_level', 'assign_lock_level'])
 
 
 def get_task(user, pk):
@@ -12,28 +23,75 @@ def get_task(user, pk):
 
 def get_tasks(user, tasks=None):
     tasks = tasks if tasks is not None else Task.objects.all()
-    return tasks.filter(Q(created_by=user.pk) | Q(group_task__assignee=user.pk))
+    if is_visibility_table_enabled():
+        return tasks.filter(pk__in=get_visible_task_ids(user, [TaskVisibility.CREATED, TaskVisibility.ASSIGNED]))
+    assigned_task_ids = GroupTask.objects.filter(assignee=user.pk).values('task')
+    return tasks.filter(Q(created_by=user.pk) | Q(pk__in=assigned_task_ids))
 
 
-def get_group_tasks(user, group_tasks=None):
+def get_group_tasks(user, group_tasks=None, group_ids=None):
+    """
+    group_ids are user's group ids when the caller already has them, otherwise they are read in a subquery.
+    """
     group_tasks = group_tasks if group_tasks is not None else GroupTask.objects.all()
-    return group_tasks.filter(group__in=[group.pk for group in user.groups.all()])
+    if is_visibility_table_enabled():
+        return group_tasks.filter(task__in=get_visible_task_ids(user, [TaskVisibility.GROUP_MEMBER]))
+    return group_tasks.filter(group__in=group_ids if group_ids is not None else user.groups.values('pk'))
+
+
+def shape_tasks(tasks, action=None):
+    """
+    Select the relations which serializers and permissions touch on this viewset action,
+    so that the number of queries per request does not grow with the number of tasks.
+    """
+    if action == 'list':
+        return tasks
+    return tasks.select_related('created_by', 'group_task', 'group_task__group', 'group_task__assignee')
+
+
+def shape_group_tasks(group_tasks, action=None):
+    """
+    Same as shape_tasks, for group tasks.
+    """
+    if action == 'list':
+        return group_tasks.select_related('task', 'group')
+    return group_tasks.select_related('task', 'task__created_by', 'group', 'assignee')
+
+
+def get_group_ids(user):
+    return set(user.groups.values_list('pk', flat=True))
+
+
+def get_task_facts(task):
+    """
+    Collect the columns which permission checks read from task or group task.
+    group_id is None when task is not a group task.
+    """
+    group_task = convert_group_task(task)
+    if group_task is None:
+        return TaskFacts(get_created_user_id(task), None, None, GroupTask.NON_LOCK, GroupTask.ASSIGN_LOCK_NON)
+    return TaskFacts(get_created_user_id(group_task), group_task.group_id, group_task.assignee_id,
+                     group_task.lock_level, group_task.assign_lock_level)
 
 
 def is_task_created_by(user, task):
-    created_user = get_created_user(task)
-    return user == created_user
+    return user.pk is not None and user.pk == get_created_user_id(task)
 
 
 def am_i_assignee(user, task):
-    return task in [group_task.task for group_task in GroupTask.objects.filter(assignee=user).all()]
+    """
+    Whether the Task task is assigned to user. Other objects, group tasks too, are never assigned.
+    """
+    if type(task) is not Task or user.pk is None:
+        return False
+    return GroupTask.objects.filter(task_id=task.pk, assignee_id=user.pk).exists()
 
 
 def is_my_group_task(user, task):
     group_task = convert_group_task(task)
     if group_task is None:
         return False
-    return group_task in get_group_tasks(user)
+    return group_task.group_id in get_group_ids(user)
 
 
 def get_created_user(task):
@@ -43,6 +101,13 @@ def get_created_user(task):
     return task.task.created_by
 
 
+def get_created_user_id(task):
+    raise_if_not_task_or_group_task(task)
+    if type(task) is Task:
+        return task.created_by_id
+    return task.task.created_by_id
+
+
 # noinspection PyUnresolvedReferences
 def convert_group_task(task):
     raise_if_not_task_or_group_task(task)
@@ -63,55 +128,191 @@ def raise_if_not_task_or_group_task(task):
 
 
 def complete_task(user, pk):
-    task = get_task(user, pk)
-    if task.completed:
-        return task
-    task.completed = True
-    task.completed_date = timezone.now().date()
-    task.save()
-    return task
+    return set_task_completed(get_task(user, pk), True)
 
 
 def un_complete_task(user, pk):
-    task = get_task(user, pk)
-    if not task.completed:
-        return task
-    task.completed = False
-    task.completed_date = None
-    task.save()
+    return set_task_completed(get_task(user, pk), False)
+
+
+def set_task_completed(task, completed):
+    """
+    Complete or un-complete task, which the caller read (and checked permissions of) already, with one UPDATE
+    matching its pk and the version it was read with, and set the written columns on task.
+    When the row was changed meanwhile, only the completion columns are read again and, unless another request
+    put the task in that state already, the UPDATE is repeated with the new version; Http404 is raised when
+    the row was deleted meanwhile.
+    """
+    from .changes import record_task_changes
+    while task.completed != completed:
+        now = timezone.now()
+        if update_completed(Task.objects.filter(pk=task.pk, version=task.version), completed, now):
+            task.completed = completed
+            task.completed_date = now.date() if completed else None
+            task.updated_at = now
+            task.version += 1
+            record_task_changes([task])
+            invalidate_task_results([task])
+            break
+        try:
+            task.refresh_from_db(fields=COMPLETION_FIELDS)
+        except Task.DoesNotExist:
+            raise Http404('Task {} was deleted by another request.'.format(task.pk))
     return task
 
 
+def update_completed(tasks, completed, now=None):
+    """
+    Write completed, completed_date and updated_at of the rows of tasks (a queryset) whose completed differs,
+    with one UPDATE which also increments version, and return the number of rows. Other columns are not written,
+    so concurrent changes of them are kept, and a row is not completed twice by concurrent requests.
+    Like other writes without signals, callers record changes and invalidate cached results of the rows.
+    """
+    now = now if now is not None else timezone.now()
+    return tasks.filter(completed=not completed).update(
+        completed=completed, completed_date=now.date() if completed else None, updated_at=now,
+        version=F('version') + 1)
+
+
+def bulk_create_tasks(tasks):
+    """
+    Insert tasks with one bulk INSERT per batch. Callers need the primary keys of inserted rows: databases which
+    do not return them, other than SQLite, save tasks one by one. SQLite writers run one at a time and its
+    AUTOINCREMENT keys grow in insert order, so the keys are the latest ones, read back in the same transaction.
+    """
+    using = router.db_for_write(Task)
+    connection = connections[using]
+    if not connection.features.can_return_rows_from_bulk_insert and connection.vendor != 'sqlite':
+        for task in tasks:
+            task.save(using=using)
+        return tasks
+    from .changes import record_task_changes
+    with transaction.atomic(using=using):
+        Task.objects.using(using).bulk_create(tasks)
+        if tasks and tasks[0].pk is None:
+            pks = list(Task.objects.using(using).order_by('-pk').values_list('pk', flat=True)[:len(tasks)])
+            for task, pk in zip(tasks, reversed(pks)):
+                task.pk = pk
+    index_tasks(tasks, using)
+    add_created_task_visibilities(tasks, using)
+    record_task_changes(tasks)
+    invalidate_task_results(tasks, using)
+    return tasks
+
+
+def bulk_update_tasks(tasks, fields):
+    """
+    Write fields of tasks with one UPDATE per batch, which sets each row with CASE WHEN pk like
+    QuerySet.bulk_update, matches only the versions the tasks were read with and increments them,
+    like Model.save_if_unchanged. The rows which carry the updated_at of this UPDATE afterwards were written;
+    the other tasks, whose rows were changed by another request meanwhile, are returned and not written.
+    """
+    from .changes import record_task_changes
+    using = router.db_for_write(Task)
+    model_fields = [Task._meta.get_field(field) for field in fields]
+    tasks = list({task.pk: task for task in tasks}.values())
+    if not tasks:
+        return []
+    batch_size = connections[using].ops.bulk_batch_size(['pk', 'pk', 'version'] + list(fields), tasks) or len(tasks)
+    now = timezone.now()
+    updated_tasks = []
+    conflicted_tasks = []
+    for start in range(0, len(tasks), batch_size):
+        batch = tasks[start:start + batch_size]
+        rows = Task.objects.using(using).filter(pk__in=[task.pk for task in batch])
+        versions = Q()
+        for task in batch:
+            versions |= Q(pk=task.pk, version=task.version)
+        rows.filter(versions).update(updated_at=now, version=F('version') + 1, **{
+            field.attname: Case(*[When(pk=task.pk, then=Value(getattr(task, field.attname), output_field=field))
+                                  for task in batch], output_field=field)
+            for field in model_fields
+        })
+        written_pks = set(rows.filter(updated_at=now).values_list('pk', flat=True))
+        for task in batch:
+            if task.pk in written_pks:
+                task.updated_at = now
+                task.version += 1
+                updated_tasks.append(task)
+            else:
+                conflicted_tasks.append(task)
+    if updated_tasks:
+        if 'title' in fields or 'detail' in fields:
+            index_tasks(updated_tasks, using)
+        record_task_changes(updated_tasks)
+        invalidate_task_results(updated_tasks, using)
+    return conflicted_tasks
+
+
+def bulk_complete_tasks(tasks):
+    """
+    Complete tasks with one UPDATE of the rows not completed yet, then read the completion columns of those rows
+    back, so that tasks carry what the rows hold also when a task is listed twice or another request
+    completed it meanwhile. Changes are recorded for the rows this UPDATE wrote, which carry its updated_at.
+    """
+    from .changes import record_task_changes
+    tasks_by_pk = {task.pk: task for task in tasks if not task.completed}
+    if not tasks_by_pk:
+        return tasks
+    now = timezone.now()
+    completed_tasks = Task.objects.filter(pk__in=list(tasks_by_pk))
+    update_completed(completed_tasks, True, now)
+    updated_tasks = []
+    for pk, *values in completed_tasks.values_list('pk', *COMPLETION_FIELDS):
+        task = tasks_by_pk[pk]
+        for field, value in zip(COMPLETION_FIELDS, values):
+            setattr(task, field, value)
+        if task.updated_at == now:
+            updated_tasks.append(task)
+    if updated_tasks:
+        record_task_changes(updated_tasks)
+        invalidate_task_results(updated_tasks)
+    return tasks
+
+
 def is_deletable_task(user, task):
-    if is_task_created_by(user, task):
+    return is_deletable(user, get_task_facts(task))
+
+
+def is_completable_task(user, task):
+    return is_completable(user, get_task_facts(task))
+
+
+def is_assignable_task(user, task):
+    return is_assignable(user, get_task_facts(task))
+
+
+def list_unchangeable_group_task_columns_by_member(group_task: GroupTask):
+    return list_unchangeable_columns(get_task_facts(group_task))
+
+
+def is_deletable(user, facts: TaskFacts):
+    if user.pk == facts.created_by_id:
         return True
-    group_task = convert_group_task(task)
-    if group_task is None:
+    if facts.group_id is None:
         return False
-    return not (group_task.lock_level & GroupTask.DELETE_LOCK)
+    return not (facts.lock_level & GroupTask.DELETE_LOCK)
 
 
-def is_completable_task(user, task):
-    if is_task_created_by(user, task):
+def is_completable(user, facts: TaskFacts):
+    if user.pk == facts.created_by_id:
         return True
-    group_task = convert_group_task(task)
-    if group_task is None:
+    if facts.group_id is None:
         return False
-    return not (group_task.lock_level & GroupTask.COMPLETED_LOCK)
+    return not (facts.lock_level & GroupTask.COMPLETED_LOCK)
 
 
-def is_assignable_task(user, task):
-    group_task = convert_group_task(task)
-    if group_task is None:
+def is_assignable(user, facts: TaskFacts):
+    if facts.group_id is None:
         return False
-    if is_task_created_by(user, task):
-        return not (group_task.assign_lock_level & GroupTask.ASSIGN_LOCK_CREATED_USER)
-    if user == group_task.assignee:
-        return not (group_task.assign_lock_level & GroupTask.ASSIGN_LOCK_ASSIGNEE)
-    return not (group_task.assign_lock_level & GroupTask.ASSIGN_LOCK_MEMBERS)
+    if user.pk == facts.created_by_id:
+        return not (facts.assign_lock_level & GroupTask.ASSIGN_LOCK_CREATED_USER)
+    if facts.assignee_id is not None and user.pk == facts.assignee_id:
+        return not (facts.assign_lock_level & GroupTask.ASSIGN_LOCK_ASSIGNEE)
+    return not (facts.assign_lock_level & GroupTask.ASSIGN_LOCK_MEMBERS)
 
 
-def list_unchangeable_group_task_columns_by_member(group_task: GroupTask):
+def list_unchangeable_columns(facts: TaskFacts):
     bits_and_columns = {
         GroupTask.TITLE_LOCK: 'title',
         GroupTask.DETAIL_LOCK: 'detail',
@@ -121,6 +322,6 @@ def list_unchangeable_group_task_columns_by_member(group_task: GroupTask):
     }
     result = []
     for bit, column in bits_and_columns.items():
-        if bit & group_task.lock_level:
+        if bit & facts.lock_level:
             result.append(column)
     return result
@@ -14,8 +14,17 @@ def add_items_at_query_dict(query_dict, items):
 
 
 def is_in_same_group(user, other):
-    other_groups = other.groups.all()
-    for group in user.groups.all():
-        if group in other_groups:
-            return True
-    return False
+    """
+    Whether user and other share a group, by one EXISTS query.
+    """
+    user_group_ids = User.groups.through.objects.filter(user_id=user.pk).values('group_id')
+    return User.groups.through.objects.filter(user_id=other.pk, group_id__in=user_group_ids).exists()
+
+
+def is_in_any_group(user_id, group_ids):
+    """
+    Whether the user of user_id belongs to one of group_ids, by one EXISTS query.
+    """
+    if not group_ids:
+        return False
+    return User.groups.through.objects.filter(user_id=user_id, group_id__in=group_ids).exists()
@@ -0,0 +1,106 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from ..models import Task, GroupTask, TaskVisibility
+from ..settings import api_settings
+from .snapshots import Membership, get_previous_group_task, get_changed_membership
+
+
+def is_visibility_table_enabled():
+    return api_settings.TASK_VISIBILITY_TABLE
+
+
+def get_visible_task_ids(user, roles):
+    return TaskVisibility.objects.filter(user=user.pk, role__in=roles).values('task')
+
+
+def add_created_task_visibilities(tasks, using=DEFAULT_DB_ALIAS):
+    """
+    Add rows of tasks inserted without post_save, e.g. by bulk_create.
+    """
+    if not is_visibility_table_enabled():
+        return
+    TaskVisibility.objects.using(using).bulk_create([
+        TaskVisibility(user_id=task.created_by_id, task_id=task.pk, role=TaskVisibility.CREATED) for task in tasks
+    ], ignore_conflicts=True)
+
+
+def rebuild_task_visibility(using=DEFAULT_DB_ALIAS):
+    """
+    Recompute the whole table with three INSERT ... SELECT statements.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(TaskVisibility._meta.db_table)
+    sources = [
+        ('SELECT created_by_id, id, %s FROM {task}', TaskVisibility.CREATED),
+        ('SELECT assignee_id, task_id, %s FROM {group_task} WHERE assignee_id IS NOT NULL', TaskVisibility.ASSIGNED),
+        ('SELECT membership.user_id, group_task.task_id, %s FROM {group_task} group_task '
+         'INNER JOIN {membership} membership ON membership.group_id = group_task.group_id',
+         TaskVisibility.GROUP_MEMBER),
+    ]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute('DELETE FROM {table}'.format(table=table))
+        for select, role in sources:
+            cursor.execute('INSERT INTO {table} (user_id, task_id, role) '.format(table=table) + select.format(
+                task=quote(Task._meta.db_table), group_task=quote(GroupTask._meta.db_table),
+                membership=quote(Membership._meta.db_table)), [role])
+
+
+def add_created_task_visibility(sender, instance, created=False, using=None, **kwargs):
+    """
+    Task post_save. created_by is not changed after creation, so only new tasks are recorded.
+    """
+    if created:
+        add_created_task_visibilities([instance], using)
+
+
+def update_group_task_visibility(sender, instance, created=False, using=None, **kwargs):
+    """
+    GroupTask post_save. Rows of the group members and of the assignee are replaced when they changed.
+    """
+    if not is_visibility_table_enabled():
+        return
+    previous_group_id, previous_assignee_id = get_previous_group_task(instance)
+    visibilities = TaskVisibility.objects.using(using)
+    if created or previous_group_id != instance.group_id:
+        visibilities.filter(task=instance.task_id, role=TaskVisibility.GROUP_MEMBER).delete()
+        member_ids = Membership.objects.using(using).filter(group_id=instance.group_id) \
+            .values_list('user_id', flat=True)
+        visibilities.bulk_create([
+            TaskVisibility(user_id=member_id, task_id=instance.task_id, role=TaskVisibility.GROUP_MEMBER)
+            for member_id in member_ids
+        ], ignore_conflicts=True)
+    if created or previous_assignee_id != instance.assignee_id:
+        visibilities.filter(task=instance.task_id, role=TaskVisibility.ASSIGNED).delete()
+        if instance.assignee_id is not None:
+            visibilities.bulk_create([
+                TaskVisibility(user_id=instance.assignee_id, task_id=instance.task_id, role=TaskVisibility.ASSIGNED)
+            ], ignore_conflicts=True)
+
+
+def remove_group_task_visibility(sender, instance, using=None, **kwargs):
+    if not is_visibility_table_enabled():
+        return
+    TaskVisibility.objects.using(using).filter(
+        task=instance.task_id, role__in=[TaskVisibility.ASSIGNED, TaskVisibility.GROUP_MEMBER]).delete()
+
+
+def update_membership_visibility(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+    """
+    m2m_changed of User.groups, from both sides (user.groups / group.user_set).
+    """
+    if not is_visibility_table_enabled() or action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    pk_set = get_changed_membership(instance, action, pk_set)
+    if not pk_set:
+        return
+    user_ids, group_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    task_ids = GroupTask.objects.using(using).filter(group__in=group_ids).values_list('task_id', flat=True)
+    visibilities = TaskVisibility.objects.using(using)
+    if action == 'post_add':
+        visibilities.bulk_create([
+            TaskVisibility(user_id=user_id, task_id=task_id, role=TaskVisibility.GROUP_MEMBER)
+            for user_id in user_ids for task_id in task_ids
+        ], batch_size=1000, ignore_conflicts=True)
+    else:
+        visibilities.filter(user__in=user_ids, task__in=task_ids, role=TaskVisibility.GROUP_MEMBER).delete()
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.signals import setting_changed
 
 APP_SETTING_ROUTE_NAME = 'S_TASKS_API'
 
@@ -26,6 +27,28 @@ DEFAULTS = {
         'rest_framework.permissions.IsAuthenticated',
         's_tasks_api.permissions.task_tags.OnlyAdminCanChange'
     ],
+    'TASK_PAGINATION_CLASS': 's_tasks_api.pagination.TaskCursorPagination',
+    'GROUP_TASK_PAGINATION_CLASS': 's_tasks_api.pagination.GroupTaskCursorPagination',
+    'PAGINATION': {
+        'PAGE_SIZE': None,
+        'MAX_PAGE_SIZE': 1000,
+        'PAGE_SIZE_QUERY_PARAM': 'page_size',
+    },
+    'TASK_SEARCH_BACKEND': 's_tasks_api.search.ContainsSearchBackend',
+    'MAX_BULK_SIZE': 500,
+    'MAX_CHANGES': 1000,
+    'CHANGES_TOKEN_MARGIN': 0,
+    'CHANGES_RETENTION_DAYS': None,
+    'INSTRUMENTATION': False,
+    'TASK_VISIBILITY_TABLE': False,
+    'EXPORT_CHUNK_SIZE': 2000,
+    'LIST_FAST_PATH': False,
+    'LIST_CACHE': None,
+    'LIST_CACHE_TIMEOUT': 300,
+    'STATS_CACHE': None,
+    'STATS_CACHE_TIMEOUT': 300,
+    'ASYNC_READ_THREADS': 8,
+    'REFERENCE_DATA_CACHE': None,
 }
 
 
@@ -45,6 +68,9 @@ class APISettings:
         self._defaults = defaults
         self._user_settings = getattr(settings, self._setting_root_name, {})
 
+    def reload(self):
+        self._user_settings = getattr(settings, self._setting_root_name, {})
+
     def __getattr__(self, item):
         if item not in self._defaults:
             raise AttributeError("Invalid {} setting: {}".format(self._setting_root_name, item))
@@ -56,3 +82,11 @@ class APISettings:
 
 
 api_settings = APISettings(APP_SETTING_ROUTE_NAME, DEFAULTS)
+
+
+def reload_api_settings(*args, **kwargs):
+    if kwargs['setting'] == APP_SETTING_ROUTE_NAME:
+        api_settings.reload()
+
+
+setting_changed.connect(reload_api_settings)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask
+from s_tasks_api.services.allowed_actions import ACTIONS, annotate_allowed_actions, get_action_names, \
+    list_locked_columns
+from s_tasks_api.services.tasks import is_deletable_task, is_completable_task, is_assignable_task, get_task_facts, \
+    list_unchangeable_columns
+from .utils import BaseTaskTestCase, User, LIST_TASK_URL, LIST_GROUP_TASK_URL, BULK_COMPLETE_TASK_URL, \
+    get_detail_group_task_url
+
+
+class AllowedActionsTestCase(BaseTaskTestCase):
+    def _get_python_allowed_actions(self, user, task):
+        names = [name for name, allowed in [
+            ('delete', is_deletable_task(user, task)),
+            ('complete', is_completable_task(user, task)),
+            ('assign', is_assignable_task(user, task)),
+        ] if allowed]
+        return names, list_unchangeable_columns(get_task_facts(task))
+
+    def test_annotate_allowed_actions___same_as_python(self):
+        test_data_list = [
+            {'lock_level': GroupTask.NON_LOCK, 'assign_lock_level': GroupTask.ASSIGN_LOCK_NON},
+            {'lock_level': GroupTask.FULL_LOCK, 'assign_lock_level': GroupTask.ASSIGN_FULL_LOCK},
+            {'lock_level': GroupTask.COMPLETED_LOCK | GroupTask.TITLE_LOCK,
+             'assign_lock_level': GroupTask.ASSIGN_LOCK_MEMBERS},
+            {'lock_level': GroupTask.DELETE_LOCK | GroupTask.TAG_LOCK | GroupTask.DUE_DATE_LOCK,
+             'assign_lock_level': GroupTask.ASSIGN_LOCK_ASSIGNEE | GroupTask.ASSIGN_LOCK_CREATED_USER},
+        ]
+        for test_data in test_data_list:
+            # Arrange
+            GroupTask.objects.update(**test_data)
+            for user in User.objects.all():
+                with self.subTest(user=user.username, **test_data):
+                    # Act
+                    group_tasks = annotate_allowed_actions(GroupTask.objects.select_related('task'), user)
+                    tasks = annotate_allowed_actions(Task.objects.all(), user, 'group_task__', '')
+                    # Assert
+                    for row in list(group_tasks) + list(tasks):
+                        names, locked_columns = self._get_python_allowed_actions(user, row)
+                        self.assertListEqual(names, [name for name in get_action_names(row.allowed_actions)
+                                                     if not name.startswith('change_')])
+                        self.assertListEqual(locked_columns, list_locked_columns(row.allowed_actions))
+
+    def test_list___allowed_actions_requested___field_of_each_row(self):
+        GroupTask.objects.filter(pk=4).update(lock_level=GroupTask.COMPLETED_LOCK | GroupTask.TITLE_LOCK)
+        test_data_list = [
+            {'url': LIST_TASK_URL, 'settings': {}},
+            {'url': LIST_GROUP_TASK_URL, 'settings': {}},
+            {'url': LIST_GROUP_TASK_URL, 'settings': {'LIST_FAST_PATH': True}},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(**test_data), override_settings(S_TASKS_API=test_data['settings']):
+                # Act
+                without = self.client.get(test_data['url'])
+                response = self.client.get(test_data['url'], {'allowed_actions': 'true'})
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertNotIn('allowed_actions', without.data[0])
+                for row, row_without in zip(response.data, without.data):
+                    self.assertDictEqual(row_without, {key: value for key, value in row.items()
+                                                       if key != 'allowed_actions'})
+                    self.assertTrue(set(row['allowed_actions']) <= set(ACTIONS))
+                    self.assertNotIn('allowed_actions', row.get('task', {}))
+                if test_data['url'] == LIST_GROUP_TASK_URL:
+                    locked = next(row for row in response.data if row['pk'] == 4)
+                    self.assertNotIn('complete', locked['allowed_actions'])
+                    self.assertNotIn('change_title', locked['allowed_actions'])
+                    self.assertIn('change_detail', locked['allowed_actions'])
+
+    def test_retrieve___allowed_actions_requested___field(self):
+        # Act
+        response = self.client.get(get_detail_group_task_url(1), {'allowed_actions': 'true'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual(list(ACTIONS), response.data['allowed_actions'])
+
+    def test_bulk_complete___locked_row___denied_by_sql_bits(self):
+        # Arrange
+        Task.objects.filter(pk=4).update(completed=False)
+        GroupTask.objects.filter(task=4).update(lock_level=GroupTask.COMPLETED_LOCK)
+        # Act
+        with mock.patch('s_tasks_api.permissions.context.is_completable') as is_completable:
+            response = self.client.patch(BULK_COMPLETE_TASK_URL, [1, 4], format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_403_FORBIDDEN],
+                             [result['status'] for result in response.data])
+        self.assertFalse(is_completable.called)
+        self.assertFalse(Task.objects.get(pk=4).completed)
@@ -0,0 +1,178 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask, TaskChange
+from s_tasks_api.services.task_status import get_default_task_status
+from s_tasks_api.views import TaskViewSet
+from .utils import BaseTaskTestCase, BULK_CREATE_TASK_URL, BULK_UPDATE_TASK_URL, BULK_COMPLETE_TASK_URL
+
+
+class BulkTaskTestCase(BaseTaskTestCase):
+    def test_bulk_create___valid_and_invalid_items___per_item_results(self):
+        # Arrange
+        items = [
+            {'title': 'bulk1', 'detail': 'detail1', 'due_date': '2099-12-03', 'status': 2, 'tag': 1},
+            {'title': 'bulk2'},
+            {'detail': 'title is required'},
+        ]
+        # Act
+        response = self.client.post(BULK_CREATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertListEqual([status.HTTP_201_CREATED, status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST],
+                             [result['status'] for result in response.data])
+        self.assertIn('title', response.data[2]['errors'])
+        for result in response.data[:2]:
+            task = Task.objects.get(pk=result['data']['pk'])
+            self.assertEqual(self.member_1, task.created_by)
+            self.assertEqual(result['data']['title'], task.title)
+        self.assertEqual(get_default_task_status(), Task.objects.get(title='bulk2').status)
+
+    def test_bulk_create___many_items___one_insert_and_primary_keys_of_rows(self):
+        # Arrange
+        items = [{'title': 'bulk{}'.format(index)} for index in range(5)]
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(BULK_CREATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        inserts = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('INSERT INTO "s_tasks_api_task"')]
+        self.assertEqual(1, len(inserts), inserts)
+        for item, result in zip(items, response.data):
+            self.assertEqual(item['title'], Task.objects.get(pk=result['data']['pk']).title)
+
+    def test_bulk_create___not_list___400(self):
+        # Act
+        response = self.client.post(BULK_CREATE_TASK_URL, {'title': 'not list'}, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_bulk_update___mixed_permissions___per_item_results(self):
+        # Arrange
+        my_group_task = Task.objects.get(pk=7)
+        locked_task = Task.objects.get(pk=4)
+        locked_task.group_task.lock_level = GroupTask.TITLE_LOCK
+        locked_task.group_task.save()
+        other_group_task = Task.objects.get(pk=3)
+        items = [
+            {'pk': my_group_task.pk, 'title': 'bulk_changed', 'due_date': '2100-10-10'},
+            {'pk': locked_task.pk, 'title': 'bulk_changed'},
+            {'pk': other_group_task.pk, 'title': 'bulk_changed'},
+            {'pk': my_group_task.pk, 'status': 999},
+        ]
+        # Act
+        response = self.client.patch(BULK_UPDATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
+                              status.HTTP_400_BAD_REQUEST],
+                             [result['status'] for result in response.data])
+        self.assertEqual('bulk_changed', Task.objects.get(pk=my_group_task.pk).title)
+        self.assertEqual('2100-10-10', str(Task.objects.get(pk=my_group_task.pk).due_date))
+        self.assertEqual(locked_task.title, Task.objects.get(pk=locked_task.pk).title)
+        self.assertEqual(other_group_task.title, Task.objects.get(pk=other_group_task.pk).title)
+
+    def test_bulk_complete___my_tasks___completed(self):
+        # Arrange
+        pks = [1, 7, 8, 3]
+        # Act
+        response = self.client.patch(BULK_COMPLETE_TASK_URL, pks, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_404_NOT_FOUND],
+                             [result['status'] for result in response.data])
+        for task in Task.objects.filter(pk__in=pks[:3]):
+            self.assertTrue(task.completed)
+            self.assertEqual(timezone.now().date(), task.completed_date)
+        self.assertFalse(Task.objects.get(pk=3).completed)
+
+    def test_bulk_complete___more_tasks___same_number_of_queries(self):
+        def count_queries(pks):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(BULK_COMPLETE_TASK_URL, pks, format='json')
+            self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+            return len(context.captured_queries)
+
+        # Arrange
+        Task.objects.update(completed=False)
+        # Act & Assert
+        self.assertEqual(count_queries([1]), count_queries([7, 8, 9]))
+
+    def test_bulk_update___changed_after_read___412_and_not_overwritten(self):
+        # Arrange
+        items = [{'pk': 1, 'title': 'bulk_changed'}, {'pk': 7, 'title': 'bulk_changed'}]
+        get_bulk_tasks = TaskViewSet._get_bulk_tasks
+
+        def get_bulk_tasks_then_changed(view, pks):
+            tasks = get_bulk_tasks(view, pks)
+            Task.objects.filter(pk=7).update(title='concurrent', version=F('version') + 1)
+            return tasks
+
+        # Act
+        with mock.patch.object(TaskViewSet, '_get_bulk_tasks', get_bulk_tasks_then_changed):
+            response = self.client.patch(BULK_UPDATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_412_PRECONDITION_FAILED],
+                             [result['status'] for result in response.data])
+        self.assertEqual('bulk_changed', Task.objects.get(pk=1).title)
+        self.assertEqual('concurrent', Task.objects.get(pk=7).title)
+        self.assertEqual(Task.objects.get(pk=1).version, response.data[0]['data']['version'])
+
+    def test_bulk_update___items_with_other_fields___each_row_written_with_its_fields(self):
+        # Arrange
+        items = [{'pk': 1, 'title': 'bulk_changed'}, {'pk': 7, 'detail': 'bulk_changed'}]
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(BULK_UPDATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_200_OK], [result['status'] for result in response.data])
+        updates = [query['sql'].split(' WHERE ')[0] for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE "s_tasks_api_task"')]
+        self.assertEqual(2, len(updates), updates)
+        self.assertListEqual([('"title"' in update, '"detail"' in update) for update in updates],
+                             [(True, False), (False, True)])
+
+    def test_bulk_update___items_with_same_fields___one_update(self):
+        # Arrange
+        items = [{'pk': 1, 'title': 'bulk_changed1'}, {'pk': 7, 'title': 'bulk_changed7'}]
+        versions = dict(Task.objects.filter(pk__in=[1, 7]).values_list('pk', 'version'))
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(BULK_UPDATE_TASK_URL, items, format='json')
+        # Assert
+        self.assertListEqual([status.HTTP_200_OK, status.HTTP_200_OK], [result['status'] for result in response.data])
+        updates = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE "s_tasks_api_task"')]
+        self.assertEqual(1, len(updates), updates)
+        for item in items:
+            task = Task.objects.get(pk=item['pk'])
+            self.assertEqual((item['title'], versions[task.pk] + 1), (task.title, task.version))
+
+    def test_bulk_complete___duplicated_or_completed_meanwhile___versions_of_rows(self):
+        # Arrange
+        Task.objects.filter(pk__in=[1, 7]).update(completed=False, completed_date=None)
+        get_bulk_tasks = TaskViewSet._get_bulk_tasks
+
+        def get_bulk_tasks_then_completed(view, pks):
+            tasks = get_bulk_tasks(view, pks)
+            Task.objects.filter(pk=7).update(completed=True, version=F('version') + 1)
+            return tasks
+
+        changes_count = TaskChange.objects.count()
+        # Act
+        with mock.patch.object(TaskViewSet, '_get_bulk_tasks', get_bulk_tasks_then_completed):
+            response = self.client.patch(BULK_COMPLETE_TASK_URL, [1, 1, 7], format='json')
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        for result in response.data:
+            task = Task.objects.get(pk=result['data']['pk'])
+            self.assertTrue(task.completed)
+            self.assertEqual(task.version, result['data']['version'])
+        self.assertEqual(changes_count + 1, TaskChange.objects.count())
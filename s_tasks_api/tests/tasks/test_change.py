@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.utils import timezone
 from rest_framework import status
 
@@ -5,6 +7,7 @@ from s_tasks_api.models import Task, GroupTask, TaskStatus, TaskTag
 from s_tasks_api.services.tasks import get_tasks, complete_task, un_complete_task
 from s_tasks_api.settings import api_settings
 from s_tasks_api.tests.utils import validation_error_status
+from s_tasks_api.views import TaskViewSet
 from .utils import BaseTaskTestCase, get_detail_task_url, get_complete_task_url, get_un_complete_task_url, \
     get_detail_group_task_url, get_complete_group_task_url, get_un_complete_group_task_url
 
@@ -180,6 +183,22 @@ class ChangeTaskTestCase(BaseTaskTestCase):
         # Assert
         self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
 
+    def test_complete_task___deleted_after_read___404(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1, completed=False).first()
+        get_object = TaskViewSet.get_object
+
+        def get_object_then_deleted(view):
+            instance = get_object(view)
+            Task.objects.filter(pk=instance.pk).delete()
+            return instance
+
+        # Act
+        with mock.patch.object(TaskViewSet, 'get_object', get_object_then_deleted):
+            response = self.client.patch(get_complete_task_url(task.pk))
+        # Assert
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
     def test_change_task___not_my_task___404(self):
         # Arrange
         not_my_task = get_tasks(self.member_2)[0]
@@ -0,0 +1,245 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask, TaskChange
+from .utils import BaseTaskTestCase, CHANGES_TASK_URL, BULK_COMPLETE_TASK_URL, get_detail_group_task_url, \
+    get_remove_to_my_task_url
+
+
+class TaskChangesTestCase(BaseTaskTestCase):
+    def _get_token(self):
+        return self.client.get(CHANGES_TASK_URL).data['token']
+
+    def test_changes___no_change_since_token___empty(self):
+        # Arrange
+        token = self._get_token()
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(token, response.data['token'])
+        self.assertFalse(response.data['has_more'])
+        for key in ['tasks', 'deleted_tasks', 'group_tasks', 'deleted_group_tasks']:
+            self.assertListEqual([], response.data[key])
+
+    def test_changes___task_changed___task_and_group_task_returned(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK).first()
+        token = self._get_token()
+        self.client.patch(get_detail_group_task_url(group_task.pk), {'title': 'synced'})
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([group_task.task.pk], [task['pk'] for task in response.data['tasks']])
+        self.assertEqual('synced', response.data['tasks'][0]['title'])
+        self.assertListEqual([group_task.pk], [g_t['pk'] for g_t in response.data['group_tasks']])
+        self.assertNotEqual(token, response.data['token'])
+
+    def test_changes___other_group_member___only_group_task_returned(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK) \
+            .exclude(assignee=self.member_2).first()
+        self.client.force_login(self.member_2)
+        token = self._get_token()
+        self.client.force_login(self.member_1)
+        self.client.patch(get_detail_group_task_url(group_task.pk), {'title': 'synced'})
+        test_data_list = [
+            {'user': self.member_2, 'expect_group_tasks': [group_task.pk]},
+            {'user': self.group_2_member, 'expect_group_tasks': []},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(user=test_data['user'].username):
+                self.client.force_login(test_data['user'])
+                # Act
+                response = self.client.get(CHANGES_TASK_URL, {'since': token})
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertListEqual([], response.data['tasks'])
+                self.assertListEqual(test_data['expect_group_tasks'],
+                                     [g_t['pk'] for g_t in response.data['group_tasks']])
+
+    def test_changes___task_deleted___tombstones_returned(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1).first()
+        task_pk = group_task.task.pk
+        token = self._get_token()
+        group_task.task.delete()
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([task_pk], response.data['deleted_tasks'])
+        self.assertListEqual([group_task.pk], response.data['deleted_group_tasks'])
+
+    def test_changes___removed_to_my_task___group_task_tombstone_for_members(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1).first()
+        token = self._get_token()
+        self.client.delete(get_remove_to_my_task_url(group_task.pk))
+        test_data_list = [
+            {'user': self.member_1, 'expect_tasks': [group_task.task.pk]},
+            {'user': self.member_2, 'expect_tasks': []},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(user=test_data['user'].username):
+                self.client.force_login(test_data['user'])
+                # Act
+                response = self.client.get(CHANGES_TASK_URL, {'since': token})
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertListEqual(test_data['expect_tasks'], [task['pk'] for task in response.data['tasks']])
+                self.assertListEqual([group_task.pk], response.data['deleted_group_tasks'])
+
+    def test_changes___assignee_changed___tombstone_for_previous_assignee(self):
+        # Arrange
+        group_task = GroupTask.objects.get(task__pk=4)
+        self.assertEqual(self.member_1, group_task.assignee)
+        token = self._get_token()
+        group_task.assignee = self.member_2
+        group_task.save()
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([4], response.data['deleted_tasks'])
+        self.assertListEqual([group_task.pk], [g_t['pk'] for g_t in response.data['group_tasks']])
+
+    def test_changes___bulk_complete___changes_recorded(self):
+        # Arrange
+        pks = list(Task.objects.filter(created_by=self.member_1, completed=False, group_task__isnull=False)
+                   .values_list('pk', flat=True))
+        token = self._get_token()
+        self.client.patch(BULK_COMPLETE_TASK_URL, pks, format='json')
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual(pks, [task['pk'] for task in response.data['tasks']])
+
+    @override_settings(S_TASKS_API={'MAX_CHANGES': 1})
+    def test_changes___more_than_max_changes___paged_by_token(self):
+        # Arrange
+        group_tasks = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK)[:2]
+        token = TaskChange.objects.latest('pk').pk
+        for group_task in group_tasks:
+            group_task.task.save()
+        # Act
+        first = self.client.get(CHANGES_TASK_URL, {'since': token})
+        second = self.client.get(CHANGES_TASK_URL, {'since': first.data['token']})
+        # Assert
+        self.assertTrue(first.data['has_more'])
+        self.assertFalse(second.data['has_more'])
+        self.assertListEqual([group_tasks[0].task.pk], [task['pk'] for task in first.data['tasks']])
+        self.assertListEqual([group_tasks[1].task.pk], [task['pk'] for task in second.data['tasks']])
+
+    def test_changes___user_joined_group___existing_group_tasks_returned(self):
+        # Arrange
+        group_task_pks = list(GroupTask.objects.filter(group=self.group_1).values_list('pk', flat=True))
+        test_data_list = [
+            {'user': self.group_2_member, 'expect_group_tasks': group_task_pks},
+            {'user': self.member_2, 'expect_group_tasks': []},
+        ]
+        tokens = {}
+        for test_data in test_data_list:
+            self.client.force_login(test_data['user'])
+            tokens[test_data['user'].pk] = self._get_token()
+        self.group_1.user_set.add(self.group_2_member)
+        for test_data in test_data_list:
+            with self.subTest(user=test_data['user'].username):
+                self.client.force_login(test_data['user'])
+                # Act
+                response = self.client.get(CHANGES_TASK_URL, {'since': tokens[test_data['user'].pk]})
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertListEqual(sorted(test_data['expect_group_tasks']),
+                                     sorted(g_t['pk'] for g_t in response.data['group_tasks']))
+                self.assertListEqual([], response.data['deleted_group_tasks'])
+
+    def test_changes___user_left_group___group_task_tombstones_returned(self):
+        # Arrange
+        group_task_pks = sorted(GroupTask.objects.filter(group=self.group_1).values_list('pk', flat=True))
+        test_data_list = [
+            {'action': 'remove', 'leave': lambda: self.member_2.groups.remove(self.group_1)},
+            {'action': 'clear', 'leave': lambda: self.group_1.user_set.clear()},
+        ]
+        self.client.force_login(self.member_2)
+        for test_data in test_data_list:
+            with self.subTest(action=test_data['action']):
+                self.group_1.user_set.add(self.member_2)
+                token = self._get_token()
+                test_data['leave']()
+                # Act
+                response = self.client.get(CHANGES_TASK_URL, {'since': token})
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertListEqual([], response.data['group_tasks'])
+                self.assertListEqual(group_task_pks, response.data['deleted_group_tasks'])
+
+    def test_changes___user_left_group_after_deletion___deleted_group_task_tombstone_returned(self):
+        # Arrange
+        self.client.force_login(self.member_2)
+        group_task_pks = sorted(GroupTask.objects.filter(group=self.group_1).values_list('pk', flat=True))
+        token = self._get_token()
+        GroupTask.objects.get(pk=group_task_pks[0]).task.delete()
+        self.member_2.groups.remove(self.group_1)
+        # Act
+        response = self.client.get(CHANGES_TASK_URL, {'since': token})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual(group_task_pks, response.data['deleted_group_tasks'])
+
+    @override_settings(S_TASKS_API={'CHANGES_TOKEN_MARGIN': 60})
+    def test_changes___entries_younger_than_margin___token_held_back(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK).first()
+        TaskChange.objects.update(changed_at=timezone.now() - timedelta(minutes=2))
+        token = self._get_token()
+        self.client.patch(get_detail_group_task_url(group_task.pk), {'title': 'synced'})
+        # Act
+        held_back = self.client.get(CHANGES_TASK_URL, {'since': token})
+        TaskChange.objects.update(changed_at=timezone.now() - timedelta(minutes=2))
+        settled = self.client.get(CHANGES_TASK_URL, {'since': held_back.data['token']})
+        # Assert
+        self.assertEqual(token, held_back.data['token'])
+        self.assertFalse(held_back.data['has_more'])
+        self.assertListEqual([group_task.task.pk], [task['pk'] for task in held_back.data['tasks']])
+        self.assertListEqual([group_task.task.pk], [task['pk'] for task in settled.data['tasks']])
+        self.assertEqual(str(TaskChange.objects.latest('pk').pk), settled.data['token'])
+
+    def test_prune_changes___old_entries___deleted_and_older_tokens_reset(self):
+        # Arrange
+        group_tasks = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK)[:2]
+        token = self._get_token()
+        for group_task in group_tasks:
+            group_task.task.save()
+        TaskChange.objects.update(changed_at=timezone.now() - timedelta(days=31))
+        latest = TaskChange.objects.latest('pk')
+        # Act
+        call_command('s_tasks_prune_changes', days=30, stdout=io.StringIO())
+        stale = self.client.get(CHANGES_TASK_URL, {'since': token})
+        current = self.client.get(CHANGES_TASK_URL, {'since': latest.pk})
+        # Assert
+        self.assertListEqual([latest.pk], list(TaskChange.objects.values_list('pk', flat=True)))
+        self.assertTrue(stale.data['reset'])
+        self.assertEqual(str(latest.pk), stale.data['token'])
+        self.assertListEqual([], stale.data['tasks'])
+        self.assertFalse(current.data['reset'])
+
+    def test_prune_changes___no_retention___error(self):
+        # Act & Assert
+        with self.assertRaises(CommandError):
+            call_command('s_tasks_prune_changes', stdout=io.StringIO())
+
+    def test_changes___invalid_token___400(self):
+        for since in ['abc', '-1']:
+            with self.subTest(since=since):
+                # Act
+                response = self.client.get(CHANGES_TASK_URL, {'since': since})
+                # Assert
+                self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
@@ -0,0 +1,207 @@
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask, VersionConflict
+from s_tasks_api.serializers import TaskSerializer
+from s_tasks_api.views import GroupTaskViewSet
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, get_detail_task_url, \
+    get_detail_group_task_url, get_complete_task_url, run_on_commit_callbacks
+
+
+class ConditionalGetTestCase(BaseTaskTestCase):
+    def _assert_not_modified(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        with mock.patch.object(TaskSerializer, 'to_representation') as to_representation:
+            not_modified = self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertFalse(to_representation.called)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, not_modified.status_code)
+        self.assertEqual(response['ETag'], not_modified['ETag'])
+        return response['ETag']
+
+    def test_get___unchanged___304(self):
+        group_task = GroupTask.objects.filter(group=self.group_1).first()
+        for url in [LIST_TASK_URL, LIST_GROUP_TASK_URL,
+                    get_detail_task_url(group_task.task.pk), get_detail_group_task_url(group_task.pk)]:
+            with self.subTest(url=url):
+                self._assert_not_modified(url)
+
+    def test_list_tasks___task_changed_or_deleted___200(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1).first()
+        test_data_list = [
+            lambda: task.save(),
+            lambda: Task.objects.filter(created_by=self.member_1).last().delete(),
+        ]
+        for change in test_data_list:
+            etag = self._assert_not_modified(LIST_TASK_URL)
+            # Act
+            change()
+            response = self.client.get(LIST_TASK_URL, HTTP_IF_NONE_MATCH=etag)
+            # Assert
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            self.assertNotEqual(etag, response['ETag'])
+
+    def test_list_group_tasks___nested_task_changed___200(self):
+        # Arrange
+        etag = self._assert_not_modified(LIST_GROUP_TASK_URL)
+        # Act
+        GroupTask.objects.filter(group=self.group_1).first().task.save()
+        response = self.client.get(LIST_GROUP_TASK_URL, HTTP_IF_NONE_MATCH=etag)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    def test_list_tasks___older_task_deleted___if_modified_since_200(self):
+        # Arrange
+        response = self.client.get(LIST_TASK_URL)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        Task.objects.filter(created_by=self.member_1).order_by('updated_at').first().delete()
+        # Act
+        response = self.client.get(LIST_TASK_URL, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_list_tasks___assigned_task_swapped___200(self):
+        # Arrange
+        removed = GroupTask.objects.filter(assignee=self.member_1).exclude(task__created_by=self.member_1).first()
+        added = GroupTask.objects.filter(group=self.group_1).exclude(assignee=self.member_1) \
+            .exclude(task__created_by=self.member_1).first()
+        etag = self._assert_not_modified(LIST_TASK_URL)
+        # Act
+        removed.assignee = self.member_2
+        removed.save()
+        added.assignee = self.member_1
+        added.save()
+        response = self.client.get(LIST_TASK_URL, HTTP_IF_NONE_MATCH=etag)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_list___list_cache___etag_from_generation(self):
+        with override_settings(S_TASKS_API={'LIST_CACHE': 'default'}):
+            caches['default'].clear()
+            for url in [LIST_TASK_URL, LIST_GROUP_TASK_URL]:
+                with self.subTest(url=url):
+                    # Arrange
+                    etag = self._assert_not_modified(url)
+                    # Act
+                    with run_on_commit_callbacks():
+                        GroupTask.objects.filter(group=self.group_1).first().task.delete()
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    # Assert
+                    self.assertEqual(status.HTTP_200_OK, response.status_code)
+                    self.assertNotEqual(etag, response['ETag'])
+
+    def test_list_tasks___other_filter___other_etag(self):
+        # Arrange
+        etag = self._assert_not_modified(LIST_TASK_URL)
+        # Act
+        response = self.client.get(LIST_TASK_URL, {'completed': True}, HTTP_IF_NONE_MATCH=etag)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+
+class ConditionalUpdateTestCase(BaseTaskTestCase):
+    def test_save_if_unchanged___stale_instance___version_conflict_and_not_overwritten(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1).first()
+        stale_task = Task.objects.get(pk=task.pk)
+        task.title = 'first'
+        task.save_if_unchanged(update_fields=['title'])
+        stale_task.title = 'second'
+        # Act & Assert
+        with self.assertRaises(VersionConflict):
+            stale_task.save_if_unchanged(update_fields=['title'])
+        self.assertEqual('first', Task.objects.get(pk=task.pk).title)
+        self.assertEqual(task.version, Task.objects.get(pk=task.pk).version)
+
+    def test_save___stale_instance___saved_and_version_incremented(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1).first()
+        stale_task = Task.objects.get(pk=task.pk)
+        task.save()
+        stale_task.title = 'second'
+        # Act
+        stale_task.save()
+        # Assert
+        self.assertEqual('second', Task.objects.get(pk=task.pk).title)
+        self.assertEqual(stale_task.version, Task.objects.get(pk=task.pk).version)
+
+    def test_patch___if_match___200_or_412(self):
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1).first()
+        test_data_list = [
+            {'url': get_detail_task_url(group_task.task.pk), 'change': lambda: group_task.task.save()},
+            {'url': get_detail_group_task_url(group_task.pk), 'change': lambda: group_task.task.save()},
+            {'url': get_detail_group_task_url(group_task.pk), 'change': lambda: group_task.save()},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(url=test_data['url']):
+                # Arrange
+                group_task.refresh_from_db()
+                group_task.task.refresh_from_db()
+                etag = self.client.get(test_data['url'])['ETag']
+                # Act
+                response = self.client.patch(test_data['url'], {'title': 'matched'}, HTTP_IF_MATCH=etag)
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+                etag = self.client.get(test_data['url'])['ETag']
+                group_task.refresh_from_db()
+                group_task.task.refresh_from_db()
+                test_data['change']()
+                response = self.client.patch(test_data['url'], {'title': 'stale'}, HTTP_IF_MATCH=etag)
+                self.assertEqual(status.HTTP_412_PRECONDITION_FAILED, response.status_code, response.data)
+                self.assertEqual('matched', Task.objects.get(pk=group_task.task.pk).title)
+
+    def test_complete___stale_if_match___412(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1, completed=False).first()
+        etag = self.client.get(get_detail_task_url(task.pk))['ETag']
+        task.save()
+        # Act
+        response = self.client.patch(get_complete_task_url(task.pk), HTTP_IF_MATCH=etag)
+        # Assert
+        self.assertEqual(status.HTTP_412_PRECONDITION_FAILED, response.status_code, response.data)
+        self.assertFalse(Task.objects.get(pk=task.pk).completed)
+
+    def test_patch_group_task___changed_after_read___412(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1).first()
+        get_object = GroupTaskViewSet.get_object
+
+        def get_object_then_changed(view):
+            instance = get_object(view)
+            Task.objects.filter(pk=instance.task_id).update(title='concurrent', version=F('version') + 1)
+            return instance
+
+        # Act
+        with mock.patch.object(GroupTaskViewSet, 'get_object', get_object_then_changed):
+            response = self.client.patch(get_detail_group_task_url(group_task.pk), {'detail': 'lost'})
+        # Assert
+        self.assertEqual(status.HTTP_412_PRECONDITION_FAILED, response.status_code, response.data)
+        task = Task.objects.get(pk=group_task.task.pk)
+        self.assertEqual(('concurrent', group_task.task.detail), (task.title, task.detail))
+
+    def test_patch___only_changed_columns_written_and_version_incremented(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1).first()
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(get_detail_task_url(task.pk), {'title': 'changed'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertEqual(task.version + 1, response.data['version'])
+        updates = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE "s_tasks_api_task"')]
+        self.assertEqual(2, len(updates), updates)
+        self.assertIn('"version" = 1', updates[0].split(' WHERE ')[1])
+        self.assertNotIn('"detail"', updates[1])
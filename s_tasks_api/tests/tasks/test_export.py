@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+from rest_framework import status
+
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, EXPORT_TASK_URL, EXPORT_GROUP_TASK_URL
+
+
+def _read_streaming(response):
+    return b''.join(response.streaming_content).decode()
+
+
+class ExportTestCase(BaseTaskTestCase):
+    def test_export___ndjson___same_as_list(self):
+        test_data_list = [
+            {'export_url': EXPORT_TASK_URL, 'list_url': LIST_TASK_URL, 'conditions': {}},
+            {'export_url': EXPORT_TASK_URL, 'list_url': LIST_TASK_URL, 'conditions': {'completed': True}},
+            {'export_url': EXPORT_GROUP_TASK_URL, 'list_url': LIST_GROUP_TASK_URL, 'conditions': {}},
+            {'export_url': EXPORT_GROUP_TASK_URL, 'list_url': LIST_GROUP_TASK_URL,
+             'conditions': {'assignee': self.member_1.pk}},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(url=test_data['export_url'], conditions=test_data['conditions']):
+                # Arrange
+                expected = json.loads(json.dumps(self.client.get(test_data['list_url'], test_data['conditions']).data))
+                # Act
+                response = self.client.get(test_data['export_url'], test_data['conditions'])
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertTrue(response.streaming)
+                self.assertEqual('application/x-ndjson', response['Content-Type'])
+                lines = _read_streaming(response).splitlines()
+                self.assertListEqual(expected, [json.loads(line) for line in lines])
+
+    def test_export___csv___header_and_rows(self):
+        # Arrange
+        expected = self.client.get(LIST_GROUP_TASK_URL).data
+        # Act
+        response = self.client.get(EXPORT_GROUP_TASK_URL, {'export_format': 'csv'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual('text/csv', response['Content-Type'])
+        self.assertIn('group_tasks.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(_read_streaming(response))))
+        self.assertListEqual([str(group_task['pk']) for group_task in expected], [row['pk'] for row in rows])
+        self.assertListEqual([group_task['task']['title'] for group_task in expected],
+                             [row['task.title'] for row in rows])
+        self.assertListEqual([group_task['task']['due_date'] or '' for group_task in expected],
+                             [row['task.due_date'] for row in rows])
+
+    def test_export___invalid_format___400(self):
+        # Act
+        response = self.client.get(EXPORT_TASK_URL, {'export_format': 'xml'})
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
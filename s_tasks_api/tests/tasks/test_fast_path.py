@@ -0,0 +1,64 @@
+import datetime
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from s_tasks_api.models import Task
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL
+
+FAST_PATH_SETTINGS = {'LIST_FAST_PATH': True}
+
+
+class ListFastPathTestCase(BaseTaskTestCase):
+    def setUp(self):
+        super().setUp()
+        Task.objects.filter(pk=1).update(due_date=datetime.date(2020, 1, 31))
+        Task.objects.filter(pk=2).update(created_date=timezone.now().replace(microsecond=0))
+
+    def _get_contents(self, url, params, settings):
+        contents = []
+        with override_settings(S_TASKS_API=settings):
+            response = self.client.get(url, params)
+            while True:
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                contents.append(response.content)
+                if not isinstance(response.data, dict) or response.data['next'] is None:
+                    return contents
+                response = self.client.get(response.data['next'])
+
+    def test_list___fast_path___same_bytes_as_serializer(self):
+        paginated = {'PAGINATION': {'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3, 'PAGE_SIZE_QUERY_PARAM': 'page_size'}}
+        test_data_list = [
+            {'url': LIST_TASK_URL, 'params': {}, 'settings': {}},
+            {'url': LIST_TASK_URL, 'params': {'completed': True}, 'settings': {}},
+            {'url': LIST_TASK_URL, 'params': {}, 'settings': paginated},
+            {'url': LIST_GROUP_TASK_URL, 'params': {}, 'settings': {}},
+            {'url': LIST_GROUP_TASK_URL, 'params': {'assignee': self.member_1.pk}, 'settings': {}},
+            {'url': LIST_GROUP_TASK_URL, 'params': {}, 'settings': paginated},
+            {'url': LIST_TASK_URL, 'params': {'omit': 'detail'}, 'settings': {}},
+            {'url': LIST_GROUP_TASK_URL, 'params': {'fields': 'pk,task.title,assignee'}, 'settings': paginated},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(url=test_data['url'], params=test_data['params'], settings=test_data['settings']):
+                # Arrange
+                expected = self._get_contents(test_data['url'], test_data['params'], test_data['settings'])
+                # Act
+                actual = self._get_contents(test_data['url'], test_data['params'],
+                                            dict(test_data['settings'], **FAST_PATH_SETTINGS))
+                # Assert
+                self.assertGreater(len(expected[0]), 2)
+                self.assertListEqual(expected, actual)
+
+    @override_settings(S_TASKS_API=FAST_PATH_SETTINGS)
+    def test_list___fast_path___one_query_for_rows(self):
+        test_data_list = [LIST_TASK_URL, LIST_GROUP_TASK_URL]
+        for url in test_data_list:
+            with self.subTest(url=url):
+                # Arrange
+                self.client.get(url)
+                # Act / Assert
+                # session, user, validators of the conditional GET and the rows.
+                with self.assertNumQueries(4):
+                    response = self.client.get(url)
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
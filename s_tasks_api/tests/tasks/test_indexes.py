@@ -0,0 +1,32 @@
+from unittest import skipUnless
+
+from django.db import connection
+
+from s_tasks_api.filters import TaskFilterSet, GroupTaskFilterSet
+from s_tasks_api.services.tasks import get_tasks, get_group_tasks
+from .utils import BaseTaskTestCase
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite only.')
+class QueryPlanTestCase(BaseTaskTestCase):
+    def _assert_uses_indexes(self, queryset, index_names):
+        plan = queryset.explain()
+        for index_name in index_names:
+            self.assertIn(index_name, plan, plan)
+        self.assertNotIn('SCAN s_tasks_api_task\n', plan + '\n', plan)
+
+    def test_list_tasks___filtered___uses_owner_and_assignee_indexes(self):
+        test_data_list = [
+            {},
+            {'completed': False},
+            {'completed': True, 'due_date': '2020-01-01'},
+        ]
+        for conditions in test_data_list:
+            with self.subTest(conditions=conditions):
+                queryset = TaskFilterSet(conditions, get_tasks(self.member_1)).qs
+                self._assert_uses_indexes(queryset, ['s_tasks_task_owner_idx', 's_tasks_assignee_task_idx'])
+
+    def test_list_group_tasks___filtered_by_group_and_assignee___uses_group_assignee_index(self):
+        conditions = {'group': self.group_1.pk, 'assignee': self.member_1.pk}
+        queryset = GroupTaskFilterSet(conditions, get_group_tasks(self.member_1)).qs
+        self._assert_uses_indexes(queryset, ['s_tasks_group_assignee_idx'])
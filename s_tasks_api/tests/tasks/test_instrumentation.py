@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from s_tasks_api.instrumentation import request_measured
+from s_tasks_api.models import GroupTask
+from .utils import BaseTaskTestCase, LIST_TASK_URL, get_detail_group_task_url
+
+
+@override_settings(S_TASKS_API={'INSTRUMENTATION': True})
+class InstrumentationTestCase(BaseTaskTestCase):
+    def test_list_tasks___enabled___server_timing_header(self):
+        # Act
+        response = self.client.get(LIST_TASK_URL)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        server_timing = response['Server-Timing']
+        for name in ['db;desc=', 'total;dur=', 'permissions;dur=', 'perm-IsAuthenticated;dur=', 'serializer;dur=']:
+            self.assertIn(name, server_timing)
+        # has_permission of IsMyTask is not relevant to GET.
+        self.assertNotIn('perm-IsMyTask', server_timing)
+
+    def test_change_group_task___enabled___object_permissions_and_query_count_reported(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1, lock_level=GroupTask.NON_LOCK).first()
+        received = []
+
+        def receiver(sender, metrics, **kwargs):
+            received.append(metrics)
+
+        request_measured.connect(receiver)
+        self.addCleanup(request_measured.disconnect, receiver)
+        # Act
+        with CaptureQueriesContext(connection) as queries, self.assertLogs('s_tasks_api.instrumentation') as logs:
+            response = self.client.patch(get_detail_group_task_url(group_task.pk), {'title': 'measured'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(1, len(received))
+        # Session and user are loaded lazily inside the view, so every query of the request is counted.
+        self.assertEqual(len(queries), received[0].query_count)
+        self.assertIn('perm-AreParametersChangeableGroupTask', received[0].timings)
+        self.assertIn('perm-IsChangeableTaskAssignee', received[0].timings)
+        self.assertEqual(received[0].query_count, logs.records[0].s_tasks_metrics['query_count'])
+
+    @override_settings(S_TASKS_API={'INSTRUMENTATION': False})
+    def test_list_tasks___disabled___no_header(self):
+        # Act
+        response = self.client.get(LIST_TASK_URL)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertFalse(response.has_header('Server-Timing'))
@@ -0,0 +1,96 @@
+import datetime
+
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task
+from s_tasks_api.services.tasks import get_tasks, get_group_tasks
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL
+
+PAGINATION_SETTINGS = {
+    'PAGINATION': {
+        'PAGE_SIZE': 2,
+        'MAX_PAGE_SIZE': 3,
+        'PAGE_SIZE_QUERY_PARAM': 'page_size',
+    }
+}
+
+
+@override_settings(S_TASKS_API=PAGINATION_SETTINGS)
+class PaginateTaskTestCase(BaseTaskTestCase):
+    def setUp(self):
+        super().setUp()
+        # Spread created_date so that ordering depends on both keys of the keyset.
+        for index, task in enumerate(Task.objects.order_by('-pk')):
+            Task.objects.filter(pk=task.pk).update(created_date=datetime.date(2019, 12, 1 + index // 2))
+
+    def _walk_pages(self, url, params=None):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+            pages.append(response.data)
+            if response.data['next'] is None:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_list_tasks___paginated___all_pages_ordered_by_created_date_and_pk(self):
+        # Arrange
+        expected_tasks_pk = [task.pk for task in get_tasks(self.member_1).order_by('created_date', 'pk')]
+        # Act
+        pages = self._walk_pages(LIST_TASK_URL)
+        # Assert
+        self.assertListEqual(expected_tasks_pk, [task['pk'] for page in pages for task in page['results']])
+        self.assertTrue(all(len(page['results']) <= 2 for page in pages))
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_list_tasks___previous_link___returns_previous_page(self):
+        # Arrange
+        first_page = self.client.get(LIST_TASK_URL).data
+        second_page = self.client.get(first_page['next']).data
+        # Act
+        response = self.client.get(second_page['previous'])
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([task['pk'] for task in first_page['results']],
+                             [task['pk'] for task in response.data['results']])
+
+    def test_list_tasks___page_size_parameter___capped_by_max_page_size(self):
+        # Act
+        response = self.client.get(LIST_TASK_URL, {'page_size': 100})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(3, len(response.data['results']))
+
+    def test_list_tasks___with_filter___filtered_pages(self):
+        # Arrange
+        expected_tasks_pk = [task.pk for task in
+                             get_tasks(self.member_1).filter(completed=False).order_by('created_date', 'pk')]
+        # Act
+        pages = self._walk_pages(LIST_TASK_URL, {'completed': False})
+        # Assert
+        self.assertListEqual(expected_tasks_pk, [task['pk'] for page in pages for task in page['results']])
+
+    def test_list_tasks___invalid_cursor___404(self):
+        # Act
+        response = self.client.get(LIST_TASK_URL, {'cursor': 'invalid'})
+        # Assert
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_list_group_tasks___paginated___all_pages_ordered_by_created_date_and_pk(self):
+        # Arrange
+        expected_group_tasks_pk = [group_task.pk for group_task in
+                                   get_group_tasks(self.member_1).order_by('task__created_date', 'pk')]
+        # Act
+        pages = self._walk_pages(LIST_GROUP_TASK_URL)
+        # Assert
+        self.assertListEqual(expected_group_tasks_pk,
+                             [group_task['pk'] for page in pages for group_task in page['results']])
+
+    @override_settings(S_TASKS_API={})
+    def test_list_tasks___without_page_size___not_paginated(self):
+        # Act
+        response = self.client.get(LIST_TASK_URL)
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(get_tasks(self.member_1).count(), len(response.data))
@@ -0,0 +1,192 @@
+from types import SimpleNamespace
+
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask, TaskStatus, TaskChange
+from s_tasks_api.permissions.context import get_permission_context
+from s_tasks_api.permissions.tasks import IsMyTask
+from s_tasks_api.services.tasks import am_i_assignee, complete_task, set_task_completed
+from s_tasks_api.services.utils import is_in_same_group
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, get_detail_task_url, \
+    get_detail_group_task_url, get_complete_task_url, get_complete_group_task_url
+
+
+class QueryCountTestCase(BaseTaskTestCase):
+    def _add_tasks(self, count):
+        for index in range(count):
+            task = Task.objects.create(title='query_count{}'.format(index), created_by=self.member_1,
+                                       status=TaskStatus.objects.first())
+            GroupTask.objects.create(task=task, group=self.group_1, assignee=self.member_2)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        return len(context.captured_queries)
+
+    def test_list___more_tasks___same_number_of_queries(self):
+        for url in [LIST_TASK_URL, LIST_GROUP_TASK_URL]:
+            with self.subTest(url=url):
+                # Arrange
+                self._add_tasks(1)
+                expected_count = self._count_queries(url)
+                self._add_tasks(20)
+                # Act
+                actual_count = self._count_queries(url)
+                # Assert
+                self.assertEqual(expected_count, actual_count)
+
+    def test_detail___task_and_group_task___bounded_number_of_queries(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1).first()
+        test_data_list = [
+            get_detail_task_url(group_task.task.pk),
+            get_detail_group_task_url(group_task.pk),
+        ]
+        for url in test_data_list:
+            with self.subTest(url=url):
+                expected_count = self._count_queries(url)
+                self._add_tasks(20)
+                # Act
+                actual_count = self._count_queries(url)
+                # Assert
+                self.assertEqual(expected_count, actual_count)
+
+    def test_change_group_task___chained_permissions___read_user_groups_once(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1).first()
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(get_detail_group_task_url(group_task.pk), {'title': 'changed'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        group_queries = [query['sql'] for query in context.captured_queries
+                         if 'auth_user_groups' in query['sql'] and 's_tasks_api' not in query['sql']]
+        self.assertEqual(1, len(group_queries), group_queries)
+
+    def test_am_i_assignee___more_assignments___one_query(self):
+        # Arrange
+        task = Task.objects.filter(group_task__assignee=self.member_2).first()
+        for count in [1, 50]:
+            with self.subTest(count=count):
+                self._add_tasks(count)
+                # Act & Assert
+                with self.assertNumQueries(1):
+                    self.assertTrue(am_i_assignee(self.member_2, task))
+                with self.assertNumQueries(1):
+                    self.assertFalse(am_i_assignee(self.member_3, task))
+
+    def test_am_i_assignee___group_task_of_assignee___false(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(assignee=self.member_2).exclude(task__created_by=self.member_2).first()
+        request = SimpleNamespace(user=self.member_2)
+        # Act & Assert
+        with self.assertNumQueries(0):
+            self.assertFalse(am_i_assignee(self.member_2, group_task))
+        self.assertTrue(am_i_assignee(self.member_2, group_task.task))
+        self.assertFalse(get_permission_context(request).am_i_assignee(group_task))
+        self.assertFalse(IsMyTask().has_object_permission(request, None, group_task))
+        self.assertTrue(IsMyTask().has_object_permission(request, None, group_task.task))
+
+    @override_settings(S_TASKS_API={'TASK_VISIBILITY_TABLE': True, 'LIST_CACHE': 'default'})
+    def test_save_group_task___change_log_visibility_and_cache___previous_row_read_once(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(group=self.group_1).first()
+        group_task.assignee = self.member_3
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            group_task.save()
+        # Assert
+        selects = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT "s_tasks_api_grouptask"."group_id"')]
+        self.assertEqual(1, len(selects), selects)
+        change = TaskChange.objects.last()
+        self.assertEqual((group_task.pk, self.member_1.pk), (change.group_task_id, change.previous_assignee_id))
+
+    def test_is_in_same_group___one_query(self):
+        test_data_list = [
+            {'user': self.member_1, 'other': self.member_2, 'expect': True},
+            {'user': self.member_1, 'other': self.both_group_member, 'expect': True},
+            {'user': self.member_1, 'other': self.group_2_member, 'expect': False},
+            {'user': self.group_2_member, 'other': self.both_group_member, 'expect': True},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(user=test_data['user'].username, other=test_data['other'].username):
+                # Act & Assert
+                with self.assertNumQueries(1):
+                    self.assertEqual(test_data['expect'], is_in_same_group(test_data['user'], test_data['other']))
+
+    def test_change_group_task_assignee___chained_permissions___read_user_groups_once(self):
+        # Arrange
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1,
+                                              assign_lock_level=GroupTask.ASSIGN_LOCK_NON).first()
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(get_detail_group_task_url(group_task.pk), {'assignee': self.member_3.pk})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        group_queries = [query['sql'] for query in context.captured_queries
+                         if 'auth_user_groups' in query['sql'] and 's_tasks_api' not in query['sql']]
+        # The user's group ids and the assignee's membership of them.
+        self.assertEqual(2, len(group_queries), group_queries)
+
+    def test_set_task_completed___changed_meanwhile___only_completed_columns_written(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1, completed=False).first()
+        stale_task = Task.objects.get(pk=task.pk)
+        Task.objects.filter(pk=task.pk).update(title='changed_meanwhile', version=F('version') + 1)
+        test_data_list = [
+            {'completed': True, 'updates': 2, 'changes': 1},
+            {'completed': True, 'updates': 0, 'changes': 0},
+            {'completed': False, 'updates': 1, 'changes': 1},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(completed=test_data['completed'], updates=test_data['updates']):
+                changes_count = TaskChange.objects.count()
+                # Act
+                with CaptureQueriesContext(connection) as context:
+                    actual = set_task_completed(stale_task, test_data['completed'])
+                # Assert
+                updates = [query['sql'] for query in context.captured_queries
+                           if query['sql'].startswith('UPDATE "s_tasks_api_task"')]
+                # The first UPDATE of a stale instance matches no row, the second one the new version.
+                self.assertEqual(test_data['updates'], len(updates), updates)
+                for update in updates:
+                    self.assertNotIn('"title"', update.split(' WHERE ')[0])
+                task_in_db = Task.objects.get(pk=task.pk)
+                self.assertEqual('changed_meanwhile', task_in_db.title)
+                self.assertEqual((test_data['completed'], task_in_db.version, task_in_db.completed_date),
+                                 (actual.completed, actual.version, actual.completed_date))
+                self.assertEqual(changes_count + test_data['changes'], TaskChange.objects.count())
+
+    def test_complete___task_and_group_task___no_select_after_update(self):
+        group_task = GroupTask.objects.filter(group=self.group_1, task__created_by=self.member_1,
+                                              task__completed=False).first()
+        test_data_list = [get_complete_task_url(group_task.task.pk), get_complete_group_task_url(group_task.pk)]
+        for url in test_data_list:
+            with self.subTest(url=url):
+                # Arrange
+                Task.objects.filter(pk=group_task.task.pk).update(completed=False, completed_date=None)
+                # Act
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.patch(url)
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+                self.assertTrue(Task.objects.get(pk=group_task.task.pk).completed)
+                queries = [query['sql'] for query in context.captured_queries]
+                updates = [index for index, sql in enumerate(queries) if sql.startswith('UPDATE "s_tasks_api_task"')]
+                self.assertEqual(1, len(updates), queries)
+                self.assertFalse([sql for sql in queries[updates[0]:] if sql.startswith('SELECT')], queries)
+
+    def test_complete_task___not_my_task___does_not_exist_and_not_updated(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.group_2_member, completed=False,
+                                   group_task__group=self.group_2).first()
+        # Act & Assert
+        with self.assertRaises(Task.DoesNotExist):
+            complete_task(self.member_1, task.pk)
+        self.assertFalse(Task.objects.get(pk=task.pk).completed)
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import transaction
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask
+from s_tasks_api.services.result_cache import GENERATION_KEY, get_cached_result
+from s_tasks_api.services.tasks import bulk_update_tasks
+from .utils import BaseTaskTestCase, User, LIST_TASK_URL, LIST_GROUP_TASK_URL, run_on_commit_callbacks
+
+
+def _change_group_task(pk, **fields):
+    group_task = GroupTask.objects.get(pk=pk)
+    for key, value in fields.items():
+        setattr(group_task, key, value)
+    group_task.save()
+
+
+@override_settings(S_TASKS_API={'LIST_CACHE': 'default'})
+class ResultCacheTestCase(BaseTaskTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def _get_generations(self):
+        users = User.objects.order_by('pk')
+        for user in users:
+            get_cached_result('default', 60, user, 'generation', lambda: True)
+        return {user.pk: caches['default'].get(GENERATION_KEY.format(user=user.pk)) for user in users}
+
+    def test_list___cached___rows_not_queried(self):
+        for url in [LIST_TASK_URL, LIST_GROUP_TASK_URL]:
+            with self.subTest(url=url):
+                # Arrange
+                expected = self.client.get(url)
+                # Act / Assert
+                # session and user; the ETag comes from the generation of the user.
+                with self.assertNumQueries(2):
+                    response = self.client.get(url)
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertEqual(expected.content, response.content)
+
+    def test_list___task_written___fresh_data(self):
+        # Arrange
+        self.client.get(LIST_GROUP_TASK_URL)
+        task = Task.objects.get(pk=1)
+        task.title = 'changed after caching'
+        with run_on_commit_callbacks():
+            task.save()
+        # Act
+        response = self.client.get(LIST_GROUP_TASK_URL)
+        # Assert
+        self.assertIn('changed after caching', [group_task['task']['title'] for group_task in response.data])
+
+    def test_write___generations_of_affected_users_bumped(self):
+        test_data_list = [
+            {'name': 'personal task saved', 'write': lambda: Task.objects.get(pk=6).save(), 'expect': {2}},
+            {'name': 'group task saved', 'write': lambda: GroupTask.objects.get(pk=3).save(), 'expect': {5, 6, 7}},
+            {'name': 'group task moved', 'write': lambda: _change_group_task(3, group_id=1, assignee_id=3),
+             'expect': {2, 3, 4, 5, 6, 7}},
+            {'name': 'group task deleted', 'write': lambda: GroupTask.objects.get(pk=5).delete(), 'expect': {5, 6, 7}},
+            {'name': 'task bulk updated', 'write': lambda: bulk_update_tasks([Task.objects.get(pk=2)], ['title']),
+             'expect': {2, 3, 4, 7}},
+            {'name': 'member added', 'write': lambda: Group.objects.get(pk=1).user_set.add(5), 'expect': {5}},
+            {'name': 'groups cleared', 'write': lambda: User.objects.get(pk=6).groups.clear(), 'expect': {6}},
+            {'name': 'members cleared', 'write': lambda: Group.objects.get(pk=2).user_set.clear(), 'expect': {5, 7}},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(name=test_data['name']):
+                # Arrange
+                before = self._get_generations()
+                # Act
+                with run_on_commit_callbacks():
+                    test_data['write']()
+                # Assert
+                after = self._get_generations()
+                self.assertSetEqual(test_data['expect'],
+                                    {user_id for user_id in before if before[user_id] != after[user_id]})
+
+    def test_write_in_transaction___generations_bumped_after_commit(self):
+        # Arrange
+        before = self._get_generations()
+        # Act
+        with run_on_commit_callbacks():
+            with transaction.atomic():
+                Task.objects.get(pk=6).save()
+                bulk_update_tasks([Task.objects.get(pk=2)], ['title'])
+                # Assert
+                self.assertDictEqual(before, self._get_generations())
+        after = self._get_generations()
+        self.assertSetEqual({2, 3, 4, 7}, {user_id for user_id in before if before[user_id] != after[user_id]})
@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask
+from s_tasks_api.search import TASK_FTS_TABLE
+from s_tasks_api.services.tasks import get_tasks, get_group_tasks
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, get_detail_task_url
+
+
+def _has_fts_table():
+    return connection.vendor == 'sqlite' and TASK_FTS_TABLE in connection.introspection.table_names()
+
+
+@override_settings(S_TASKS_API={'TASK_SEARCH_BACKEND': 's_tasks_api.search.SQLiteFTS5SearchBackend'})
+class SQLiteFTS5SearchTestCase(BaseTaskTestCase):
+    def setUp(self):
+        if not _has_fts_table():
+            self.skipTest('SQLite FTS5 with trigram tokenizer is not available.')
+        super().setUp()
+
+    def test_list_tasks___search_title_and_detail___same_as_contains(self):
+        tasks = get_tasks(self.member_1)
+        test_data_list = [
+            {'conditions': {'title': 'filter_title'},
+             'expect_result_tasks': tasks.filter(title__contains='filter_title')},
+            {'conditions': {'title': 'ILTER_TIT'},
+             'expect_result_tasks': tasks.filter(title__contains='ILTER_TIT')},
+            {'conditions': {'detail': 'filter_detail'},
+             'expect_result_tasks': tasks.filter(detail__contains='filter_detail')},
+            {'conditions': {'title': 'ti'},
+             'expect_result_tasks': tasks.filter(title__contains='ti')},
+            {'conditions': {'title': 'filter_title', 'detail': 'filter_detail'},
+             'expect_result_tasks': tasks.filter(title__contains='filter_title', detail__contains='filter_detail')},
+        ]
+        for test_data in test_data_list:
+            conditions = test_data['conditions']
+            with self.subTest(conditions=conditions):
+                # Act
+                response = self.client.get(LIST_TASK_URL, conditions)
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertListEqual([task.pk for task in test_data['expect_result_tasks']],
+                                     [task['pk'] for task in response.data])
+
+    def test_list_group_tasks___search_title___same_as_contains(self):
+        # Arrange
+        expected_group_tasks = get_group_tasks(self.member_1).filter(task__title__contains='filter_title')
+        # Act
+        response = self.client.get(LIST_GROUP_TASK_URL, {'title': 'filter_title'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertListEqual([group_task.pk for group_task in expected_group_tasks],
+                             [group_task['pk'] for group_task in response.data])
+
+    def test_change_task___search_index___follows_new_title(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1, group_task__lock_level=GroupTask.NON_LOCK).first()
+        old_title = task.title
+        # Act
+        response = self.client.patch(get_detail_task_url(task.pk), {'title': 'renamed_for_search'})
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        self.assertListEqual([task.pk], [t['pk'] for t in self.client.get(LIST_TASK_URL, {'title': 'renamed'}).data])
+        self.assertNotIn(task.pk, [t['pk'] for t in self.client.get(LIST_TASK_URL, {'title': old_title}).data])
+
+    def test_delete_task___search_index___row_removed(self):
+        # Arrange
+        task = GroupTask.objects.filter(task__created_by=self.member_1).first().task
+        task_pk = task.pk
+        # Act
+        task.delete()
+        # Assert
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM {} WHERE rowid = %s'.format(TASK_FTS_TABLE), [task_pk])
+            self.assertEqual(0, cursor.fetchone()[0])
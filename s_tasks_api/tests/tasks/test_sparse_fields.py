@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from s_tasks_api.models import Task
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, get_detail_task_url
+
+
+class SparseFieldsTestCase(BaseTaskTestCase):
+    def _get(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_list_tasks___fields_or_omit___only_those_fields(self):
+        test_data_list = [
+            {'params': {'fields': 'pk,title'}, 'expected': ['pk', 'title']},
+            {'params': {'omit': 'detail,version'},
+             'expected': ['pk', 'title', 'due_date', 'status', 'tag', 'created_date', 'created_by', 'updated_at']},
+            {'params': {'fields': 'pk,title,detail', 'omit': 'title'}, 'expected': ['pk', 'detail']},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(params=test_data['params']):
+                # Act
+                response, _ = self._get(LIST_TASK_URL, test_data['params'])
+                # Assert
+                self.assertGreater(len(response.data), 0)
+                for row in response.data:
+                    self.assertListEqual(test_data['expected'], list(row))
+
+    def test_list___detail_omitted___detail_not_read(self):
+        test_data_list = [
+            {'url': LIST_TASK_URL, 'params': {'omit': 'detail'}},
+            {'url': LIST_TASK_URL, 'params': {'fields': 'pk,title'}},
+            {'url': LIST_GROUP_TASK_URL, 'params': {'omit': 'task.detail'}},
+            {'url': LIST_GROUP_TASK_URL, 'params': {'fields': 'pk,task.title'}},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(url=test_data['url'], params=test_data['params']):
+                # Act
+                response, queries = self._get(test_data['url'], test_data['params'])
+                # Assert
+                rows = [row.get('task', row) for row in response.data]
+                self.assertGreater(len(rows), 0)
+                self.assertTrue(all('detail' not in row for row in rows))
+                row_queries = [sql for sql in queries if '"s_tasks_api_task"."title"' in sql]
+                self.assertEqual(1, len(row_queries), queries)
+                self.assertNotIn('"s_tasks_api_task"."detail"', row_queries[0])
+
+    def test_list_group_tasks___nested_fields___nested_task_sparse(self):
+        # Act
+        response, _ = self._get(LIST_GROUP_TASK_URL, {'fields': 'pk,task.title,assignee'})
+        # Assert
+        self.assertGreater(len(response.data), 0)
+        for row in response.data:
+            self.assertListEqual(['pk', 'task', 'assignee'], list(row))
+            self.assertListEqual(['title'], list(row['task']))
+
+    def test_retrieve___fields___only_those_fields(self):
+        # Arrange
+        task = Task.objects.filter(created_by=self.member_1).first()
+        # Act
+        response, _ = self._get(get_detail_task_url(task.pk), {'fields': 'title,detail'})
+        # Assert
+        self.assertDictEqual({'title': task.title, 'detail': task.detail}, dict(response.data))
+
+    def test_list___without_sparse_fields___all_fields(self):
+        # Act
+        response, queries = self._get(LIST_TASK_URL, {})
+        # Assert
+        self.assertIn('detail', response.data[0])
+        self.assertTrue(any('"s_tasks_api_task"."detail"' in sql for sql in queries))
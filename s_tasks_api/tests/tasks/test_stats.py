@@ -0,0 +1,78 @@
+import datetime
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task
+from s_tasks_api.services.tasks import bulk_complete_tasks
+from .utils import BaseTaskTestCase, LIST_TASK_URL, LIST_GROUP_TASK_URL, STATS_TASK_URL, STATS_GROUP_TASK_URL, \
+    run_on_commit_callbacks
+
+
+class TaskStatsTestCase(BaseTaskTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        Task.objects.filter(pk__in=[1, 5]).update(due_date=datetime.date(2000, 1, 1))
+        Task.objects.filter(pk=5).update(completed=True)
+
+    def test_stats___same_as_list(self):
+        test_data_list = [
+            {'stats_url': STATS_TASK_URL, 'list_url': LIST_TASK_URL, 'conditions': {},
+             'get_task': lambda item: item},
+            {'stats_url': STATS_TASK_URL, 'list_url': LIST_TASK_URL, 'conditions': {'completed': False},
+             'get_task': lambda item: item},
+            {'stats_url': STATS_GROUP_TASK_URL, 'list_url': LIST_GROUP_TASK_URL, 'conditions': {},
+             'get_task': lambda item: item['task']},
+            {'stats_url': STATS_GROUP_TASK_URL, 'list_url': LIST_GROUP_TASK_URL,
+             'conditions': {'assignee': self.member_1.pk}, 'get_task': lambda item: item['task']},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(url=test_data['stats_url'], conditions=test_data['conditions']):
+                # Arrange
+                items = self.client.get(test_data['list_url'], test_data['conditions']).data
+                tasks = [Task.objects.get(pk=test_data['get_task'](item)['pk']) for item in items]
+                # Act
+                response = self.client.get(test_data['stats_url'], test_data['conditions'])
+                # Assert
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                self.assertEqual(len(tasks), response.data['total'])
+                self.assertEqual(len([task for task in tasks if task.completed]), response.data['completed'])
+                self.assertEqual(len([task for task in tasks if not task.completed and task.due_date is not None
+                                      and task.due_date < datetime.date.today()]), response.data['overdue'])
+                self.assertDictEqual(
+                    {task.status_id: len([t for t in tasks if t.status_id == task.status_id]) for task in tasks},
+                    {entry['status']: entry['total'] for entry in response.data['status']})
+                self.assertDictEqual(
+                    {task.tag_id: len([t for t in tasks if t.tag_id == task.tag_id]) for task in tasks},
+                    {entry['tag']: entry['total'] for entry in response.data['tag']})
+                self.assertEqual(len(tasks), sum(entry['total'] for entry in response.data['group']))
+                self.assertEqual(len(tasks), sum(entry['total'] for entry in response.data['assignee']))
+
+    def test_stats___one_query(self):
+        # Arrange
+        self.client.get(STATS_GROUP_TASK_URL)
+        # Act / Assert
+        # session, user and the GROUP BY query.
+        with self.assertNumQueries(3):
+            response = self.client.get(STATS_GROUP_TASK_URL)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    @override_settings(S_TASKS_API={'STATS_CACHE': 'default'})
+    def test_stats___cached___no_query_until_task_written(self):
+        test_data_list = [
+            {'write': lambda: Task.objects.get(pk=1).save()},
+            {'write': lambda: bulk_complete_tasks(list(Task.objects.filter(pk=1)))},
+        ]
+        for test_data in test_data_list:
+            with self.subTest():
+                # Arrange
+                expected_total = self.client.get(STATS_TASK_URL).data['total']
+                # Act / Assert
+                with self.assertNumQueries(2):
+                    self.assertEqual(expected_total, self.client.get(STATS_TASK_URL).data['total'])
+                with run_on_commit_callbacks():
+                    test_data['write']()
+                with self.assertNumQueries(3):
+                    self.client.get(STATS_TASK_URL)
@@ -0,0 +1,105 @@
+from django.test import override_settings
+from rest_framework import status
+
+from s_tasks_api.models import Task, GroupTask, TaskVisibility, TaskStatus
+from s_tasks_api.services.tasks import get_tasks, get_group_tasks, bulk_create_tasks
+from s_tasks_api.services.visibility import rebuild_task_visibility
+from .utils import BaseTaskTestCase, ADD_TASK_URL, CREATE_GROUP_TASK_URL, get_detail_group_task_url, \
+    get_remove_to_my_task_url
+
+VISIBILITY_TABLE_SETTINGS = {'TASK_VISIBILITY_TABLE': True}
+
+
+@override_settings(S_TASKS_API=VISIBILITY_TABLE_SETTINGS)
+class TaskVisibilityTestCase(BaseTaskTestCase):
+    def setUp(self):
+        super().setUp()
+        rebuild_task_visibility()
+
+    def _get_rows(self):
+        return set(TaskVisibility.objects.values_list('user', 'task', 'role'))
+
+    def _assert_table_is_rebuilt_state(self):
+        rows = self._get_rows()
+        rebuild_task_visibility()
+        self.assertSetEqual(self._get_rows(), rows)
+
+    def test_get_tasks___enabled___same_as_joins(self):
+        for user in [self.member_1, self.member_2, self.member_3, self.both_group_member, self.group_2_member]:
+            with self.subTest(user=user.username):
+                # Arrange
+                with self.settings(S_TASKS_API={}):
+                    expected_tasks = list(get_tasks(user).order_by('pk'))
+                    expected_group_tasks = list(get_group_tasks(user).order_by('pk'))
+                # Act & Assert
+                self.assertListEqual(expected_tasks, list(get_tasks(user).order_by('pk')))
+                self.assertListEqual(expected_group_tasks, list(get_group_tasks(user).order_by('pk')))
+
+    def test_change_by_api___table_follows(self):
+        group_task = GroupTask.objects.filter(task__created_by=self.member_1,
+                                              assign_lock_level=GroupTask.ASSIGN_LOCK_NON).first()
+        test_data_list = [
+            {'name': 'add task', 'method': 'post', 'url': ADD_TASK_URL, 'data': {'title': 'visible'}},
+            {'name': 'add group task', 'method': 'post', 'url': CREATE_GROUP_TASK_URL,
+             'data': {'title': 'visible', 'group': self.group_1.pk, 'assignee': self.member_2.pk}},
+            {'name': 'change assignee', 'method': 'patch', 'url': get_detail_group_task_url(group_task.pk),
+             'data': {'assignee': self.member_3.pk}},
+            {'name': 'remove to my task', 'method': 'delete', 'url': get_remove_to_my_task_url(group_task.pk),
+             'data': None},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(name=test_data['name']):
+                # Act
+                response = getattr(self.client, test_data['method'])(test_data['url'], test_data['data'])
+                # Assert
+                self.assertLess(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+                self._assert_table_is_rebuilt_state()
+
+    def test_delete_task___rows_removed(self):
+        # Arrange
+        task = GroupTask.objects.filter(task__created_by=self.member_1).first().task
+        # Act
+        task.delete()
+        # Assert
+        self.assertFalse(TaskVisibility.objects.filter(task=task.pk).exists())
+        self._assert_table_is_rebuilt_state()
+
+    def test_change_group_membership___table_follows(self):
+        test_data_list = [
+            {'name': 'user joins', 'change': lambda: self.group_2_member.groups.add(self.group_1),
+             'expect_visible': True},
+            {'name': 'user leaves', 'change': lambda: self.group_2_member.groups.remove(self.group_1),
+             'expect_visible': False},
+            {'name': 'group adds user', 'change': lambda: self.group_1.user_set.add(self.group_2_member),
+             'expect_visible': True},
+            {'name': 'user clears groups', 'change': lambda: self.group_2_member.groups.clear(),
+             'expect_visible': False},
+            {'name': 'group adds user again', 'change': lambda: self.group_1.user_set.add(self.group_2_member),
+             'expect_visible': True},
+            {'name': 'group clears users', 'change': lambda: self.group_1.user_set.clear(),
+             'expect_visible': False},
+        ]
+        group_1_task = GroupTask.objects.filter(group=self.group_1).first()
+        for test_data in test_data_list:
+            with self.subTest(name=test_data['name']):
+                # Act
+                test_data['change']()
+                # Assert
+                self.assertEqual(test_data['expect_visible'],
+                                 get_group_tasks(self.group_2_member).filter(pk=group_1_task.pk).exists())
+                self._assert_table_is_rebuilt_state()
+
+    def test_get_group_tasks___enabled___one_query_without_user_groups(self):
+        # Act
+        with self.assertNumQueries(1) as context:
+            list(get_group_tasks(self.member_1))
+        # Assert
+        self.assertNotIn('auth_user_groups', context.captured_queries[0]['sql'])
+
+    def test_bulk_created_task___visible_to_creator(self):
+        # Arrange
+        task = Task(title='bulk visible', created_by=self.member_1, status=TaskStatus.objects.first())
+        # Act
+        bulk_create_tasks([task])
+        # Assert
+        self.assertTrue(get_tasks(self.member_1).filter(pk=task.pk).exists())
@@ -1,4 +1,7 @@
+from contextlib import contextmanager
+
 from django.contrib.auth.models import Group
+from django.db import connection
 from django.urls import reverse
 
 from ..utils import BaseApiTestCase, User
@@ -14,6 +17,14 @@ DETAIL_GROUP_TASK_URL = 's-tasks:group-tasks-detail'
 COMPLETE_GROUP_TASK_URL_NAME = 's-tasks:group-tasks-complete'
 UN_COMPLETE_GROUP_TASK_URL_NAME = 's-tasks:group-tasks-un-complete'
 REMOVE_TO_MY_TASK_URL_NAME = 's-tasks:group-tasks-remove-to-my-task'
+BULK_CREATE_TASK_URL = reverse('s-tasks:tasks-bulk-create')
+BULK_UPDATE_TASK_URL = reverse('s-tasks:tasks-bulk-update')
+BULK_COMPLETE_TASK_URL = reverse('s-tasks:tasks-bulk-complete')
+CHANGES_TASK_URL = reverse('s-tasks:tasks-changes')
+EXPORT_TASK_URL = reverse('s-tasks:tasks-export')
+EXPORT_GROUP_TASK_URL = reverse('s-tasks:group-tasks-export')
+STATS_TASK_URL = reverse('s-tasks:tasks-stats')
+STATS_GROUP_TASK_URL = reverse('s-tasks:group-tasks-stats')
 
 
 def get_detail_task_url(pk):
@@ -44,6 +55,20 @@ def get_remove_to_my_task_url(pk):
     return reverse(REMOVE_TO_MY_TASK_URL_NAME, args=[pk])
 
 
+@contextmanager
+def run_on_commit_callbacks():
+    """
+    Run the on_commit callbacks registered inside the block when it ends, since the transaction of
+    TestCase is never committed (captureOnCommitCallbacks(execute=True) of later Django versions).
+    """
+    start = len(connection.run_on_commit)
+    yield
+    callbacks = connection.run_on_commit[start:]
+    del connection.run_on_commit[start:]
+    for _, callback in callbacks:
+        callback()
+
+
 class BaseTaskTestCase(BaseApiTestCase):
     fixtures = ['test_group_users.json', 'default_task_status_data.json', 'test_task_tags_data.json',
                 'test_group_tasks_data.json']
@@ -0,0 +1,86 @@
+import asyncio
+
+from django.conf import settings
+from django.test import Client, RequestFactory, TransactionTestCase
+from django.urls import reverse
+
+from s_tasks_api.asgi import ReadPoolASGIHandler, is_read_request
+from s_tasks_api.benchmark import ConcurrencyBenchmarkRunner, CONCURRENCY_SERVERS
+from .utils import User
+
+FIXTURES = ['test_group_users.json', 'default_task_status_data.json', 'test_task_tags_data.json',
+            'test_group_tasks_data.json']
+
+
+def _call(application, method, path, cookie):
+    response = {'body': b''}
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] += message.get('body', b'')
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+             'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())]}
+    asyncio.run(application(scope, receive, send))
+    return response
+
+
+class ReadPoolASGIHandlerTestCase(TransactionTestCase):
+    fixtures = FIXTURES
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.get(username='group1_member1'))
+        self.cookie = '{}={}'.format(settings.SESSION_COOKIE_NAME, self.client.session.session_key)
+
+    def test_is_read_request(self):
+        factory = RequestFactory()
+        test_data_list = [
+            {'request': factory.get(reverse('s-tasks:tasks-list')), 'expect': True},
+            {'request': factory.head(reverse('s-tasks:group-tasks-detail', args=[1])), 'expect': True},
+            {'request': factory.post(reverse('s-tasks:tasks-list')), 'expect': False},
+            {'request': factory.get(reverse('s-tasks:tasks-changes')), 'expect': False},
+            {'request': factory.get('/not-found/'), 'expect': False},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(path=test_data['request'].path, method=test_data['request'].method):
+                self.assertEqual(test_data['expect'], is_read_request(test_data['request']))
+
+    def test_handler___same_responses_as_wsgi(self):
+        application = ReadPoolASGIHandler()
+        self.addCleanup(application.executor.shutdown)
+        test_data_list = [
+            {'method': 'GET', 'path': reverse('s-tasks:tasks-list')},
+            {'method': 'GET', 'path': reverse('s-tasks:group-tasks-list')},
+            {'method': 'GET', 'path': reverse('s-tasks:group-tasks-detail', args=[1])},
+            {'method': 'GET', 'path': reverse('s-tasks:tasks-changes')},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(test_data=test_data):
+                # Arrange
+                expected = self.client.generic(test_data['method'], test_data['path'])
+                # Act
+                response = _call(application, test_data['method'], test_data['path'], self.cookie)
+                # Assert
+                self.assertEqual(expected.status_code, response['status'])
+                self.assertEqual(expected.content, response['body'])
+
+    def test_concurrency_benchmark___every_server_measured(self):
+        # Arrange
+        runner = ConcurrencyBenchmarkRunner(list(User.objects.values_list('pk', flat=True)), requests=8,
+                                            host='testserver', users=3)
+        # Act
+        measurements = runner.run([1, 4])
+        # Assert
+        self.assertListEqual(CONCURRENCY_SERVERS * 2, [measurement.server for measurement in measurements])
+        for measurement in measurements:
+            with self.subTest(server=measurement.server, concurrency=measurement.concurrency):
+                self.assertEqual(8, measurement.requests)
+                self.assertFalse([code for code in measurement.statuses if code.startswith('5')])
+                self.assertLessEqual(measurement.p50_ms, measurement.p99_ms)
@@ -0,0 +1,53 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from s_tasks_api.benchmark import percentile
+from s_tasks_api.models import Task
+
+
+class BenchmarkCommandTestCase(TestCase):
+    def test_percentile___nearest_rank(self):
+        test_data_list = [
+            {'values': [], 'p': 50, 'expect': None},
+            {'values': [3, 1, 2], 'p': 50, 'expect': 2},
+            {'values': list(range(1, 101)), 'p': 99, 'expect': 99},
+            {'values': [5], 'p': 0, 'expect': 5},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(test_data=test_data):
+                self.assertEqual(test_data['expect'], percentile(test_data['values'], test_data['p']))
+
+    def test_benchmark___small_dataset___results_of_every_action_and_rolled_back(self):
+        # Arrange
+        handle, output = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, output)
+        # Act
+        call_command('s_tasks_benchmark', users=6, groups=2, tasks_per_user=4, samples=3, output=output,
+                     stdout=io.StringIO())
+        # Assert
+        with open(output) as f:
+            result = json.load(f)
+        self.assertEqual(6, result['parameters']['users'])
+        names = [measurement['name'] for measurement in result['results']]
+        for name in ['tasks-list', 'tasks-retrieve', 'tasks-create', 'tasks-partial-update', 'tasks-complete',
+                     'tasks-bulk-create', 'tasks-changes', 'group-tasks-list', 'group-tasks-partial-update',
+                     'group-tasks-destroy']:
+            self.assertIn(name, names)
+        for measurement in result['results']:
+            with self.subTest(name=measurement['name']):
+                self.assertFalse([code for code in measurement['statuses'] if code.startswith('5')])
+                if measurement['samples']:
+                    self.assertLessEqual(measurement['p50_ms'], measurement['p99_ms'])
+                    self.assertIsNotNone(measurement['queries_max'])
+        list_measurement = result['results'][names.index('tasks-list')]
+        self.assertEqual(3, list_measurement['samples'])
+        self.assertIsNotNone(list_measurement['peak_memory_kb'])
+        self.assertFalse(get_user_model().objects.filter(username__startswith='s_tasks_benchmark_').exists())
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+from rest_framework import permissions
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from s_tasks_api.permissions.common import AndAll, COST_REQUEST, COST_CONTEXT, COST_QUERY
+
+
+def _permission(name, result, calls, cost=None, permission_methods=None, message=None):
+    attributes = {
+        'has_permission': lambda self, request, view: calls.append(name) or result,
+        'has_object_permission': lambda self, request, view, obj: calls.append(name) or result,
+    }
+    for key, value in [('cost', cost), ('permission_methods', permission_methods), ('message', message)]:
+        if value is not None:
+            attributes[key] = value
+    return type(name, (permissions.BasePermission,), attributes)()
+
+
+class AndAllTestCase(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.factory = APIRequestFactory()
+
+    def _request(self, method):
+        return Request(getattr(self.factory, method.lower())('/'))
+
+    def test_has_permission___all_pass___checked_cheapest_first(self):
+        # Arrange
+        and_all = AndAll([
+            _permission('Query', True, self.calls, cost=COST_QUERY),
+            _permission('Undeclared', True, self.calls),
+            _permission('Context', True, self.calls, cost=COST_CONTEXT),
+            _permission('Request', True, self.calls, cost=COST_REQUEST),
+        ])
+        # Act
+        result = and_all.has_permission(self._request('GET'), None)
+        # Assert
+        self.assertTrue(result)
+        self.assertListEqual(['Undeclared', 'Request', 'Context', 'Query'], self.calls)
+
+    def test_has_permission___irrelevant_method___skipped(self):
+        test_data_list = [
+            {'method': 'GET', 'expect_result': True, 'expect_calls': []},
+            {'method': 'POST', 'expect_result': False, 'expect_calls': ['PostOnly']},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(method=test_data['method']):
+                # Arrange
+                self.calls.clear()
+                and_all = AndAll([_permission('PostOnly', False, self.calls, permission_methods=['POST'])])
+                # Act
+                result = and_all.has_permission(self._request(test_data['method']), None)
+                # Assert
+                self.assertEqual(test_data['expect_result'], result)
+                self.assertListEqual(test_data['expect_calls'], self.calls)
+
+    def test_has_permission___cheap_later_permission_fails___message_of_first_declared_failure(self):
+        test_data_list = [
+            {'first_result': False, 'expect_message': 'first', 'expect_calls': ['Second', 'First']},
+            {'first_result': True, 'expect_message': 'second', 'expect_calls': ['Second', 'First']},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(first_result=test_data['first_result']):
+                # Arrange
+                self.calls.clear()
+                and_all = AndAll([
+                    _permission('First', test_data['first_result'], self.calls, cost=COST_QUERY, message='first'),
+                    _permission('Second', False, self.calls, cost=COST_REQUEST, message='second'),
+                    _permission('Third', False, self.calls, cost=COST_QUERY, message='third'),
+                ])
+                # Act
+                result = and_all.has_permission(self._request('GET'), None)
+                # Assert
+                self.assertFalse(result)
+                self.assertEqual(test_data['expect_message'], and_all.message)
+                self.assertListEqual(test_data['expect_calls'], self.calls)
+
+    def test_has_object_permission___object_cost___checked_cheapest_first(self):
+        # Arrange
+        query = _permission('Query', True, self.calls, cost=COST_REQUEST)
+        query.object_cost = COST_QUERY
+        and_all = AndAll([query, _permission('Context', True, self.calls, cost=COST_CONTEXT)])
+        # Act
+        result = and_all.has_object_permission(self._request('GET'), None, object())
+        # Assert
+        self.assertTrue(result)
+        self.assertListEqual(['Context', 'Query'], self.calls)
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from s_tasks_api.models import TaskStatus, TaskTag
+from s_tasks_api.services.reference_data import reference_data_cache, ReferenceDataCache, get_reference_data
+from s_tasks_api.services.task_status import get_default_task_status
+from .tasks.utils import run_on_commit_callbacks
+from .utils import BaseApiTestCase
+
+
+class ReferenceDataCacheTestCase(BaseApiTestCase):
+    fixtures = ['default_task_status_data.json', 'test_task_tags_data.json']
+
+    def setUp(self):
+        super().setUp()
+        reference_data_cache.clear()
+        cache.clear()
+
+    def test_get_default_task_status___second_time___no_query(self):
+        # Arrange
+        expected = get_default_task_status()
+        # Act & Assert
+        with self.assertNumQueries(0):
+            self.assertEqual(expected, get_default_task_status())
+
+    def test_get_reference_data___after_save_and_delete___invalidated(self):
+        for model in [TaskStatus, TaskTag]:
+            with self.subTest(model=model):
+                # Arrange
+                row = model.objects.create(value='cached')
+                get_reference_data(model, row.pk)
+                # Act
+                with run_on_commit_callbacks():
+                    model(pk=row.pk, value='changed').save()
+                    self.assertEqual('cached', get_reference_data(model, row.pk).value)
+                # Assert
+                self.assertEqual('changed', get_reference_data(model, row.pk).value)
+                # Act
+                with run_on_commit_callbacks():
+                    model.objects.get(pk=row.pk).delete()
+                # Assert
+                with self.assertRaises(model.DoesNotExist):
+                    get_reference_data(model, row.pk)
+
+    @override_settings(S_TASKS_API={'REFERENCE_DATA_CACHE': 'default'})
+    def test_get_reference_data___shared_cache___other_worker_invalidated(self):
+        # Arrange
+        other_worker_cache = ReferenceDataCache()
+        status = TaskStatus.objects.create(value='cached')
+        other_worker_cache.get(TaskStatus, status.pk)
+        # Act
+        TaskStatus.objects.filter(pk=status.pk).update(value='changed')
+        reference_data_cache.invalidate(TaskStatus)
+        # Assert
+        self.assertEqual('changed', other_worker_cache.get(TaskStatus, status.pk).value)
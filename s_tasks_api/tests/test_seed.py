@@ -0,0 +1,82 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from s_tasks_api.models import Task, GroupTask, TaskTag
+
+
+def _seed(prefix, **options):
+    call_command('s_tasks_seed', prefix=prefix, stdout=io.StringIO(), **options)
+
+
+def _shape(prefix):
+    """
+    Generated rows without pks and names, which differ between runs.
+    """
+    tasks = Task.objects.filter(created_by__username__startswith=prefix).order_by('pk')
+    return {
+        'tasks': [(task.due_date, task.completed, task.status_id) for task in tasks],
+        'group_tasks': list(GroupTask.objects.filter(task__in=tasks).order_by('pk')
+                            .values_list('lock_level', 'assign_lock_level')),
+        'group_sizes': sorted(get_user_model().objects.filter(username__startswith=prefix)
+                              .values('groups').annotate(size=Count('pk')).values_list('size', flat=True)),
+    }
+
+
+class SeedCommandTestCase(TestCase):
+    def test_seed___sizes___rows_created(self):
+        # Act
+        _seed('seed_a_', users=5, groups=2, tasks_per_user=4, tags=3)
+        # Assert
+        users = get_user_model().objects.filter(username__startswith='seed_a_')
+        self.assertEqual(5, users.count())
+        self.assertEqual(20, Task.objects.filter(created_by__in=users).count())
+        self.assertEqual(3, TaskTag.objects.count())
+        self.assertTrue(all(user.groups.count() == 1 for user in users))
+
+    def test_seed___same_seed___same_data(self):
+        # Arrange
+        options = {'users': 8, 'groups': 3, 'tasks_per_user': 5, 'task_skew': 1.0, 'group_skew': 1.0,
+                   'lock_share': 0.5, 'seed': 7}
+        # Act
+        _seed('seed_a_', **options)
+        _seed('seed_b_', **options)
+        _seed('seed_c_', **dict(options, seed=8))
+        # Assert
+        self.assertEqual(_shape('seed_a_'), _shape('seed_b_'))
+        self.assertNotEqual(_shape('seed_a_'), _shape('seed_c_'))
+
+    def test_seed___task_skew___uneven_tasks_per_user(self):
+        test_data_list = [
+            {'task_skew': 0.0, 'expect_even': True},
+            {'task_skew': 1.5, 'expect_even': False},
+        ]
+        for test_data in test_data_list:
+            with self.subTest(task_skew=test_data['task_skew']):
+                prefix = 'seed_{}_'.format(test_data['task_skew'])
+                # Act
+                _seed(prefix, users=10, groups=2, tasks_per_user=10, task_skew=test_data['task_skew'])
+                # Assert
+                counts = list(get_user_model().objects.filter(username__startswith=prefix)
+                              .annotate(tasks=Count('task')).values_list('tasks', flat=True))
+                self.assertEqual(100, sum(counts))
+                self.assertEqual(test_data['expect_even'], min(counts) == max(counts))
+
+    def test_seed___lock_share_and_due_dates___within_options(self):
+        # Act
+        _seed('seed_a_', users=5, groups=1, tasks_per_user=10, group_task_share=1, lock_share=1,
+              due_date_share=1, due_date_min_days=1, due_date_max_days=3, due_date_distribution='triangular')
+        # Assert
+        self.assertFalse(GroupTask.objects.filter(lock_level=GroupTask.NON_LOCK).exists())
+        self.assertEqual(50, GroupTask.objects.count())
+        today = datetime.date.today()
+        for due_date in Task.objects.values_list('due_date', flat=True):
+            self.assertTrue(today + datetime.timedelta(days=1) <= due_date <= today + datetime.timedelta(days=3))
+
+    def test_seed___invalid_share___command_error(self):
+        with self.assertRaises(CommandError):
+            _seed('seed_a_', lock_share=1.5)
@@ -1,17 +1,44 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
-from django.http import Http404
+from django.db.models import Count, Max, Sum
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.utils.module_loading import import_string
 from rest_framework import viewsets, exceptions, status
 from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
-from s_tasks_api.services.tasks import get_tasks, complete_task, un_complete_task, get_group_tasks, is_task_created_by
+from s_tasks_api.permissions.context import get_permission_context
+from s_tasks_api.services.tasks import get_tasks, set_task_completed, get_group_tasks, \
+    is_task_created_by, shape_tasks, shape_group_tasks, bulk_create_tasks, bulk_update_tasks, bulk_complete_tasks
+from s_tasks_api.services.allowed_actions import annotate_allowed_actions
+from s_tasks_api.services.changes import get_changes
+from s_tasks_api.services.result_cache import get_cached_result, get_generation
+from s_tasks_api.services.stats import get_task_stats
 from s_tasks_api.settings import api_settings
+from .export import EXPORT_FORMATS, CONTENT_TYPES, stream_rows
 from .filters import TaskFilterSet, GroupTaskFilterSet
-from .models import Task, TaskStatus, TaskTag, GroupTask
-from .serializers import TaskSerializer, TaskStatusSerializer, TaskTagSerializer, GroupTaskSerializer
+from .instrumentation import RequestMetrics, METRICS_ATTRIBUTE, get_request_metrics, report_request_metrics
+from .models import Task, TaskStatus, TaskTag, GroupTask, VersionConflict
+from .serializers import TaskSerializer, TaskStatusSerializer, TaskTagSerializer, GroupTaskSerializer, \
+    TimedListSerializer, ValuesListSerializer
 from .services.utils import add_items_at_query_dict
 
+# Columns of TaskSerializer; allowed_actions is computed per user.
+TASK_EXPORT_FIELDS = tuple(field for field in TaskSerializer.Meta.fields if field != 'allowed_actions')
+
+
+def get_pagination_columns(view):
+    """
+    Columns which the paginator of view reads from the rows of a page (the keyset of cursor pagination).
+    """
+    ordering = getattr(view.paginator, 'ordering', None) or ()
+    return [field.lstrip('-') for field in ([ordering] if isinstance(ordering, str) else ordering)]
+
 
 class Response403To401Mixin:
     # noinspection PyMethodMayBeStatic
@@ -23,27 +50,436 @@ class Response403To401Mixin:
         raise exceptions.PermissionDenied(detail=message)
 
 
-class TaskStatusViewSet(Response403To401Mixin, viewsets.ModelViewSet):
+class InstrumentationMixin:
+    """
+    When api_settings.INSTRUMENTATION is on, measure SQL queries, permission checks (each class of AndAll too)
+    and serializers of the request, and report them as a Server-Timing header, a log record of
+    's_tasks_api.instrumentation' and the request_measured signal.
+    When it is off, only the setting is read.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not api_settings.INSTRUMENTATION:
+            return super().dispatch(request, *args, **kwargs)
+        metrics = RequestMetrics()
+        setattr(request, METRICS_ATTRIBUTE, metrics)
+        with metrics.capture_queries(), metrics.timer('total'):
+            response = super().dispatch(request, *args, **kwargs)
+        report_request_metrics(request, response, metrics)
+        return response
+
+    def check_permissions(self, request):
+        metrics = get_request_metrics(request)
+        if metrics is None:
+            return super().check_permissions(request)
+        with metrics.timer('permissions'):
+            return super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        metrics = get_request_metrics(request)
+        if metrics is None:
+            return super().check_object_permissions(request, obj)
+        with metrics.timer('permissions'):
+            return super().check_object_permissions(request, obj)
+
+
+class PreconditionFailed(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource was changed by another request.'
+    default_code = 'precondition_failed'
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified validators for list and retrieve, and preconditions of writes.
+    Lists are validated by their ETag only, see _get_list_etag, so an unchanged list is answered with 304
+    before anything is serialized.
+    The ETag of an object is its version (joined with '.' for version_fields through relations); writes of an
+    object check If-Match / If-Unmodified-Since against it, and a save which loses the race with another writer
+    (VersionConflict) is answered with 412 too.
+    """
+    updated_at_fields = ('updated_at',)
+    # updated_at of the rows which decide whether a row is in the list; defaults to updated_at_fields.
+    list_updated_at_fields = None
+    version_fields = ('version',)
+
+    def list(self, request, *args, **kwargs):
+        etag = self._get_list_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag, None)
+        return self._set_validators(super().list(request, *args, **kwargs), etag, None)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self._get_object_validators(instance)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag, last_modified)
+        serializer = self.get_serializer(instance)
+        return self._set_validators(Response(serializer.data), etag, last_modified)
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.request.method not in SAFE_METHODS:
+            etag, last_modified = self._get_object_validators(instance)
+            if get_conditional_response(self.request, etag=etag, last_modified=last_modified) is not None:
+                raise PreconditionFailed()
+        return instance
+
+    def handle_exception(self, exc):
+        if isinstance(exc, VersionConflict):
+            exc = PreconditionFailed()
+        return super().handle_exception(exc)
+
+    def _get_list_etag(self, request):
+        """
+        Lists have no Last-Modified, because the latest updated_at of the rows does not change when an older row
+        is deleted. With api_settings.LIST_CACHE, the validator is the generation of the user in that cache,
+        which every write the user can see bumps, so no query runs. Otherwise it is the row count, the sum of the pks
+        (which rows are in the list) and the latest of list_updated_at_fields of the filtered queryset, read with one
+        aggregate query.
+        """
+        if api_settings.LIST_CACHE is not None:
+            version = get_generation(api_settings.LIST_CACHE, request.user)
+        else:
+            updated_at_fields = self.list_updated_at_fields or self.updated_at_fields
+            aggregates = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+                count=Count('pk'), pk_sum=Sum('pk'),
+                **{'updated_at_{}'.format(index): Max(field) for index, field in enumerate(updated_at_fields)})
+            updated_ats = [value for key, value in aggregates.items() if key.startswith('updated_at_') and value]
+            updated_at = max(updated_ats, default=None)
+            version = '{}|{}|{}'.format(aggregates['count'], aggregates['pk_sum'],
+                                        updated_at.isoformat() if updated_at is not None else '')
+        source = '{user}|{path}|{version}'.format(user=request.user.pk, path=request.get_full_path(), version=version)
+        return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+    # noinspection PyMethodMayBeStatic
+    def _set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def _get_object_validators(self, instance):
+        versions = [str(self._get_value(instance, field)) for field in self.version_fields]
+        updated_ats = [self._get_value(instance, field) for field in self.updated_at_fields]
+        return quote_etag('.'.join(versions)), int(max(updated_ats).timestamp())
+
+    # noinspection PyMethodMayBeStatic
+    def _get_value(self, instance, field):
+        for attr in field.split('__'):
+            instance = getattr(instance, attr)
+        return instance
+
+
+class AllowedActionsMixin:
+    """
+    allowed_actions of rows evaluated in SQL by annotate_allowed_actions.
+    list / retrieve with ?allowed_actions=true return them as a field of each row, and bulk actions fetch their
+    targets with them, so that lock checks of permission classes do not evaluate lock bits row by row.
+    """
+    allowed_actions_prefixes = {'group_task_prefix': '', 'task_prefix': 'task__'}
+    allowed_actions_bulk_actions = ['bulk_update', 'bulk_complete']
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['allowed_actions'] = self._is_allowed_actions_requested()
+        return context
+
+    def annotate_allowed_actions(self, queryset):
+        if not (self._is_allowed_actions_requested() or self.action in self.allowed_actions_bulk_actions):
+            return queryset
+        return annotate_allowed_actions(queryset, self.request.user, **self.allowed_actions_prefixes)
+
+    def _is_allowed_actions_requested(self):
+        return self.action in ['list', 'retrieve'] and \
+            self.request.query_params.get('allowed_actions') in ['true', 'True', '1']
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets of list and retrieve: ?fields= keeps only and ?omit= drops the comma separated fields
+    ('task.detail' for fields of nested serializers), see serializers.SparseFieldsMixin.
+    Lists also defer() the columns of the dropped fields, so that e.g. ?omit=detail does not read detail at all.
+    """
+    sparse_fields_actions = ['list', 'retrieve']
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in self.sparse_fields_actions:
+            for param in ['fields', 'omit']:
+                value = self.request.query_params.get(param)
+                if value is not None:
+                    context[param] = [name.strip() for name in value.split(',') if name.strip()]
+        return context
+
+    def defer_sparse_fields(self, queryset):
+        if self.action != 'list':
+            return queryset
+        context = self.get_serializer_context()
+        if 'fields' not in context and 'omit' not in context:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        kept_columns = ValuesListSerializer(serializer_class=serializer_class, context=context).columns
+        all_columns = ValuesListSerializer(serializer_class=serializer_class,
+                                           context=dict(context, fields=None, omit=None)).columns
+        kept_columns += get_pagination_columns(self)
+        deferred = [column for column in all_columns
+                    if column not in kept_columns and self._is_deferrable(queryset.model, column)]
+        return queryset.defer(*deferred) if deferred else queryset
+
+    # noinspection PyMethodMayBeStatic
+    def _is_deferrable(self, model, lookup):
+        """
+        Only plain columns are deferred; keys stay, because select_related and permissions follow them.
+        """
+        *relations, name = lookup.split('__')
+        try:
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            field = model._meta.get_field(name)
+        except (FieldDoesNotExist, AttributeError):
+            return False
+        return field.concrete and not field.is_relation and not field.primary_key
+
+
+class ResultCacheMixin:
+    """
+    Cache of list data, when api_settings.LIST_CACHE names a Django cache.
+    Entries are keyed by the user, the request URI (filters and cursor) and a generation of the user
+    which writes of tasks, group tasks and group members bump, see services.result_cache.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if api_settings.LIST_CACHE is None:
+            return super().list(request, *args, **kwargs)
+        return Response(get_cached_result(
+            api_settings.LIST_CACHE, api_settings.LIST_CACHE_TIMEOUT, request.user, request.build_absolute_uri(),
+            lambda: super(ResultCacheMixin, self).list(request, *args, **kwargs).data))
+
+
+class ValuesListMixin:
+    """
+    Fast path of list, when api_settings.LIST_FAST_PATH is on.
+    The readable fields of the serializer are fetched with values_list() and represented by ValuesListSerializer,
+    so no model instance nor serializer is built per row. The response is the same as the one of the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not api_settings.LIST_FAST_PATH:
+            return super().list(request, *args, **kwargs)
+        context = self.get_serializer_context()
+        child = ValuesListSerializer(serializer_class=self.get_serializer_class(), context=context)
+        # Columns after the ones of child are not represented; the paginator reads its keyset from them.
+        columns = child.columns + [column for column in get_pagination_columns(self) if column not in child.columns]
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*columns, named=True)
+        page = self.paginate_queryset(queryset)
+        serializer = TimedListSerializer(queryset if page is None else page, child=child, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
+class StatsMixin:
+    """
+    stats action, which counts the filtered list per status, tag, group and assignee in the database.
+    List filters work as query parameters; results are cached per user when api_settings.STATS_CACHE is set.
+    """
+    stats_lookups = {}
+    stats_task_prefix = ''
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        return Response(get_cached_result(
+            api_settings.STATS_CACHE, api_settings.STATS_CACHE_TIMEOUT, request.user, request.build_absolute_uri(),
+            lambda: get_task_stats(self.filter_queryset(self.get_queryset()), self.stats_lookups,
+                                   self.stats_task_prefix)))
+
+
+class ExportMixin:
+    """
+    export action, which streams the filtered list as NDJSON (default) or CSV (?export_format=csv).
+    Rows are read as values() of export_fields through iterator(), so memory does not grow with the export size.
+    """
+    export_fields = ()
+    export_file_name = 'export'
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise exceptions.ValidationError({'export_format': 'Choose one of {}.'.format(EXPORT_FORMATS)})
+        rows = self.filter_queryset(self.get_queryset()).values(*self.export_fields) \
+            .iterator(chunk_size=api_settings.EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(stream_rows(rows, self.export_fields, export_format),
+                                         content_type=CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(self.export_file_name, export_format)
+        return response
+
+
+class BulkItemRequest:
+    """
+    Request proxy whose data is one item of a bulk request body, so that permission classes check items one by one.
+    """
+
+    def __init__(self, request, data):
+        self._bulk_request = request
+        self.data = data
+
+    def __getattr__(self, item):
+        return getattr(self._bulk_request, item)
+
+
+class BulkTaskActionsMixin:
+    """
+    bulk_create, bulk_update and bulk_complete actions.
+    Targets are fetched with one query, every item is checked by the view's permission classes
+    against one shared permission context, and all rows are written in one transaction.
+    Each item gets its own result: {'status': ..., 'data': ...} or {'status': ..., 'detail'/'errors': ...}.
+    """
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request, *args, **kwargs):
+        from s_tasks_api.services.task_status import get_task_status_from_or_default
+        items = self._get_bulk_items(request)
+        results = []
+        created_tasks = []
+        for item in items:
+            result = self._check_bulk_item_permissions(request, item)
+            if result is None:
+                serializer = self.get_serializer(data=item)
+                if serializer.is_valid():
+                    validated_data = dict(serializer.validated_data)
+                    validated_data['status'] = get_task_status_from_or_default(validated_data)
+                    task = Task(created_by=request.user, **validated_data)
+                    created_tasks.append(task)
+                    result = task
+                else:
+                    result = {'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+            results.append(result)
+        with transaction.atomic():
+            bulk_create_tasks(created_tasks)
+        return self._get_bulk_response(results, status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['patch'])
+    def bulk_update(self, request, *args, **kwargs):
+        items = self._get_bulk_items(request)
+        tasks = self._get_bulk_tasks([item.get('pk') for item in items if isinstance(item, dict)])
+        results = []
+        tasks_by_fields = {}
+        for item in items:
+            pk = item.get('pk') if isinstance(item, dict) else None
+            result = self._check_bulk_item_permissions(request, item, tasks.get(str(pk)))
+            if result is None:
+                task = tasks[str(pk)]
+                serializer = self.get_serializer(task, data=item, partial=True)
+                if serializer.is_valid():
+                    for attr, value in serializer.validated_data.items():
+                        setattr(task, attr, value)
+                    if serializer.validated_data:
+                        tasks_by_fields.setdefault(tuple(sorted(serializer.validated_data)), []).append(task)
+                    result = task
+                else:
+                    result = {'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+            results.append(result)
+        # Rows are grouped by the fields of their item, so that each row is written only with its own fields.
+        conflicted_tasks = []
+        with transaction.atomic():
+            for fields, tasks in tasks_by_fields.items():
+                conflicted_tasks += bulk_update_tasks(tasks, list(fields))
+        conflict = {'status': status.HTTP_412_PRECONDITION_FAILED, 'detail': PreconditionFailed.default_detail}
+        results = [conflict if any(result is task for task in conflicted_tasks) else result for result in results]
+        return self._get_bulk_response(results, status.HTTP_200_OK)
+
+    @action(detail=False, methods=['patch'])
+    def bulk_complete(self, request, *args, **kwargs):
+        pks = self._get_bulk_items(request)
+        tasks = self._get_bulk_tasks(pks)
+        results = []
+        completable_tasks = []
+        for pk in pks:
+            result = self._check_bulk_item_permissions(request, {}, tasks.get(str(pk)))
+            if result is None:
+                completable_tasks.append(tasks[str(pk)])
+                result = tasks[str(pk)]
+            results.append(result)
+        with transaction.atomic():
+            bulk_complete_tasks(completable_tasks)
+        return self._get_bulk_response(results, status.HTTP_200_OK)
+
+    # noinspection PyMethodMayBeStatic
+    def _get_bulk_items(self, request):
+        if not isinstance(request.data, list):
+            raise exceptions.ValidationError('Expected a list of items.')
+        if len(request.data) > api_settings.MAX_BULK_SIZE:
+            raise exceptions.ValidationError(
+                'Ensure this list has no more than {} items.'.format(api_settings.MAX_BULK_SIZE))
+        return request.data
+
+    def _get_bulk_tasks(self, pks):
+        pks = [pk for pk in pks if str(pk).isdigit()]
+        return {str(task.pk): task for task in self.get_queryset().filter(pk__in=pks)}
+
+    def _check_bulk_item_permissions(self, request, item, obj=None):
+        """
+        Return the result of a denied item, or None when the item is allowed.
+        """
+        if not isinstance(item, dict):
+            return {'status': status.HTTP_400_BAD_REQUEST, 'detail': 'Expected an object.'}
+        if obj is None and self.action != 'bulk_create':
+            return {'status': status.HTTP_404_NOT_FOUND, 'detail': exceptions.NotFound.default_detail}
+        get_permission_context(request)
+        item_request = BulkItemRequest(request, item)
+        for permission in self.get_permissions():
+            if permission.has_permission(item_request, self) and \
+                    (obj is None or permission.has_object_permission(item_request, self, obj)):
+                continue
+            message = getattr(permission, 'message', None)
+            if message is None:
+                return {'status': status.HTTP_404_NOT_FOUND, 'detail': exceptions.NotFound.default_detail}
+            return {'status': status.HTTP_403_FORBIDDEN, 'detail': message}
+        return None
+
+    def _get_bulk_response(self, results, success_status):
+        return Response([
+            {'status': success_status, 'data': self.get_serializer(result).data} if isinstance(result, Task) else result
+            for result in results
+        ])
+
+
+class TaskStatusViewSet(InstrumentationMixin, Response403To401Mixin, viewsets.ModelViewSet):
     queryset = TaskStatus.objects.all()
     serializer_class = TaskStatusSerializer
     permission_classes = [import_string(p_c) for p_c in api_settings.TASK_STATUS_PERMISSION_CLASSES]
 
 
-class TaskTagViewSet(Response403To401Mixin, viewsets.ModelViewSet):
+class TaskTagViewSet(InstrumentationMixin, Response403To401Mixin, viewsets.ModelViewSet):
     queryset = TaskTag.objects.all()
 
     serializer_class = TaskTagSerializer
     permission_classes = [import_string(p_c) for p_c in api_settings.TASK_TAG_PERMISSION_CLASSES]
 
 
-class TaskViewSet(Response403To401Mixin, viewsets.ModelViewSet):
+class TaskViewSet(InstrumentationMixin, Response403To401Mixin, ConditionalRequestMixin, ResultCacheMixin,
+                  ValuesListMixin, AllowedActionsMixin, SparseFieldsMixin, BulkTaskActionsMixin, StatsMixin,
+                  ExportMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    export_fields = TASK_EXPORT_FIELDS
+    export_file_name = 'tasks'
+    list_updated_at_fields = ('updated_at', 'group_task__updated_at')
+    allowed_actions_prefixes = {'group_task_prefix': 'group_task__', 'task_prefix': ''}
+    stats_lookups = {
+        'status': 'status', 'tag': 'tag', 'group': 'group_task__group', 'assignee': 'group_task__assignee',
+    }
     permission_classes = [import_string(p_c) for p_c in api_settings.TASK_PERMISSION_CLASSES]
+    pagination_class = import_string(api_settings.TASK_PAGINATION_CLASS)
     filter_class = TaskFilterSet
 
     def get_queryset(self):
-        return get_tasks(self.request.user, self.queryset)
+        return self.defer_sparse_fields(
+            self.annotate_allowed_actions(shape_tasks(get_tasks(self.request.user, self.queryset), self.action)))
 
     def perform_create(self, serializer):
         from s_tasks_api.services.task_status import get_task_status_from_or_default
@@ -54,18 +490,33 @@ class TaskViewSet(Response403To401Mixin, viewsets.ModelViewSet):
 
     @action(detail=True, methods=['patch'])
     def complete(self, request, *args, **kwargs):
-        task = self.get_object()
-        task = complete_task(request.user, task.pk)
+        task = set_task_completed(self.get_object(), True)
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
     @action(detail=True, methods=['patch'])
     def un_complete(self, request, *args, **kwargs):
-        task = self.get_object()
-        task = un_complete_task(request.user, task.pk)
+        task = set_task_completed(self.get_object(), False)
         serializer = self.get_serializer(task)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def changes(self, request, *args, **kwargs):
+        since = request.query_params.get('since', '0')
+        if not since.isdigit():
+            raise exceptions.ValidationError({'since': 'A valid change token is required.'})
+        changes = get_changes(request.user, int(since), api_settings.MAX_CHANGES)
+        return Response({
+            'token': str(changes.token),
+            'has_more': changes.has_more,
+            'reset': changes.reset,
+            'tasks': TaskSerializer(changes.tasks, many=True, context=self.get_serializer_context()).data,
+            'deleted_tasks': changes.deleted_task_ids,
+            'group_tasks': GroupTaskSerializer(changes.group_tasks, many=True,
+                                               context=self.get_serializer_context()).data,
+            'deleted_group_tasks': changes.deleted_group_task_ids,
+        })
+
     @action(detail=False, methods=['post'])
     def create_group_task(self, request, *args, **kwargs):
         with transaction.atomic():
@@ -81,14 +532,27 @@ class TaskViewSet(Response403To401Mixin, viewsets.ModelViewSet):
             return Response(group_task_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
-class GroupTaskViewSet(Response403To401Mixin, viewsets.ModelViewSet):
+class GroupTaskViewSet(InstrumentationMixin, Response403To401Mixin, ConditionalRequestMixin, ResultCacheMixin,
+                       ValuesListMixin, AllowedActionsMixin, SparseFieldsMixin, StatsMixin, ExportMixin,
+                       viewsets.ModelViewSet):
     queryset = GroupTask.objects.all()
+    export_fields = ('pk',) + tuple('task__' + field for field in TASK_EXPORT_FIELDS) + \
+                    ('group', 'assignee', 'lock_level', 'assign_lock_level', 'updated_at', 'version')
+    export_file_name = 'group_tasks'
+    stats_lookups = {'status': 'task__status', 'tag': 'task__tag', 'group': 'group', 'assignee': 'assignee'}
+    stats_task_prefix = 'task__'
+    updated_at_fields = ('updated_at', 'task__updated_at')
+    version_fields = ('version', 'task__version')
     serializer_class = GroupTaskSerializer
     permission_classes = [import_string(p_c) for p_c in api_settings.GROUP_TASK_PERMISSION_CLASSES]
+    pagination_class = import_string(api_settings.GROUP_TASK_PAGINATION_CLASS)
     filter_class = GroupTaskFilterSet
 
     def get_queryset(self):
-        return get_group_tasks(self.request.user, self.queryset)
+        # Lists and stats read the user's groups in a subquery; other actions share them with object permissions.
+        group_ids = get_permission_context(self.request).group_ids if self.action not in ['list', 'stats'] else None
+        return self.defer_sparse_fields(self.annotate_allowed_actions(
+            shape_group_tasks(get_group_tasks(self.request.user, self.queryset, group_ids), self.action)))
 
     def update(self, request, *args, **kwargs):
         kwargs['partial'] = True
@@ -110,14 +574,14 @@ class GroupTaskViewSet(Response403To401Mixin, viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'])
     def complete(self, request, *args, **kwargs):
         group_task = self.get_object()
-        task = complete_task(request.user, group_task.task.pk)
+        task = set_task_completed(group_task.task, True)
         task_serializer = TaskSerializer(task)
         return Response(task_serializer.data)
 
     @action(detail=True, methods=['patch'])
     def un_complete(self, request, *args, **kwargs):
         group_task = self.get_object()
-        task = un_complete_task(request.user, group_task.task.pk)
+        task = set_task_completed(group_task.task, False)
         task_serializer = TaskSerializer(task)
         return Response(task_serializer.data)
 
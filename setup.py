@@ -16,7 +16,8 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     url="https://github.com/Saknowman/django-s-tasks-api",
     packages=[
-        's_tasks_api', 's_tasks_api.fixtures', 's_tasks_api.migrations',
+        's_tasks_api', 's_tasks_api.fixtures', 's_tasks_api.management', 's_tasks_api.management.commands',
+        's_tasks_api.migrations',
         's_tasks_api.permissions', 's_tasks_api.services',
         's_tasks_api.tests', 's_tasks_api.tests.tasks',
 